@@ -0,0 +1,264 @@
+"""Vectorized VADER Scoring Module
+This module scores whole batches of text with the VADER rules at once. Each batch
+is tokenized a single time, tokens are mapped to integer ids against the VADER
+lexicon (already merged with the financial terms), and valence sums, booster and
+negation adjustments and the compound normalization are computed with NumPy
+across every document of the batch.
+
+Results match ``SentimentIntensityAnalyzer.polarity_scores`` to within 1e-4 on
+``compound`` and 1e-3 on ``pos``/``neg``/``neu``; the only source of difference
+is floating point summation order. Documents that hit the rare VADER rules this
+engine does not vectorize (ALL CAPS emphasis, idioms and the "kind of" /
+"sort of" / "just enough" bigrams) are scored by the reference analyzer instead.
+"""
+
+import logging
+import threading
+from itertools import chain
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Damping applied to a booster word by its distance from the scored word
+BOOSTER_DAMPING = (1.0, 0.95, 0.9)
+
+
+class BatchSentimentEngine:
+
+    def __init__(self, sid):
+        self.sid = sid
+        self.constants = sid.constants
+        self._punc_set = frozenset(self.constants.PUNC_LIST)
+        self._strip_punc = self.constants.REGEX_REMOVE_PUNCTUATION
+        # Batches scored on several threads share the vocabulary and token tables
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the token tables, e.g. after the analyzer lexicon was patched."""
+        with self._lock:
+            # id 0 is a padding token used for positions before the start of a document
+            self._vocab = {'': 0}
+            self._tokens = ['']
+            self._tables = None
+
+            fallback_bigrams = [seq.split()[:2] for seq in self.constants.SPECIAL_CASE_IDIOMS]
+            fallback_bigrams += [seq.split() for seq in self.constants.BOOSTER_DICT if ' ' in seq]
+            self._fallback_pairs = np.array(
+                [self._pair_key(self._token_id(a), self._token_id(b)) for a, b in fallback_bigrams],
+                dtype=np.int64
+            )
+
+    @staticmethod
+    def _pair_key(first, second):
+        return (first << 32) | second
+
+    def _token_id(self, token):
+        token_id = self._vocab.get(token)
+        if token_id is None:
+            token_id = len(self._tokens)
+            self._vocab[token] = token_id
+            self._tokens.append(token)
+            self._tables = None
+        return token_id
+
+    def _build_tables(self):
+        lexicon = self.sid.lexicon
+        boosters = self.constants.BOOSTER_DICT
+        size = len(self._tokens)
+
+        valence = np.zeros(size)
+        booster = np.zeros(size)
+        in_lexicon = np.zeros(size, dtype=bool)
+        is_booster = np.zeros(size, dtype=bool)
+        negated = np.zeros(size, dtype=bool)
+        is_never = np.zeros(size, dtype=bool)
+        is_so_this = np.zeros(size, dtype=bool)
+        is_least = np.zeros(size, dtype=bool)
+        is_at_very = np.zeros(size, dtype=bool)
+        is_but = np.zeros(size, dtype=bool)
+
+        for token_id, token in enumerate(self._tokens[1:], start=1):
+            lower = token.lower()
+            if lower in lexicon:
+                in_lexicon[token_id] = True
+                valence[token_id] = lexicon[lower]
+            if lower in boosters:
+                is_booster[token_id] = True
+                booster[token_id] = boosters[lower]
+            negated[token_id] = self.constants.negated([token])
+            is_never[token_id] = token == 'never'
+            is_so_this[token_id] = token in ('so', 'this')
+            is_least[token_id] = lower == 'least'
+            is_at_very[token_id] = lower in ('at', 'very')
+            is_but[token_id] = lower == 'but'
+
+        self._tables = {
+            'valence': valence,
+            'booster': booster,
+            'in_lexicon': in_lexicon,
+            'is_booster': is_booster,
+            'negated': negated,
+            'is_never': is_never,
+            'is_so_this': is_so_this,
+            'is_least': is_least,
+            'is_at_very': is_at_very,
+            'is_but': is_but
+        }
+        return self._tables
+
+    def tokenize(self, text):
+        """Split text into VADER tokens, mirroring ``SentiText.words_and_emoticons``."""
+        if not isinstance(text, str):
+            text = str(text.encode('utf-8'))
+        return self.tokenize_words(text.split())
+
+    def tokenize_words(self, words):
+        """Turn whitespace-split words into VADER tokens."""
+        tokens = []
+        for word in words:
+            if len(word) <= 1:
+                continue
+            stripped = self._strip_punc.sub('', word)
+            if len(stripped) > 1 and stripped != word:
+                if word.endswith(stripped) and word[:-len(stripped)] in self._punc_set:
+                    word = stripped
+                elif word.startswith(stripped) and word[len(stripped):] in self._punc_set:
+                    word = stripped
+            tokens.append(word)
+        return tokens
+
+    @staticmethod
+    def _needs_fallback_for_caps(tokens):
+        allcaps = sum(1 for token in tokens if token.isupper())
+        return 0 < allcaps < len(tokens)
+
+    def polarity_scores_batch(self, texts, word_docs=None):
+        """Score a list of texts, returning ``polarity_scores``-style dicts in input order.
+
+        ``word_docs`` may carry each text already split on whitespace, so callers that
+        tokenize once for several stages don't pay for the split again.
+        """
+        if not texts:
+            return []
+
+        if word_docs is None:
+            token_docs = [self.tokenize(text) for text in texts]
+        else:
+            token_docs = [self.tokenize_words(words) for words in word_docs]
+        with self._lock:
+            id_docs = [[self._token_id(token) for token in tokens] for tokens in token_docs]
+            tables = self._tables or self._build_tables()
+            # Tokens added by later batches get larger ids, which this batch never looks up
+            vocab_size = len(self._tokens)
+
+        n_docs = len(texts)
+        lengths = np.fromiter(map(len, id_docs), dtype=np.int64, count=n_docs)
+        ids = np.fromiter(chain.from_iterable(id_docs), dtype=np.int64, count=int(lengths.sum()))
+        doc = np.repeat(np.arange(n_docs), lengths)
+        pos = np.arange(len(ids)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        def preceding(k):
+            shifted = np.zeros_like(ids)
+            if k < len(ids):
+                shifted[k:] = ids[:-k]
+            shifted[pos < k] = 0
+            return shifted
+
+        prev = [None] + [preceding(k) for k in (1, 2, 3)]
+        in_lexicon = tables['in_lexicon']
+        scored = in_lexicon[ids] & ~tables['is_booster'][ids]
+        valence = np.where(scored, tables['valence'][ids], 0.0)
+        n_scalar = self.constants.N_SCALAR
+
+        for start_i in range(3):
+            before = prev[start_i + 1]
+            active = scored & (pos > start_i) & ~in_lexicon[before]
+
+            scalar = tables['booster'][before] * np.where(valence < 0, -1.0, 1.0)
+            valence = np.where(active, valence + scalar * BOOSTER_DAMPING[start_i], valence)
+
+            if start_i == 0:
+                emphasis = np.zeros_like(active)
+            elif start_i == 1:
+                emphasis = tables['is_never'][prev[2]] & tables['is_so_this'][prev[1]]
+            else:
+                emphasis = (
+                    (tables['is_never'][prev[3]] & tables['is_so_this'][prev[2]])
+                    | tables['is_so_this'][prev[1]]
+                )
+            negation = ~emphasis & tables['negated'][before]
+            emphasis_factor = 1.5 if start_i == 1 else 1.25
+            valence = np.where(active & emphasis, valence * emphasis_factor, valence)
+            valence = np.where(active & negation, valence * n_scalar, valence)
+
+        least = (
+            scored & (pos > 0) & tables['is_least'][prev[1]] & ~in_lexicon[prev[1]]
+            & ((pos == 1) | ~tables['is_at_very'][prev[2]])
+        )
+        valence = np.where(least, valence * n_scalar, valence)
+
+        # VADER scores repeated tokens using the context of their first occurrence
+        if len(ids):
+            doc_keys = doc * vocab_size + ids
+            _, first_index, inverse = np.unique(doc_keys, return_index=True, return_inverse=True)
+            valence = valence[first_index[inverse.ravel()]]
+
+        is_but = tables['is_but'][ids]
+        but_pos = np.full(n_docs, np.iinfo(np.int64).max)
+        np.minimum.at(but_pos, doc[is_but], pos[is_but])
+        has_but = but_pos[doc] != np.iinfo(np.int64).max
+        valence = np.where(has_but & (pos < but_pos[doc]), valence * 0.5, valence)
+        valence = np.where(has_but & (pos > but_pos[doc]), valence * 1.5, valence)
+
+        sum_s = np.bincount(doc, weights=valence, minlength=n_docs)
+        pos_sum = np.bincount(doc, weights=np.where(valence > 0, valence + 1, 0.0), minlength=n_docs)
+        neg_sum = np.bincount(doc, weights=np.where(valence < 0, valence - 1, 0.0), minlength=n_docs)
+        neu_count = np.bincount(doc, weights=(valence == 0).astype(float), minlength=n_docs)
+
+        amplifier = np.fromiter(
+            (self.sid._punctuation_emphasis(0.0, text) if isinstance(text, str) else 0.0 for text in texts),
+            dtype=float,
+            count=n_docs
+        )
+        sum_s = sum_s + np.sign(sum_s) * amplifier
+        compound = sum_s / np.sqrt(sum_s * sum_s + 15)
+
+        abs_neg = np.abs(neg_sum)
+        more_positive = pos_sum > abs_neg
+        more_negative = pos_sum < abs_neg
+        pos_sum = np.where(more_positive, pos_sum + amplifier, pos_sum)
+        neg_sum = np.where(more_negative, neg_sum - amplifier, neg_sum)
+        total = pos_sum + np.abs(neg_sum) + neu_count
+        safe_total = np.where(total == 0, 1.0, total)
+
+        # documents containing idiom or booster bigrams go through the reference analyzer
+        same_doc = doc[:-1] == doc[1:]
+        pairs = self._pair_key(ids[:-1], ids[1:])
+        fallback_tokens = same_doc & np.isin(pairs, self._fallback_pairs)
+        fallback = np.zeros(n_docs, dtype=bool)
+        fallback[doc[:-1][fallback_tokens]] = True
+
+        results = []
+        rows = zip(
+            compound.tolist(),
+            np.abs(pos_sum / safe_total).tolist(),
+            np.abs(neg_sum / safe_total).tolist(),
+            np.abs(neu_count / safe_total).tolist()
+        )
+        for index, (comp, pos_score, neg_score, neu_score) in enumerate(rows):
+            tokens = token_docs[index]
+            if fallback[index] or self._needs_fallback_for_caps(tokens):
+                results.append(self.sid.polarity_scores(texts[index]))
+            elif not tokens:
+                results.append({'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0})
+            else:
+                results.append({
+                    'neg': round(neg_score, 3),
+                    'neu': round(neu_score, 3),
+                    'pos': round(pos_score, 3),
+                    'compound': round(comp, 4)
+                })
+
+        return results
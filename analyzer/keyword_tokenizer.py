@@ -0,0 +1,127 @@
+"""Fast Keyword Tokenizer Module
+A compiled, mostly single-pass tokenizer that reproduces what NLTK's
+``word_tokenize`` (Punkt sentence splitting followed by the Treebank word rules)
+produces, without running either on the whole text:
+
+* a word's final period is split off when it ends a sentence; as in Punkt, a
+  number followed by a lowercase word, or a single-letter initial followed by a
+  word, does not end one
+* runs of two or more periods, ``$`` and ``%`` become their own tokens
+* the Treebank contractions ``cannot``, ``gimme``, ``gonna``, ``gotta``,
+  ``lemme`` and ``wanna`` are split in two
+* brackets, ``;@#&?!*``, typographic quotes and dashes are set apart, and so
+  are ``:`` and ``,`` unless a digit follows; clitics such as ``'s`` and
+  ``n't`` are split off their word
+
+Words with ASCII quotes, double dashes or runs of ``:`` and ``,`` go through the
+Treebank rules one word at a time. Text where a period touches other punctuation
+(``(Reuters).``, ``U.S.-China``) or ``?``/``!`` is followed by punctuation
+depends on Punkt's sentence boundaries and is not supported: ``supports`` tells
+which texts should go through ``word_tokenize`` instead. Punkt's trained
+abbreviation list is not reproduced either, so an abbreviation such as ``inc.``
+in the middle of a text loses its period here while NLTK keeps it.
+"""
+
+import re
+
+PLAIN_WORD = re.compile(r'[\w$%.]+')
+OTHER_CHARS = re.compile(r'[^\w\s$%.]')
+# A word mixing periods with other punctuation, or ?/! before punctuation, is where Punkt may split a sentence
+UNSUPPORTED = re.compile(r'(?<!\S)(?=\S*\.)\S*[^\w\s$%.]|[?!][?!)";}\]*:@\'({\[]')
+# Set apart by Treebank wherever they are in a word
+PADDED = re.compile(r'([«“‘„»”’\[\](){}<>;@#$%&?!*\u2012-\u2015])')
+SEPARATOR = re.compile(r'([:,])(?!\d)')
+CLITIC = re.compile(r"(\w+?)(n't|N'T|'[sSmMdD]|'ll|'LL|'re|'RE|'ve|'VE)")
+# Left to the Treebank rules themselves
+INVOLVED = re.compile(r'[\'"`]|--|[:,]{2}|(?i:cannot|gimme|gonna|gotta|lemme|wanna)')
+INNER_SPLIT = re.compile(r'(\.{2,}|[$%])')
+NUMBER = re.compile(r'-?[\.,]?\d[\d,\.-]*\.?$')
+INITIAL = re.compile(r'[^\W\d]\.$')
+
+PUNKT_PUNCTUATION = frozenset((';', ':', ',', '.', '!', '?'))
+
+CONTRACTIONS = {
+    'cannot': 3,
+    'gimme': 3,
+    'gonna': 3,
+    'gotta': 3,
+    'lemme': 3,
+    'wanna': 3
+}
+
+# NLTK's Treebank tokenizer, created on first use
+_treebank = None
+
+
+def supports(text):
+    """True if ``text`` can be tokenized here exactly as ``word_tokenize`` would."""
+    return OTHER_CHARS.search(text) is None or UNSUPPORTED.search(text) is None
+
+
+def _ends_sentence(word, next_word):
+    if next_word is None:
+        return True
+    if next_word[0] in ',:;':
+        # Punkt sets these apart from the word they start
+        next_word = next_word[0]
+    if INITIAL.match(word):
+        return not (next_word in PUNKT_PUNCTUATION or next_word[0].isalpha())
+    if NUMBER.match(word):
+        return not (next_word in PUNKT_PUNCTUATION or next_word[0].islower())
+    return True
+
+
+def _treebank_tokenize(word):
+    global _treebank
+    if _treebank is None:
+        from nltk.tokenize import NLTKWordTokenizer
+        _treebank = NLTKWordTokenizer()
+    return _treebank.tokenize(word)
+
+
+def _punctuated(word):
+    """Tokens of a word with punctuation other than ``$``, ``%`` and periods."""
+    clitic = CLITIC.fullmatch(word)
+    if clitic and clitic.group(1).lower() not in CONTRACTIONS:
+        return [clitic.group(1), clitic.group(2)]
+    if INVOLVED.search(word):
+        return _treebank_tokenize(word)
+    return PADDED.sub(r' \1 ', SEPARATOR.sub(r' \1 ', word)).split()
+
+
+def tokenize(text):
+    """Split text ``supports`` accepts into word tokens the way ``word_tokenize`` would."""
+    words = text.split()
+    last = len(words) - 1
+    tokens = []
+    append = tokens.append
+
+    for index, word in enumerate(words):
+        if not word.isalnum() and not PLAIN_WORD.fullmatch(word):
+            tokens.extend(_punctuated(word))
+            continue
+
+        final_period = (
+            word[-1] == '.' and len(word) > 1 and word[-2] != '.'
+            and _ends_sentence(word, words[index + 1] if index < last else None)
+        )
+        if final_period:
+            word = word[:-1]
+
+        if '$' in word or '%' in word or '..' in word:
+            pieces = [piece for piece in INNER_SPLIT.split(word) if piece]
+        else:
+            pieces = (word,)
+
+        for piece in pieces:
+            split_at = CONTRACTIONS.get(piece.lower())
+            if split_at:
+                append(piece[:split_at])
+                append(piece[split_at:])
+            else:
+                append(piece)
+
+        if final_period:
+            append('.')
+
+    return tokens
@@ -0,0 +1,76 @@
+"""Lexicon Snapshot Module
+Saves and loads a prebuilt copy of the VADER lexicon (with the financial terms
+already merged) and the English stop word list as one pickled file. Loading the
+snapshot replaces reading and parsing the NLTK ``vader_lexicon`` and
+``stopwords`` data, so a process can start scoring without touching NLTK data.
+
+A snapshot is tied to a lexicon version and is ignored when that version, or the
+snapshot format, does not match. Rebuild it after upgrading NLTK with
+``python -m analyzer.lexicon_snapshot``.
+"""
+
+import os
+import pickle
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+DEFAULT_SNAPSHOT_NAME = 'lexicon_snapshot.pkl'
+
+
+def save_snapshot(path, version, lexicon, stop_words):
+    """Write a snapshot atomically, so readers never see a partial file."""
+    payload = {
+        'format': SNAPSHOT_FORMAT,
+        'lexicon_version': version,
+        'lexicon': dict(lexicon),
+        'stop_words': sorted(stop_words)
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+    logger.info(f"Saved lexicon snapshot {version} to {path}")
+
+
+def load_snapshot(path, version):
+    """Return the snapshot at ``path`` if it matches ``version``, else ``None``."""
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable lexicon snapshot {path}: {e}")
+        return None
+
+    if payload.get('format') != SNAPSHOT_FORMAT or payload.get('lexicon_version') != version:
+        logger.info(f"Ignoring lexicon snapshot {path} built for another lexicon version")
+        return None
+
+    return payload
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from sentiment_analyzer import LEXICON_VERSION, SentimentAnalyzer
+
+    parser = argparse.ArgumentParser(description="Build the prebuilt lexicon snapshot")
+    parser.add_argument("--output", default=os.path.join("cache", DEFAULT_SNAPSHOT_NAME),
+                        help="Where to write the snapshot")
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer()
+    save_snapshot(args.output, LEXICON_VERSION, analyzer.sid.lexicon, analyzer.stop_words)
@@ -0,0 +1,216 @@
+"""Near-Duplicate Story Detection Module
+Groups copies of the same wire story, whose headlines and summaries differ only
+slightly, into clusters. Each article's preprocessed text is cut into word
+shingles and summarized by a MinHash signature. Locality-sensitive hashing over
+bands of that signature finds candidate clusters in time independent of how many
+articles have been seen. A candidate is accepted when the estimated Jaccard
+similarity with the cluster's representative reaches the threshold.
+
+Articles are added incrementally. The first article of a cluster is its
+representative, and only representatives need to be scored. The index keeps a
+bounded number of clusters, so a long-running worker does not grow without end.
+"""
+
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Hash permutations are (a * x + b) mod p over 31-bit shingle hashes, which keeps
+# every intermediate value inside uint64
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+# Clusters an index keeps before dropping the least recently matched (a few KB each)
+DEFAULT_MAX_CLUSTERS = 20000
+
+
+def choose_bands(threshold, num_perm):
+    """Pick ``(bands, rows)`` whose LSH threshold ``(1/b) ** (1/r)`` is closest to ``threshold``."""
+    options = [
+        (bands, num_perm // bands)
+        for bands in range(1, num_perm + 1)
+        if num_perm % bands == 0
+    ]
+    return min(options, key=lambda option: abs((1.0 / option[0]) ** (1.0 / option[1]) - threshold))
+
+
+class MinHasher:
+
+    def __init__(self, num_perm=128, shingle_size=3, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(MERSENNE_PRIME), num_perm).astype(np.uint64)[:, None]
+        self._b = rng.randint(0, int(MERSENNE_PRIME), num_perm).astype(np.uint64)[:, None]
+
+    def shingles(self, text):
+        words = [word for word in (word.strip('.') for word in text.split()) if word]
+        size = self.shingle_size
+        if len(words) <= size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[start:start + size]) for start in range(len(words) - size + 1)}
+
+    def signature(self, text):
+        """Return the MinHash signature of ``text``, or ``None`` if it has no words."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) & 0x7fffffff for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        return ((self._a * hashes + self._b) % MERSENNE_PRIME).min(axis=1)
+
+
+class _Cluster:
+    __slots__ = ('representative', 'signature', 'band_keys', 'size', 'keys')
+
+    def __init__(self, representative, signature, band_keys):
+        self.representative = representative
+        self.signature = signature
+        self.band_keys = band_keys
+        self.size = 1
+        self.keys = []
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash LSH index assigning a cluster id to every article.
+
+    ``threshold`` is the estimated Jaccard similarity of shingle sets above which
+    two articles are treated as the same story; the LSH banding is derived from
+    it unless ``bands`` is given. At most ``max_clusters`` clusters are kept; the
+    least recently matched ones are dropped with their articles, and an article
+    added again later starts a new cluster. Cluster ids are never reused.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=3, bands=None, max_clusters=DEFAULT_MAX_CLUSTERS):
+        if bands is None:
+            bands, rows = choose_bands(threshold, num_perm)
+        else:
+            rows = num_perm // bands
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_clusters = max(1, max_clusters)
+        self.hasher = MinHasher(num_perm=bands * rows, shingle_size=shingle_size)
+
+        self._lock = threading.Lock()
+        self._buckets = {}
+        # cluster id -> _Cluster, least recently used first
+        self._clusters = OrderedDict()
+        self._article_clusters = {}
+        self._next_id = 0
+        self.added = 0
+        self.near_duplicates = 0
+        self.evicted = 0
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [
+            (band, signature[band * rows:(band + 1) * rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _match(self, signature, band_keys):
+        best_cluster, best_similarity = None, self.threshold
+        seen = set()
+        for key in band_keys:
+            for cluster_id in self._buckets.get(key, ()):
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+                similarity = float(np.mean(self._clusters[cluster_id].signature == signature))
+                if similarity >= best_similarity:
+                    best_cluster, best_similarity = cluster_id, similarity
+        return best_cluster
+
+    def _evict(self):
+        cluster_id, cluster = self._clusters.popitem(last=False)
+        for band_key in cluster.band_keys:
+            bucket = self._buckets[band_key]
+            bucket.remove(cluster_id)
+            if not bucket:
+                del self._buckets[band_key]
+        for key in cluster.keys:
+            del self._article_clusters[key]
+        self.evicted += 1
+
+    def add(self, text, key=None):
+        """Index one preprocessed text and return its cluster id.
+
+        Adding a ``key`` that was seen before returns its existing cluster and
+        is not counted again.
+        """
+        with self._lock:
+            if key is not None and key in self._article_clusters:
+                cluster_id = self._article_clusters[key]
+                self._clusters.move_to_end(cluster_id)
+                return cluster_id
+            self.added += 1
+
+            signature = self.hasher.signature(text)
+            band_keys = self._band_keys(signature) if signature is not None else ()
+            cluster_id = self._match(signature, band_keys) if signature is not None else None
+
+            if cluster_id is None:
+                while len(self._clusters) >= self.max_clusters:
+                    self._evict()
+                cluster_id = self._next_id
+                self._next_id += 1
+                cluster = self._clusters[cluster_id] = _Cluster(text, signature, band_keys)
+                for band_key in band_keys:
+                    self._buckets.setdefault(band_key, []).append(cluster_id)
+            else:
+                cluster = self._clusters[cluster_id]
+                cluster.size += 1
+                self._clusters.move_to_end(cluster_id)
+                self.near_duplicates += 1
+
+            if key is not None:
+                self._article_clusters[key] = cluster_id
+                cluster.keys.append(key)
+            return cluster_id
+
+    def cluster(self, key):
+        """The cluster id of the article added as ``key``, or ``None`` if this index does not know it."""
+        with self._lock:
+            return self._article_clusters.get(key)
+
+    def representative(self, cluster_id):
+        """Return the text of the article that started ``cluster_id``, or ``None`` once it was evicted."""
+        with self._lock:
+            cluster = self._clusters.get(cluster_id)
+            return cluster.representative if cluster is not None else None
+
+    def cluster_size(self, cluster_id):
+        with self._lock:
+            cluster = self._clusters.get(cluster_id)
+            return cluster.size if cluster is not None else 0
+
+    def stats(self):
+        """Report how much scoring work clustering saved and how large the index is.
+
+        ``saved_fraction`` compares the representatives that had to be scored
+        with the distinct articles added; re-adding a known key counts once.
+        """
+        with self._lock:
+            created = self._next_id
+            return {
+                'added': self.added,
+                'clusters': len(self._clusters),
+                'articles': len(self._article_clusters),
+                'buckets': len(self._buckets),
+                'max_clusters': self.max_clusters,
+                'evicted': self.evicted,
+                'near_duplicates': self.near_duplicates,
+                'saved_fraction': 1 - created / self.added if self.added else 0.0,
+                'threshold': self.threshold,
+                'bands': self.bands,
+                'rows': self.rows
+            }
@@ -1,12 +1,20 @@
 import re
 import nltk
 import logging
+import threading
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 
+from analyzer.batch_sentiment import BatchSentimentEngine
+
 logger = logging.getLogger(__name__)
 
+_engine_lock = threading.Lock()
+_analyzer = None
+_batch_engine = None
+_stop_words = None
+
 def ensure_nltk_resources():
     try:
         word_tokenize("Test sentence.")
@@ -67,11 +75,38 @@ def preprocess_text(text):
     
     return text
 
+def get_analyzer():
+    """Return the process-wide analyzer, building it and patching the lexicon once."""
+    global _analyzer
+    if _analyzer is None:
+        with _engine_lock:
+            if _analyzer is None:
+                sid = SentimentIntensityAnalyzer()
+                for term, score in FINANCIAL_TERMS.items():
+                    sid.lexicon[term] = score
+                _analyzer = sid
+    return _analyzer
+
+def get_batch_engine():
+    global _batch_engine
+    if _batch_engine is None:
+        sid = get_analyzer()
+        with _engine_lock:
+            if _batch_engine is None:
+                _batch_engine = BatchSentimentEngine(sid)
+    return _batch_engine
+
+def get_stop_words():
+    global _stop_words
+    if _stop_words is None:
+        _stop_words = frozenset(stopwords.words('english'))
+    return _stop_words
+
 def extract_keywords(text, top_n=10):
     if not text:
         return []
     words = word_tokenize(text)
-    stop_words = set(stopwords.words('english'))
+    stop_words = get_stop_words()
     words = [word for word in words if word.lower() not in stop_words and len(word) > 1]
     word_counts = {}
     for word in words:
@@ -83,11 +118,7 @@ def extract_keywords(text, top_n=10):
     sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
     return [word for word, count in sorted_words[:top_n]]
 
-def analyze_sentiment(news_item):
-    sid = SentimentIntensityAnalyzer()
-    for term, score in FINANCIAL_TERMS.items():
-        sid.lexicon[term] = score
-
+def _article_text(news_item):
     text = preprocess_text(news_item.get('text', ''))
     
     if not text:
@@ -95,10 +126,9 @@ def analyze_sentiment(news_item):
         summary = news_item.get('summary', '')
         text = preprocess_text(f"{headline}. {summary}")
     
-    if not text:
-        return {**news_item, 'sentiment': 'neutral', 'sentiment_score': 0.0, 'keywords': []}
-    
-    sentiment_scores = sid.polarity_scores(text)
+    return text
+
+def _with_sentiment(news_item, text, sentiment_scores):
     compound_score = sentiment_scores['compound']
     
     if compound_score >= 0.05:
@@ -120,4 +150,30 @@ def analyze_sentiment(news_item):
             'neutral': sentiment_scores['neu']
         },
         'keywords': keywords
-    } 
\ No newline at end of file
+    }
+
+def analyze_sentiment(news_item):
+    text = _article_text(news_item)
+    
+    if not text:
+        return {**news_item, 'sentiment': 'neutral', 'sentiment_score': 0.0, 'keywords': []}
+    
+    return _with_sentiment(news_item, text, get_analyzer().polarity_scores(text))
+
+def analyze_sentiment_batch(items):
+    """Analyze a batch of news items, doing analyzer and lexicon setup once per batch.
+    
+    Returns the same payload as ``analyze_sentiment`` for each item, in input order.
+    """
+    texts = [_article_text(item) for item in items]
+    scored_texts = [text for text in texts if text]
+    batch_scores = iter(get_batch_engine().polarity_scores_batch(scored_texts))
+    
+    results = []
+    for item, text in zip(items, texts):
+        if not text:
+            results.append({**item, 'sentiment': 'neutral', 'sentiment_score': 0.0, 'keywords': []})
+        else:
+            results.append(_with_sentiment(item, text, next(batch_scores)))
+    
+    return results
@@ -9,14 +9,30 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+SYMBOL_PATTERN = re.compile(r'\$?([A-Z]{1,5})(?=\s|$|\.|,|\)|\(|\:|\;|\"|\')')
+PRICE_PATTERN = re.compile(r'\$(\d+(?:\.\d{1,2})?)')
+PERCENTAGE_PATTERN = re.compile(r'(\d+(?:\.\d{1,2})?)%')
+MILLION_PATTERN = re.compile(r'(\d+(?:\.\d{1,2})?)(?:\s+)(?:million|m\b)')
+BILLION_PATTERN = re.compile(r'(\d+(?:\.\d{1,2})?)(?:\s+)(?:billion|b\b)')
+
+COMMON_WORDS = frozenset({'A', 'I', 'FOR', 'AT', 'BE', 'CEO', 'CFO', 'CTO', 'THE', 'AND', 'OR', 'ON', 'IN', 'BY', 'IT', 'IS', 'TO', 'OF'})
+
+CATEGORY_KEYWORDS = {
+    'earnings': ('earnings', 'revenue', 'profit', 'quarter', 'quarterly', 'eps', 'beat', 'miss'),
+    'merger_acquisition': ('merger', 'acquisition', 'acquire', 'takeover', 'bid', 'buyout', 'deal'),
+    'product_launch': ('launch', 'unveil', 'announce', 'release', 'new product', 'new service'),
+    'leadership': ('ceo', 'cfo', 'executive', 'board', 'appoint', 'resign', 'leadership'),
+    'regulatory': ('sec', 'regulation', 'lawsuit', 'legal', 'compliance', 'investigation', 'fine'),
+    'market_outlook': ('outlook', 'forecast', 'guidance', 'predict', 'expect', 'projection'),
+    'economic_indicator': ('inflation', 'unemployment', 'gdp', 'growth', 'recession', 'fed', 'rate')
+}
+
 def extract_symbols(text):
     if not text:
         return []
         
-    symbol_pattern = r'\$?([A-Z]{1,5})(?=\s|$|\.|,|\)|\(|\:|\;|\"|\')'
-    matches = re.findall(symbol_pattern, text)
-    common_words = {'A', 'I', 'FOR', 'AT', 'BE', 'CEO', 'CFO', 'CTO', 'THE', 'AND', 'OR', 'ON', 'IN', 'BY', 'IT', 'IS', 'TO', 'OF'}
-    symbols = [match for match in matches if match not in common_words]
+    matches = SYMBOL_PATTERN.findall(text)
+    symbols = [match for match in matches if match not in COMMON_WORDS]
     
     return list(set(symbols))  # Remove duplicates
 
@@ -31,26 +47,23 @@ def extract_company_names(text, company_database=None):
     
     return companies
 
-def extract_metrics(text):
+def extract_metrics(text, lower_text=None):
     if not text:
         return {}
         
     metrics = {}
-    price_pattern = r'\$(\d+(?:\.\d{1,2})?)'
-    price_matches = re.findall(price_pattern, text)
+    price_matches = PRICE_PATTERN.findall(text)
     if price_matches:
         metrics['prices'] = [float(price) for price in price_matches]
     
-    percentage_pattern = r'(\d+(?:\.\d{1,2})?)%'
-    percentage_matches = re.findall(percentage_pattern, text)
+    percentage_matches = PERCENTAGE_PATTERN.findall(text)
     if percentage_matches:
         metrics['percentages'] = [float(pct) for pct in percentage_matches]
     
-    million_pattern = r'(\d+(?:\.\d{1,2})?)(?:\s+)(?:million|m\b)'
-    million_matches = re.findall(million_pattern, text.lower())
-    
-    billion_pattern = r'(\d+(?:\.\d{1,2})?)(?:\s+)(?:billion|b\b)'
-    billion_matches = re.findall(billion_pattern, text.lower())
+    if lower_text is None:
+        lower_text = text.lower()
+    million_matches = MILLION_PATTERN.findall(lower_text)
+    billion_matches = BILLION_PATTERN.findall(lower_text)
     
     large_numbers = {}
     if million_matches:
@@ -63,20 +76,11 @@ def extract_metrics(text):
     
     return metrics
 
-def categorize_news(headline, content=None):
-    text = (headline + " " + (content or "")).lower()
-    categories = {
-        'earnings': ['earnings', 'revenue', 'profit', 'quarter', 'quarterly', 'eps', 'beat', 'miss'],
-        'merger_acquisition': ['merger', 'acquisition', 'acquire', 'takeover', 'bid', 'buyout', 'deal'],
-        'product_launch': ['launch', 'unveil', 'announce', 'release', 'new product', 'new service'],
-        'leadership': ['ceo', 'cfo', 'executive', 'board', 'appoint', 'resign', 'leadership'],
-        'regulatory': ['sec', 'regulation', 'lawsuit', 'legal', 'compliance', 'investigation', 'fine'],
-        'market_outlook': ['outlook', 'forecast', 'guidance', 'predict', 'expect', 'projection'],
-        'economic_indicator': ['inflation', 'unemployment', 'gdp', 'growth', 'recession', 'fed', 'rate']
-    }
+def categorize_news(headline, content=None, lower_text=None):
+    text = lower_text if lower_text is not None else (headline + " " + (content or "")).lower()
     
     matches = {}
-    for category, keywords in categories.items():
+    for category, keywords in CATEGORY_KEYWORDS.items():
         score = sum(1 for keyword in keywords if keyword in text)
         if score > 0:
             matches[category] = score
@@ -0,0 +1,147 @@
+"""Phrase Lexicon Module
+Scores weighted multi-word phrases ("beat expectations", "guidance cut") that the
+single-word VADER lexicon cannot express. The phrases are compiled into a word
+level Aho-Corasick automaton, so every phrase hit in a text is found in one pass
+over its words no matter how many phrases the lexicon holds.
+
+Phrases are matched against preprocessed text, so they are normalized the same
+way: lower case, punctuation other than ``$``, ``%`` and ``.`` removed (so
+"sell-off" becomes "selloff"). A phrase never spans a sentence-ending period.
+"""
+
+import os
+import csv
+import json
+import math
+import logging
+import threading
+from collections import deque
+
+from analyzer.sentiment_cache import lexicon_version
+
+logger = logging.getLogger(__name__)
+
+# Largest |compound| that can be mapped back to a raw valence sum
+MAX_COMPOUND = 0.9999
+
+_automata = {}
+_automata_lock = threading.Lock()
+
+
+def _phrase_words(phrase):
+    return [word for word in (word.strip('.') for word in phrase.split()) if word]
+
+
+class PhraseAutomaton:
+
+    def __init__(self, phrases):
+        self.version = lexicon_version(phrases)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for phrase, weight in phrases.items():
+            words = _phrase_words(phrase)
+            if not words:
+                continue
+
+            state = 0
+            for word in words:
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][word] = next_state
+                state = next_state
+            self._out[state] = ((phrase, weight),)
+
+        self._link()
+
+    def _link(self):
+        """Set failure links breadth first and fold each state's outputs into it."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                fallback = self._goto[fallback].get(word, 0)
+
+                self._fail[next_state] = fallback
+                self._out[next_state] = self._out[next_state] + self._out[fallback]
+
+    def __len__(self):
+        return len(self._goto) - 1
+
+    def find(self, words):
+        """Return ``(phrase, weight)`` for every phrase occurrence in ``words``."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        hits = []
+        state = 0
+
+        for word in words:
+            token = word.strip('.')
+            if token:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+                if out[state]:
+                    hits.extend(out[state])
+            if word[-1] == '.':
+                state = 0
+
+        return hits
+
+    def valence(self, words):
+        return sum(weight for phrase, weight in self.find(words))
+
+
+def get_automaton(phrases):
+    """Return the automaton for ``phrases``, building it once per lexicon version."""
+    version = lexicon_version(phrases)
+    automaton = _automata.get(version)
+    if automaton is None:
+        with _automata_lock:
+            automaton = _automata.get(version)
+            if automaton is None:
+                automaton = PhraseAutomaton(phrases)
+                _automata[version] = automaton
+                logger.info(f"Built phrase automaton {version} with {len(phrases)} phrases")
+    return automaton
+
+
+def merge_valence(compound, valence, alpha=15):
+    """Add a raw phrase valence to a VADER compound score.
+
+    The compound is mapped back to the raw valence sum VADER normalized, the
+    phrase valence is added, and the total is normalized again, so phrase hits
+    count the same way lexicon words do.
+    """
+    if not valence:
+        return compound
+
+    compound = max(-MAX_COMPOUND, min(MAX_COMPOUND, compound))
+    total = compound * math.sqrt(alpha / (1 - compound * compound)) + valence
+    return round(total / math.sqrt(total * total + alpha), 4)
+
+
+def load_phrase_lexicon(path):
+    """Load ``{phrase: weight}`` from a JSON object or a tab separated file."""
+    if os.path.splitext(path)[1].lower() == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            return {phrase: float(weight) for phrase, weight in json.load(f).items()}
+
+    phrases = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f, delimiter='\t'):
+            if len(row) < 2 or not row[0].strip() or row[0].startswith('#'):
+                continue
+            phrases[row[0].strip()] = float(row[1])
+    return phrases
@@ -0,0 +1,196 @@
+"""Article Pipeline Module
+Enriches news articles in a single pass. Each article's text is normalized and
+tokenized once into an ``ArticleContext``, and that shared state is fed to every
+enabled stage (sentiment, keywords, symbols, metrics, categories) to build one
+enriched record. Stages are pluggable, so an endpoint can run only what it needs.
+"""
+
+import logging
+from functools import cached_property
+
+from analyzer.news_processor import extract_symbols, extract_metrics, categorize_news
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleContext:
+    """Shared text representations of one article, each computed at most once."""
+
+    def __init__(self, article, analyzer):
+        self.article = article
+        self.analyzer = analyzer
+        self.headline = article.get('headline', '') or ''
+        self.summary = article.get('summary', '') or ''
+        self.record = dict(article)
+        self.scored = False
+
+    @cached_property
+    def content(self):
+        return f"{self.headline}. {self.summary}"
+
+    @cached_property
+    def lower_content(self):
+        return self.content.lower()
+
+    @cached_property
+    def category_text(self):
+        return f"{self.headline} {self.summary}".lower()
+
+    @cached_property
+    def clean_text(self):
+        return self.analyzer.preprocess_text(f"{self.headline} {self.summary}")
+
+    @cached_property
+    def words(self):
+        return self.clean_text.split()
+
+    @cached_property
+    def keyword_tokens(self):
+        return self.analyzer.keyword_tokens(self.clean_text)
+
+    def extracted_data(self):
+        return self.record.setdefault('extracted_data', {})
+
+
+class PipelineStage:
+    name = None
+
+    def run(self, contexts):
+        raise NotImplementedError
+
+
+class SentimentStage(PipelineStage):
+    name = 'sentiment'
+
+    def run(self, contexts):
+        pending = []
+        for context in contexts:
+            analyzer = context.analyzer
+            if not context.clean_text:
+                context.record['sentiment'] = analyzer.empty_sentiment()
+                continue
+
+            cached = None
+            if analyzer.cache is not None:
+                cached = analyzer.cache.get(context.clean_text, analyzer.lexicon_version)
+            if cached is not None:
+                context.record['sentiment'] = cached
+            else:
+                pending.append(context)
+
+        if not pending:
+            return
+
+        analyzer = pending[0].analyzer
+        batch_scores = analyzer.batch_engine.polarity_scores_batch(
+            [context.clean_text for context in pending],
+            word_docs=[context.words for context in pending]
+        )
+        for context, scores in zip(pending, batch_scores):
+            context.record['sentiment'] = analyzer.sentiment_from_scores(analyzer.apply_phrases(scores, context.words))
+            context.scored = True
+
+
+class KeywordStage(PipelineStage):
+    name = 'keywords'
+
+    def run(self, contexts):
+        for context in contexts:
+            sentiment = context.record.get('sentiment')
+            if sentiment is not None and 'keywords' in sentiment:
+                continue
+
+            keywords = context.analyzer.keywords_from_tokens(context.keyword_tokens) if context.clean_text else []
+            if sentiment is not None:
+                sentiment['keywords'] = keywords
+            else:
+                context.record['keywords'] = keywords
+
+
+class SymbolStage(PipelineStage):
+    name = 'symbols'
+
+    def run(self, contexts):
+        for context in contexts:
+            context.extracted_data()['symbols'] = extract_symbols(context.content)
+
+
+class MetricStage(PipelineStage):
+    name = 'metrics'
+
+    def run(self, contexts):
+        for context in contexts:
+            context.extracted_data()['metrics'] = extract_metrics(context.content, lower_text=context.lower_content)
+
+
+class CategoryStage(PipelineStage):
+    name = 'categories'
+
+    def run(self, contexts):
+        for context in contexts:
+            context.extracted_data()['categories'] = categorize_news(
+                context.headline, context.summary, lower_text=context.category_text
+            )
+
+
+STAGES = {
+    stage.name: stage
+    for stage in (SentimentStage, KeywordStage, SymbolStage, MetricStage, CategoryStage)
+}
+
+DEFAULT_STAGES = tuple(STAGES)
+
+
+def register_stage(stage_class):
+    """Make a custom ``PipelineStage`` subclass available by name."""
+    STAGES[stage_class.name] = stage_class
+    return stage_class
+
+
+class ArticlePipeline:
+
+    def __init__(self, analyzer, stages=DEFAULT_STAGES):
+        self.analyzer = analyzer
+        self.stages = [self._resolve_stage(stage) for stage in stages]
+
+    @staticmethod
+    def _resolve_stage(stage):
+        if isinstance(stage, PipelineStage):
+            return stage
+        if stage not in STAGES:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+        return STAGES[stage]()
+
+    @property
+    def stage_names(self):
+        return [stage.name for stage in self.stages]
+
+    def with_stages(self, *stages):
+        """Return a pipeline sharing this analyzer but running only ``stages``."""
+        return ArticlePipeline(self.analyzer, stages)
+
+    def process(self, articles):
+        """Enrich a batch of articles, returning one new record per article, in input order.
+
+        Every article must be a dict; an empty one gets an empty enrichment.
+        """
+        contexts = []
+        for article in articles:
+            if not isinstance(article, dict):
+                raise TypeError(f"Articles must be dicts, got {type(article).__name__}")
+            contexts.append(ArticleContext(article, self.analyzer))
+
+        for stage in self.stages:
+            stage.run(contexts)
+
+        cache = self.analyzer.cache
+        if cache is not None:
+            for context in contexts:
+                sentiment = context.record.get('sentiment')
+                if context.scored and 'keywords' in sentiment:
+                    cache.put(context.clean_text, self.analyzer.lexicon_version, sentiment)
+
+        return [context.record for context in contexts]
+
+    def process_article(self, article):
+        return self.process([article])[0]
@@ -0,0 +1,143 @@
+"""Sentiment Result Cache Module
+Content-addressed memoization of sentiment results. Entries are keyed by a hash of
+the preprocessed article text together with the version of the lexicon that scored
+it, so an article is scored once per lexicon version. A bounded in-memory LRU tier
+sits in front of an optional SQLite tier on disk.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def lexicon_version(terms):
+    """Return a short, stable hash identifying a ``{term: score}`` lexicon."""
+    payload = json.dumps(sorted(terms.items()), separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def sentiment_key(clean_text, version):
+    return hashlib.sha256(f"{version}\x00{clean_text}".encode('utf-8')).hexdigest()
+
+
+def copy_sentiment(sentiment):
+    """A copy of a sentiment payload that shares no mutable part with it."""
+    return {
+        **sentiment,
+        'breakdown': dict(sentiment.get('breakdown', {})),
+        'keywords': list(sentiment.get('keywords', []))
+    }
+
+
+class SentimentCache:
+
+    def __init__(self, max_entries=10000, disk_path=None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if disk_path:
+            self._open_disk_tier(disk_path)
+
+    def _open_disk_tier(self, disk_path):
+        try:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                "key TEXT PRIMARY KEY, lexicon_version TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error opening sentiment cache at {disk_path}: {e}")
+            self._db = None
+
+    def get(self, clean_text, version):
+        key = sentiment_key(clean_text, version)
+
+        with self._lock:
+            sentiment = self._entries.get(key)
+            if sentiment is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy_sentiment(sentiment)
+
+            if self._db is not None:
+                row = self._db.execute("SELECT payload FROM sentiment WHERE key = ?", (key,)).fetchone()
+                if row:
+                    sentiment = json.loads(row[0])
+                    self._remember(key, sentiment)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return copy_sentiment(sentiment)
+
+            self.misses += 1
+            return None
+
+    def put(self, clean_text, version, sentiment):
+        key = sentiment_key(clean_text, version)
+        sentiment = copy_sentiment(sentiment)
+
+        with self._lock:
+            self._remember(key, sentiment)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO sentiment (key, lexicon_version, payload) VALUES (?, ?, ?)",
+                        (key, version, json.dumps(sentiment))
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing sentiment cache entry: {e}")
+
+    def _remember(self, key, sentiment):
+        self._entries[key] = sentiment
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def purge_stale(self, version):
+        """Drop on-disk entries written by any lexicon version other than ``version``."""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM sentiment WHERE lexicon_version != ?", (version,))
+            self._db.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM sentiment")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'disk_tier': self.disk_path if self._db is not None else None
+            }
@@ -1,5 +1,6 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
 import os
+import json
 from datetime import datetime, timedelta
 import logging
 from dotenv import load_dotenv
@@ -31,12 +32,58 @@ if not api_key:
     logger.error("No Finnhub API key found. Set FINNHUB_API_KEY in your .env file.")
     raise ValueError("Finnhub API key is required")
 
-finpulse = FinPulseApp(api_key=api_key)
+finpulse = FinPulseApp.from_env(api_key=api_key)
+
+if os.environ.get('PRELOAD_SENTIMENT', '').lower() in ('1', 'true', 'yes'):
+    finpulse.sentiment_analyzer.warm_up()
+
+KEYWORD_STOP_WORDS = ('news', 'market', 'stock', 'stocks', 'report', 'reports', 'update', 'updates')
+
+def count_keywords(news_items):
+    word_counts = Counter()
+    for item in news_items:
+        if 'sentiment' in item and 'keywords' in item['sentiment']:
+            word_counts.update(item['sentiment']['keywords'])
+        
+        if 'headline' in item:
+            word_counts.update(finpulse.sentiment_analyzer.extract_keywords(item['headline'], max_keywords=5))
+    
+    for word in KEYWORD_STOP_WORDS:
+        if word in word_counts:
+            del word_counts[word]
+    
+    return word_counts
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def stream_company_news(symbol, start_date, end_date, limit):
+    """NDJSON lines of scored news batches as they arrive, then a line with the summary."""
+    news_items = []
+    for batch in finpulse.iter_company_news_with_sentiment(
+        symbol=symbol,
+        from_date=start_date.strftime('%Y-%m-%d'),
+        to_date=end_date.strftime('%Y-%m-%d')
+    ):
+        batch = batch[:limit - len(news_items)]
+        news_items.extend(batch)
+        yield json.dumps({"news": batch}, default=str) + "\n"
+        if len(news_items) >= limit:
+            break
+    
+    news_items.sort(key=lambda item: item.get('datetime') or 0, reverse=True)
+    yield json.dumps({
+        "symbol": symbol,
+        "news_count": len(news_items),
+        "date_range": {
+            "from": start_date.strftime('%Y-%m-%d'),
+            "to": end_date.strftime('%Y-%m-%d')
+        },
+        "stats": finpulse.get_sentiment_summary(symbol, news_items),
+        "is_sample_data": False
+    }, default=str) + "\n"
+
 @app.route('/company-news')
 def company_news():
     symbol = request.args.get('symbol', '').upper()
@@ -50,10 +97,18 @@ def company_news():
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
+        if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+            # Long ranges are sent chunk by chunk as they are fetched
+            return Response(
+                stream_with_context(stream_company_news(symbol, start_date, end_date, limit)),
+                mimetype='application/x-ndjson'
+            )
+        
         news_with_sentiment = finpulse.get_company_news_with_sentiment(
             symbol=symbol,
             from_date=start_date.strftime('%Y-%m-%d'),
             to_date=end_date.strftime('%Y-%m-%d'),
+            limit=limit,
             use_cache=True
         )
         
@@ -176,21 +231,7 @@ def generate_word_cloud():
         if not news_items:
             return jsonify({"error": "No news data available"}), 404
         
-        all_keywords = []
-        for item in news_items:
-            if 'sentiment' in item and 'keywords' in item['sentiment']:
-                all_keywords.extend(item['sentiment']['keywords'])
-            
-            if 'headline' in item:
-                headline_keywords = finpulse.sentiment_analyzer.extract_keywords(item['headline'], max_keywords=5)
-                all_keywords.extend(headline_keywords)
-        
-        word_counts = Counter(all_keywords)
-        
-        stop_words = ['news', 'market', 'stock', 'stocks', 'report', 'reports', 'update', 'updates']
-        for word in stop_words:
-            if word in word_counts:
-                del word_counts[word]
+        word_counts = count_keywords(news_items)
         
         if not word_counts:
             return jsonify({"error": "No significant keywords found"}), 404
@@ -256,21 +297,7 @@ def get_keywords():
         if not news_items:
             return jsonify({"error": "No news data available"}), 404
         
-        all_keywords = []
-        for item in news_items:
-            if 'sentiment' in item and 'keywords' in item['sentiment']:
-                all_keywords.extend(item['sentiment']['keywords'])
-            
-            if 'headline' in item:
-                headline_keywords = finpulse.sentiment_analyzer.extract_keywords(item['headline'], max_keywords=5)
-                all_keywords.extend(headline_keywords)
-        
-        word_counts = Counter(all_keywords)
-        
-        stop_words = ['news', 'market', 'stock', 'stocks', 'report', 'reports', 'update', 'updates']
-        for word in stop_words:
-            if word in word_counts:
-                del word_counts[word]
+        word_counts = count_keywords(news_items)
         
         top_keywords = [{"word": word, "count": count} 
                        for word, count in word_counts.most_common(20)]
@@ -281,5 +308,21 @@ def get_keywords():
         logger.error(f"Error extracting keywords: {str(e)}")
         return jsonify({"error": f"Could not extract keywords: {str(e)}"}), 500
 
+@app.route('/cache-stats')
+def cache_stats():
+    stats = {
+        "sentiment_cache": finpulse.sentiment_cache.stats(),
+        "news_cache": finpulse.news_cache.stats(),
+        "delta_fetch": finpulse.delta_stats.stats(),
+        "single_flight": finpulse.single_flight.stats(),
+        "rate_limit": finpulse.client.rate_limiter.stats(),
+        "http": finpulse.client.transport.stats(),
+        "news_ranges": finpulse.client.range_fetcher.stats(),
+        "disk": finpulse.cache_manager.stats(largest=5)
+    }
+    if finpulse.story_index is not None:
+        stats["near_duplicates"] = finpulse.story_index.stats()
+    return jsonify(stats)
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
@@ -1,10 +1,12 @@
 import os
-from flask import Flask
+from flask import Flask, g, request
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, get_jwt_identity, verify_jwt_in_request
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+from utils.api_scheduler import reset_caller, set_caller
+
 load_dotenv()
 
 db = SQLAlchemy()
@@ -42,6 +44,22 @@ def create_app(test_config=None):
     from app import commands
     commands.init_app(app)
     
+    @app.before_request
+    def tag_finnhub_caller():
+        # Finnhub calls made for this request are interactive and take turns with other users' calls
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+        g.finnhub_caller = set_caller(f"user:{identity}" if identity is not None else request.remote_addr)
+    
+    @app.teardown_request
+    def untag_finnhub_caller(exc=None):
+        tokens = g.pop('finnhub_caller', None)
+        if tokens is not None:
+            reset_caller(tokens)
+    
     @app.route('/')
     def index():
         return {
@@ -3,11 +3,17 @@ from app.services.finnhub_service import FinnhubService
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.news_preference import NewsPreference
 from app import db
+from utils.article_repository import ArticleRepository, DEFAULT_REPOSITORY_NAME
+from utils.resilience import is_stale
+from utils.api_scheduler import BATCH, api_priority
 import os
 from datetime import datetime, timedelta
 
 bp = Blueprint('news', __name__, url_prefix='/api/news')
 finnhub_service = FinnhubService(api_key=os.environ.get('FINNHUB_API_KEY'))
+article_repository = ArticleRepository(
+    os.environ.get('ARTICLE_DB', os.path.join('cache', DEFAULT_REPOSITORY_NAME))
+)
 
 @bp.route('/market', methods=['GET'])
 def get_market_news():
@@ -34,7 +40,7 @@ def get_market_news():
         end_date=end_date.strftime('%Y-%m-%d')
     )
     
-    return jsonify({'news': news_items})
+    return jsonify({'news': news_items, 'stale': is_stale(news_items)})
 
 @bp.route('/company/<symbol>', methods=['GET'])
 def get_company_news(symbol):
@@ -62,7 +68,7 @@ def get_company_news(symbol):
         end_date=end_date.strftime('%Y-%m-%d')
     )
     
-    return jsonify({'news': news_items, 'symbol': symbol})
+    return jsonify({'news': news_items, 'symbol': symbol, 'stale': is_stale(news_items)})
 
 @bp.route('/sentiment/<symbol>', methods=['GET'])
 def get_news_sentiment(symbol):
@@ -95,6 +101,43 @@ def get_news_sentiment(symbol):
         'sentiment': sentiment
     })
 
+@bp.route('/search', methods=['GET'])
+def search_news():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Search query is required'}), 400
+    
+    since = until = None
+    if request.args.get('from'):
+        try:
+            since = int(datetime.strptime(request.args.get('from'), '%Y-%m-%d').timestamp())
+        except ValueError:
+            pass
+    
+    if request.args.get('to'):
+        try:
+            until = int((datetime.strptime(request.args.get('to'), '%Y-%m-%d') + timedelta(days=1)).timestamp()) - 1
+        except ValueError:
+            pass
+    
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    
+    news_items = article_repository.search(
+        query,
+        symbols=request.args.getlist('symbol') or None,
+        categories=request.args.getlist('category') or None,
+        since=since,
+        until=until,
+        limit=limit,
+        offset=offset
+    )
+    
+    return jsonify({'query': query, 'news': news_items, 'count': len(news_items)})
+
 @bp.route('/preferences', methods=['GET'])
 @jwt_required()
 def get_news_preferences():
@@ -151,6 +194,7 @@ def update_news_preferences():
 
 @bp.route('/feed', methods=['GET'])
 @jwt_required()
+@api_priority(BATCH)
 def get_personalized_news_feed():
     current_user_id = get_jwt_identity()
     
@@ -166,47 +210,40 @@ def get_personalized_news_feed():
         db.session.add(preferences)
         db.session.commit()
 
+    try:
+        limit = min(max(int(request.args.get('limit', 200)), 1), 200)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+
     end_date = datetime.now()
     start_date = end_date - timedelta(days=7)
     
-    category_news = []
     for category in preferences.categories:
         news = finnhub_service.get_market_news(
             category,
             start_date=start_date.strftime('%Y-%m-%d'),
             end_date=end_date.strftime('%Y-%m-%d')
         )
-        category_news.extend(news)
+        article_repository.add([item for item in news if item.get('id')], category=category)
 
-    symbol_news = []
     for symbol in preferences.followed_symbols:
         news = finnhub_service.get_company_news(
             symbol,
             start_date=start_date.strftime('%Y-%m-%d'),
             end_date=end_date.strftime('%Y-%m-%d')
         )
-        symbol_news.extend(news)
-    
-    all_news = category_news + symbol_news
-    
-    unique_news = {}
-    for news_item in all_news:
-        if news_item.get('id') and news_item['id'] not in unique_news:
-            unique_news[news_item['id']] = news_item
-    
-    filtered_news = list(unique_news.values())
-    if preferences.keywords:
-        filtered_news = []
-        for news_item in unique_news.values():
-            headline = news_item.get('headline', '').lower()
-            summary = news_item.get('summary', '').lower()
-            
-            for keyword in preferences.keywords:
-                if keyword.lower() in headline or keyword.lower() in summary:
-                    filtered_news.append(news_item)
-                    break
-    
-    sorted_news = sorted(filtered_news, key=lambda x: x.get('datetime', 0), reverse=True)
+        article_repository.add([item for item in news if item.get('id')], symbol=symbol)
+    
+    # Deduplication, keyword filtering and ordering run as one indexed query
+    sorted_news = []
+    if preferences.categories or preferences.followed_symbols:
+        sorted_news = article_repository.search(
+            symbols=preferences.followed_symbols or None,
+            categories=preferences.categories or None,
+            keywords=preferences.keywords or None,
+            since=int(start_date.timestamp()),
+            limit=limit
+        )
     
     return jsonify({
         'news': sorted_news,
@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.portfolio import Portfolio, Position
 from app.services.finnhub_service import FinnhubService
 from app import db
+from utils.api_scheduler import BATCH, api_priority
 import os
 from datetime import datetime
 
@@ -11,6 +12,7 @@ finnhub_service = FinnhubService(api_key=os.environ.get('FINNHUB_API_KEY'))
 
 @bp.route('/', methods=['GET'])
 @jwt_required()
+@api_priority(BATCH)
 def get_portfolios():
     current_user_id = get_jwt_identity()
     
@@ -76,6 +78,7 @@ def create_portfolio():
 
 @bp.route('/<int:portfolio_id>', methods=['GET'])
 @jwt_required()
+@api_priority(BATCH)
 def get_portfolio(portfolio_id):
     """Get a specific portfolio by ID"""
     current_user_id = get_jwt_identity()
@@ -292,6 +295,7 @@ def delete_position(portfolio_id, position_id):
 
 @bp.route('/<int:portfolio_id>/analysis', methods=['GET'])
 @jwt_required()
+@api_priority(BATCH)
 def get_portfolio_analysis(portfolio_id):
     current_user_id = get_jwt_identity()
     portfolio = Portfolio.query.filter_by(
@@ -3,6 +3,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.finnhub_service import FinnhubService
 from app.models.stock_search_history import StockSearchHistory
 from app import db
+from utils.resilience import is_stale
+from utils.api_scheduler import BATCH, api_priority
 import os
 
 bp = Blueprint('stocks', __name__, url_prefix='/api/stocks')
@@ -51,6 +53,16 @@ def get_stock_quote(symbol):
         'company': company_profile or {}
     })
 
+@bp.route('/rate-limit', methods=['GET'])
+def get_rate_limit():
+    # Shared by every blueprint and worker using this API key
+    return jsonify(finnhub_service.rate_limiter.stats())
+
+@bp.route('/transport', methods=['GET'])
+def get_transport_stats():
+    # Connection reuse, latency and bytes per Finnhub endpoint
+    return jsonify(finnhub_service.transport.stats())
+
 @bp.route('/news', methods=['GET'])
 def get_market_news():
     category = request.args.get('category', 'general')
@@ -58,7 +70,7 @@ def get_market_news():
     
     news = finnhub_service.get_market_news(category, min_id=min_id)
     
-    return jsonify({'news': news})
+    return jsonify({'news': news, 'stale': is_stale(news)})
 
 @bp.route('/<symbol>/news', methods=['GET'])
 def get_company_news(symbol):
@@ -75,7 +87,7 @@ def get_company_news(symbol):
         end_date=request.args.get('to', end_date)
     )
     
-    return jsonify({'news': news})
+    return jsonify({'news': news, 'stale': is_stale(news)})
 
 @bp.route('/<symbol>/candles', methods=['GET'])
 def get_stock_candles(symbol):
@@ -106,6 +118,7 @@ def get_stock_candles(symbol):
 
 @bp.route('/watchlist', methods=['GET'])
 @jwt_required()
+@api_priority(BATCH)
 def get_watchlist():
     current_user_id = get_jwt_identity()
     from app.models.user import User
@@ -8,6 +8,7 @@ from app.models.news_preference import NewsPreference
 def init_app(app):
     app.cli.add_command(init_db_command)
     app.cli.add_command(create_admin_command)
+    app.cli.add_command(prefetch_command)
 
 @click.command('init-db')
 @with_appcontext
@@ -43,6 +44,37 @@ def create_admin_command(username, email, password):
     db.session.commit()
     click.echo(f'Created admin user {username}.')
 
+@click.command('prefetch')
+@click.option('--days', default=7, show_default=True, help='Days of company news to warm')
+@click.option('--workers', default=4, show_default=True, help='Threads sharing the API rate limit')
+@click.option('--max-requests', type=int, help='Stop after this many API calls')
+@with_appcontext
+def prefetch_command(days, workers, max_requests):
+    """Warm the news cache for tracked, watchlisted and portfolio symbols."""
+    from finpulse_app import FinPulseApp
+    from app.models.portfolio import Position
+    from app.models.watchlist import WatchlistItem
+    
+    # Symbols held by more users go first, after those the dashboard requests most
+    demand = {}
+    symbols = [item.symbol for item in WatchlistItem.query.all()]
+    symbols += [position.symbol for position in Position.query.all()]
+    for preference in NewsPreference.query.all():
+        symbols += preference.followed_symbols
+    for symbol in symbols:
+        demand[symbol.upper()] = demand.get(symbol.upper(), 0) + 1
+    
+    finpulse = FinPulseApp.from_env()
+    report = finpulse.prefetch(
+        symbols=finpulse.tracked_symbols + list(demand),
+        days=days,
+        demand=demand,
+        workers=workers,
+        max_requests=max_requests
+    )
+    click.echo(f"Prefetched {len(report['symbols'])} symbols: {report['warmed']} entries warmed, "
+               f"{report['failed']} failed, {report['skipped']} skipped, {report['api_calls']} API calls.")
+
 @click.command('seed-demo-data')
 @with_appcontext
 def seed_demo_data_command():
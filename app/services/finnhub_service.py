@@ -1,37 +1,50 @@
-import requests
+import os
 import finnhub
 import time
 import logging
 from datetime import datetime, timedelta
 
+from utils.api_scheduler import shared_scheduler
+from utils.http_transport import default_transport, last_response_stale
+from utils.resilience import mark_stale, wait_hint
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://finnhub.io/api/v1"
+
 class FinnhubService:
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, rate_limiter=None, transport=None, base_url=None):
         self.api_key = api_key
         self.client = finnhub.Client(api_key=api_key)
-        self.base_url = "https://finnhub.io/api/v1"
-        self.request_limit = 60  
-        self.requests_made = 0
-        self.rate_limit_reset_time = time.time() + 60
+        self.base_url = (base_url or os.environ.get('FINNHUB_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.client.API_URL = self.base_url
+        # The blueprints each create a service; they and every worker share one budget,
+        # handed out by priority class and fairly among users
+        self.rate_limiter = rate_limiter or shared_scheduler(api_key)
+        
+        # finnhub.Client keeps its token and headers on its session; move them onto the shared pool
+        self.transport = transport or default_transport()
+        self.session = self.transport.new_session()
+        self.session.headers.update(self.client._session.headers)
+        self.session.params.update(self.client._session.params)
+        # finnhub.Client does not expose responses; the session reports their rate limit headers
+        self.session.hooks['response'].append(self._track_rate_limit)
+        self.session.before_retry = self._handle_rate_limiting
+        self.client._session.close()
+        self.client._session = self.session
     
     def _handle_rate_limiting(self):
-        current_time = time.time()
-        
-        if current_time > self.rate_limit_reset_time:
-            self.requests_made = 0
-            self.rate_limit_reset_time = current_time + 60
-        
-        if self.requests_made >= self.request_limit:
-            sleep_time = self.rate_limit_reset_time - current_time
-            if sleep_time > 0:
-                logger.info(f"Rate limit reached, sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                self.requests_made = 0
-                self.rate_limit_reset_time = time.time() + 60
-        
-        self.requests_made += 1
+        self.rate_limiter.acquire()
+    
+    def _mark_if_stale(self, payload):
+        # finnhub.Client hands back only the payload; the transport knows if it was a fallback
+        return mark_stale(payload) if last_response_stale() else payload
+    
+    def _track_rate_limit(self, response, *args, **kwargs):
+        self.rate_limiter.update_from_headers(response.headers)
+        if response.status_code == 429 and 'X-Ratelimit-Reset' not in response.headers:
+            self.rate_limiter.block(wait_hint(response.headers) or 1.0)
     
     def search_symbols(self, query):
         self._handle_rate_limiting()
@@ -57,7 +70,7 @@ class FinnhubService:
     def get_quote(self, symbol):
         self._handle_rate_limiting()
         try:
-            quote = self.client.quote(symbol)
+            quote = self._mark_if_stale(self.client.quote(symbol))
             quote['timestamp'] = int(time.time())
             quote['retrieved_at'] = datetime.now().isoformat()
             
@@ -69,7 +82,7 @@ class FinnhubService:
     def get_company_profile(self, symbol):
         self._handle_rate_limiting()
         try:
-            profile = self.client.company_profile2(symbol=symbol)
+            profile = self._mark_if_stale(self.client.company_profile2(symbol=symbol))
             return profile
         except Exception as e:
             logger.error(f"Error getting company profile for {symbol}: {str(e)}")
@@ -84,6 +97,7 @@ class FinnhubService:
                 to_time = int(to_time)
                 
             candles = self.client.stock_candles(symbol, resolution, from_time, to_time)
+            stale = last_response_stale()
 
             if candles.get('s') == 'no_data':
                 return {'s': 'no_data', 'error': 'No data available for the requested period'}
@@ -96,6 +110,8 @@ class FinnhubService:
                 'status': candles.get('s', ''),
                 'candles': []
             }
+            if stale:
+                formatted_candles['stale'] = True
             
             timestamps = candles.get('t', [])
             opens = candles.get('o', [])
@@ -135,7 +151,7 @@ class FinnhubService:
                         'to': end_date
                     })
                     
-                    response = requests.get(url, headers=headers, params=params)
+                    response = self.session.get(url, headers=headers, params=params)
                     if response.status_code == 200:
                         news = response.json()
                     else:
@@ -160,7 +176,7 @@ class FinnhubService:
                     'related': article.get('related', '')
                 })
             
-            return formatted_news
+            return self._mark_if_stale(formatted_news)
         except Exception as e:
             logger.error(f"Error getting market news: {str(e)}")
             return []
@@ -183,7 +199,7 @@ class FinnhubService:
                     'related': article.get('related', '')
                 })
             
-            return formatted_news
+            return self._mark_if_stale(formatted_news)
         except Exception as e:
             logger.error(f"Error getting company news for {symbol}: {str(e)}")
             return []
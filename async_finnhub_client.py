@@ -0,0 +1,209 @@
+"""FinPulse - Async Finnhub API Client
+asyncio counterpart of ``FinnhubClient`` for fetching many symbols at once. Requests
+share a pooled ``aiohttp`` session, at most ``max_concurrency`` are in flight, and
+all of them draw from the same rate limit, retry policy and circuit breakers as
+the synchronous clients.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+import aiohttp
+from dotenv import load_dotenv
+
+from finnhub_client import DEFAULT_BASE_URL, FinnhubClient
+from utils.api_scheduler import shared_scheduler
+from utils.http_transport import default_transport
+from utils.range_fetcher import NewsRangeFetcher, merge_chunks
+from utils.resilience import HALF_OPEN, mark_stale, payload_key, retry_reason, wait_hint
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFinnhubClient:
+
+    def __init__(self, api_key=None, base_url=None, max_connections=20, max_concurrency=10,
+                 rate_limiter=None, timeout=30.0, max_retries=None, resilience=None, range_fetcher=None):
+        self.api_key = api_key or os.getenv('FINNHUB_API_KEY')
+        if not self.api_key:
+            raise ValueError("Finnhub API key not provided. Set FINNHUB_API_KEY environment variable.")
+
+        self.base_url = (base_url or os.getenv('FINNHUB_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or shared_scheduler(self.api_key)
+        self.timeout = timeout
+        # Breakers and fallback payloads are shared with the synchronous clients
+        self.resilience = resilience or default_transport().resilience
+        self.max_retries = self.resilience.policy.max_retries if max_retries is None else max_retries
+        self.range_fetcher = range_fetcher or NewsRangeFetcher()
+        self.requests_made = 0
+        self.bytes_received = 0
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _open(self):
+        # The session and semaphore belong to the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300),
+                headers={"X-Finnhub-Token": self.api_key},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _make_request(self, endpoint, params=None):
+        """GET ``endpoint``; retried, circuit-broken and falling back like ``FinnhubClient``."""
+        self._open()
+        url = f"{self.base_url}/{endpoint}"
+        key = payload_key('GET', f"{url}?{urlencode(params or {})}")
+        policy = self.resilience.policy
+        breaker = self.resilience.breaker(endpoint)
+        async with self._semaphore:
+            permit = breaker.allow()
+            if not permit:
+                self.resilience.count(endpoint, 'short_circuited')
+                return self._fallback(endpoint, key, f"Circuit for {endpoint} is open")
+            
+            try:
+                deadline = time.monotonic() + policy.deadline
+                for attempt in range(self.max_retries + 1):
+                    await self.rate_limiter.acquire_async()
+                    headers = None
+                    try:
+                        async with self._session.get(url, params=params) as response:
+                            body = await response.read()
+                            self.requests_made += 1
+                            self.bytes_received += len(body)
+                            headers = response.headers
+                            self.rate_limiter.update_from_headers(headers)
+                            if response.status == 429 and 'X-Ratelimit-Reset' not in headers:
+                                self.rate_limiter.block(wait_hint(headers) or 1.0)
+                        
+                            reason = retry_reason(response.status)
+                            if reason is None:
+                                breaker.record_success()
+                                response.raise_for_status()
+                                payload = json.loads(body)
+                                self.resilience.payloads.put(key, body, response.headers.get('Content-Type'))
+                                return payload
+                            error = f"{response.status}, message={response.reason!r}, url={response.url}"
+                
+                    except aiohttp.ClientResponseError as e:
+                        logger.error(f"HTTP error: {str(e)}")
+                        return {"error": str(e)}
+                
+                    except ValueError as e:
+                        # A body that is not JSON, as the synchronous client reports it
+                        logger.error(f"Request error: {str(e)}")
+                        return {"error": str(e)}
+                
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        error = str(e) or type(e).__name__
+                        reason = retry_reason(error=e)
+                
+                    # A 429 means our budget is spent, not that Finnhub is failing
+                    if reason != 'rate_limited':
+                        breaker.record_failure()
+                    delay = policy.delay(attempt, wait_hint(headers))
+                    if attempt >= self.max_retries or breaker.is_open or time.monotonic() + delay > deadline:
+                        break
+                    self.resilience.count(endpoint, f"retry:{reason}")
+                    logger.warning(f"{endpoint}: {reason}, retry {attempt + 1} of {self.max_retries} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+            
+                self.resilience.count(endpoint, 'exhausted')
+                return self._fallback(endpoint, key, error)
+            finally:
+                if permit == HALF_OPEN:
+                    breaker.release()
+    
+    def _fallback(self, endpoint, key, error):
+        cached = self.resilience.payloads.get(key)
+        if cached is None:
+            logger.error(f"Request error: {error}")
+            return {"error": error}
+        self.resilience.count(endpoint, 'stale_served')
+        logger.warning(f"{endpoint} unavailable, serving the response from {time.time() - cached[2]:.0f}s ago")
+        return mark_stale(json.loads(cached[0]))
+    
+    async def get_company_news(self, symbol, from_date=None, to_date=None):
+        if not from_date:
+            from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+        if not to_date:
+            to_date = datetime.now().strftime('%Y-%m-%d')
+
+        logger.info(f"Fetching news for {symbol} from {from_date} to {to_date}")
+
+        params = {
+            'symbol': symbol,
+            'from': from_date,
+            'to': to_date
+        }
+
+        return await self._make_request('company-news', params)
+
+    def iter_company_news(self, symbol, from_date, to_date):
+        """Async iterator of ``(first, last, articles)`` per chunk of a long range, as chunks complete."""
+        return self.range_fetcher.iter_chunks_async(self.get_company_news, symbol, from_date, to_date)
+
+    async def get_company_news_range(self, symbol, from_date, to_date):
+        return merge_chunks([chunk async for chunk in self.iter_company_news(symbol, from_date, to_date)])
+
+    async def get_market_news(self, category='general', min_id=None):
+        logger.info(f"Fetching market news for category: {category}")
+
+        params = {
+            'category': category
+        }
+        if min_id:
+            params['minId'] = min_id
+
+        return await self._make_request('news', params)
+
+    async def get_company_profile(self, symbol):
+        logger.info(f"Fetching company profile for {symbol}")
+        return await self._make_request('stock/profile2', {'symbol': symbol})
+
+    async def get_stock_quote(self, symbol):
+        logger.info(f"Fetching stock quote for {symbol}")
+        return await self._make_request('quote', {'symbol': symbol})
+
+    async def search_symbol(self, query):
+        logger.info(f"Searching for symbol: {query}")
+        return await self._make_request('search', {'q': query})
+
+    async def get_earnings(self, symbol):
+        logger.info(f"Fetching earnings data for {symbol}")
+        return await self._make_request('stock/earnings', {'symbol': symbol})
+
+    async def get_many(self, method, symbols, *args, **kwargs):
+        """Call ``method`` (e.g. ``'get_stock_quote'``) for every symbol concurrently.
+
+        Returns ``{symbol: payload}`` in the order of ``symbols``.
+        """
+        request = getattr(self, method)
+        results = await asyncio.gather(*(request(symbol, *args, **kwargs) for symbol in symbols))
+        return dict(zip(symbols, results))
+
+    def format_news_data(self, news_items):
+        return FinnhubClient.format_news_data(self, news_items)
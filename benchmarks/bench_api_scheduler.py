@@ -0,0 +1,87 @@
+"""Benchmark interactive latency under background load, with and without the scheduler.
+
+A process-local token bucket stands in for the Finnhub budget (60 calls per
+minute scaled to ``--rate`` per second). Background threads keep drawing from
+it, two users each run batch threads (one of them twice as many as the other),
+and interactive calls arrive at random. Each setup reports how long interactive
+calls waited and how the budget was split:
+
+- bucket: every caller reserves tokens straight from ``TokenBucket`` in arrival order
+- scheduler: callers go through ``ApiScheduler`` with their priority class and user
+
+    python -m benchmarks.bench_api_scheduler --seconds 10 --rate 30
+"""
+
+import time
+import random
+import logging
+import argparse
+import threading
+
+import numpy as np
+
+from utils.api_scheduler import ApiScheduler, INTERACTIVE, BATCH, BACKGROUND
+from utils.rate_limiter import TokenBucket
+
+
+def run(limiter, seconds, background_threads, interactive_interval, scheduled):
+    stop = time.monotonic() + seconds
+    grants = {'background': 0, 'batch:alice': 0, 'batch:bob': 0}
+    interactive_waits = []
+    lock = threading.Lock()
+
+    def acquire(priority, user):
+        if scheduled:
+            return limiter.acquire(priority, user)
+        return limiter.acquire()
+
+    def loop(priority, user, name):
+        while time.monotonic() < stop:
+            acquire(priority, user)
+            with lock:
+                grants[name] += 1
+
+    def interactive():
+        while time.monotonic() < stop:
+            time.sleep(random.expovariate(1 / interactive_interval))
+            start = time.monotonic()
+            acquire(INTERACTIVE, f"user{random.randrange(100)}")
+            with lock:
+                interactive_waits.append(time.monotonic() - start)
+
+    threads = [threading.Thread(target=loop, args=(BACKGROUND, None, 'background'))
+               for _ in range(background_threads)]
+    threads += [threading.Thread(target=loop, args=(BATCH, 'alice', 'batch:alice')) for _ in range(4)]
+    threads += [threading.Thread(target=loop, args=(BATCH, 'bob', 'batch:bob')) for _ in range(2)]
+    threads.append(threading.Thread(target=interactive))
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join(seconds * 10)
+    return np.array(interactive_waits) * 1000, grants
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark priority scheduling of the Finnhub budget")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run")
+    parser.add_argument("--rate", type=int, default=30, help="Calls per second of the budget")
+    parser.add_argument("--background", type=int, default=8, help="Background threads")
+    parser.add_argument("--interval", type=float, default=0.25, help="Mean seconds between interactive calls")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print(f"{args.rate} calls/s, {args.background} background threads, 4 + 2 batch threads (alice, bob), "
+          f"an interactive call every {args.interval * 1000:.0f} ms on average")
+    print(f"{'limiter':>10} {'interactive':>12} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} "
+          f"{'background':>11} {'alice':>6} {'bob':>6}")
+    for name, scheduled in (('bucket', False), ('scheduler', True)):
+        bucket = TokenBucket(rate=args.rate, period=1.0)
+        limiter = ApiScheduler(bucket) if scheduled else bucket
+        waits, grants = run(limiter, args.seconds, args.background, args.interval, scheduled)
+        print(f"{name:>10} {len(waits):12d} {np.percentile(waits, 50):7.0f} {np.percentile(waits, 99):7.0f} "
+              f"{waits.max():7.0f} {grants['background']:11d} {grants['batch:alice']:6d} {grants['batch:bob']:6d}")
+
+
+if __name__ == '__main__':
+    main()
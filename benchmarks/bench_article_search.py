@@ -0,0 +1,119 @@
+"""Benchmark keyword filtering and search in the article repository.
+
+Builds synthetic histories of several sizes from the cached articles (random
+word swaps keep the texts distinct), links each article to a symbol or market
+news category, and times typical queries against the SQLite repository and
+the equivalent in-memory list scans:
+
+- keyword filter: ``filter_news_by_keywords`` over the whole history against
+  an FTS5 query (the ``/api/news/feed`` keyword filter)
+- symbol feed: the newest articles of one symbol in the last week
+- search: a two-word query restricted to one category
+
+    python -m benchmarks.bench_article_search --sizes 10000 100000 1000000
+"""
+
+import os
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+import time
+
+from benchmarks.common import best_of, load_cached_corpus
+from utils.article_repository import ArticleRepository
+from utils.finnhub_utils import filter_news_by_keywords
+
+SYMBOLS = [f"SYM{index:02d}" for index in range(50)]
+CATEGORIES = ('general', 'forex', 'crypto', 'merger')
+KEYWORDS = ['dividend', 'guidance']
+QUERY = 'bitcoin price'
+WEEK = 7 * 24 * 60 * 60
+BATCH = 10000
+
+
+def build_history(articles, size, now, rng):
+    vocabulary = sorted({word for article in articles for word in article.get('headline', '').split()})
+    history = []
+    for index in range(size):
+        article = articles[index % len(articles)]
+        words = article.get('headline', '').split() or ['news']
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        item = dict(article, id=index + 1, headline=' '.join(words), datetime=now - rng.randrange(365 * 24 * 3600))
+        if rng.random() < 0.5:
+            item['symbol'] = rng.choice(SYMBOLS)
+        else:
+            item['category'] = rng.choice(CATEGORIES)
+        history.append(item)
+    return history
+
+
+def scan_symbol_feed(history, symbol, since, limit=50):
+    matches = [item for item in history if item.get('symbol') == symbol and item['datetime'] >= since]
+    return sorted(matches, key=lambda item: item['datetime'], reverse=True)[:limit]
+
+
+def scan_search(history, category, limit=50):
+    words = QUERY.split()
+    matches = [
+        item for item in history
+        if item.get('category') == category
+        and all(word in f"{item.get('headline', '')} {item.get('summary', '')}".lower() for word in words)
+    ]
+    return sorted(matches, key=lambda item: item['datetime'], reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article search")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[10000, 100000, 1000000], help="History sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    articles = load_cached_corpus()
+    now = int(time.time())
+    work_dir = tempfile.mkdtemp(prefix='finpulse-search-')
+    try:
+        for size in args.sizes:
+            rng = random.Random(size)
+            history = build_history(articles, size, now, rng)
+            repository = ArticleRepository(os.path.join(work_dir, f"articles_{size}.db"))
+
+            start = time.perf_counter()
+            for offset in range(0, size, BATCH):
+                batch = history[offset:offset + BATCH]
+                for symbol in SYMBOLS:
+                    repository.add([item for item in batch if item.get('symbol') == symbol], symbol=symbol)
+                for category in CATEGORIES:
+                    repository.add([item for item in batch if item.get('category') == category], category=category)
+            ingest = time.perf_counter() - start
+            db_size = os.path.getsize(repository.path) / 2 ** 20
+
+            since = now - WEEK
+            timings = {
+                'keyword filter': (
+                    best_of(lambda: filter_news_by_keywords(history, KEYWORDS), args.repeat),
+                    best_of(lambda: repository.search(keywords=KEYWORDS, limit=size), args.repeat)
+                ),
+                'symbol feed': (
+                    best_of(lambda: scan_symbol_feed(history, SYMBOLS[0], since), args.repeat),
+                    best_of(lambda: repository.search(symbols=[SYMBOLS[0]], since=since), args.repeat)
+                ),
+                'search': (
+                    best_of(lambda: scan_search(history, 'crypto'), args.repeat),
+                    best_of(lambda: repository.search(QUERY, categories=['crypto']), args.repeat)
+                )
+            }
+            repository.close()
+
+            print(f"{size} articles: ingested in {ingest:.1f} s ({size / ingest:,.0f}/s), {db_size:.0f} MiB")
+            for name, (scan, indexed) in timings.items():
+                print(f"  {name:15s} list scan {scan * 1000:9.2f} ms | indexed {indexed * 1000:8.2f} ms "
+                      f"({scan / indexed:7.1f}x)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark fetching the news of many symbols serially and concurrently.
+
+The local Finnhub stand-in (``utils.finnhub_standin``) answers ``company-news``
+with cached articles after a fixed delay. For each watchlist size the script times:
+
+- client: ``FinnhubClient.get_company_news`` for one symbol after another against
+  ``AsyncFinnhubClient`` fetching them all with bounded concurrency
+- app: ``FinPulseApp.get_all_tracked_symbols_news`` against
+  ``get_all_tracked_symbols_news_async`` on an empty cache, including storage
+  and sentiment analysis
+
+    python -m benchmarks.bench_async_client --sizes 5 50 500 --latency 0.1
+"""
+
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+
+from async_finnhub_client import AsyncFinnhubClient
+from finnhub_client import FinnhubClient
+from finpulse_app import FinPulseApp
+from utils.finnhub_standin import FinnhubStandIn, StandInData
+from utils.rate_limiter import TokenBucket
+
+# About 20 articles per symbol over the default week
+ARTICLES_PER_DAY = 3
+# The stand-in has no rate limit, so both paths are measured on latency alone
+UNLIMITED = 1000000
+
+
+def fetch_serial(base_url, symbols):
+    client = FinnhubClient('benchmark', rate_limiter=TokenBucket(rate=UNLIMITED, period=1.0), base_url=base_url)
+    for symbol in symbols:
+        client.get_company_news(symbol)
+
+
+async def fetch_concurrent(base_url, symbols, concurrency):
+    rate_limiter = TokenBucket(rate=UNLIMITED, period=1.0)
+    async with AsyncFinnhubClient('benchmark', base_url=base_url, max_concurrency=concurrency,
+                                  max_connections=concurrency, rate_limiter=rate_limiter) as client:
+        await client.get_many('get_company_news', symbols)
+
+
+def time_app(base_url, symbols, concurrency, concurrent):
+    work_dir = tempfile.mkdtemp(prefix='finpulse-async-')
+    try:
+        app = FinPulseApp(api_key='benchmark', cache_dir=work_dir, api_concurrency=concurrency, article_index=False,
+                          base_url=base_url)
+        app.client.rate_limiter = TokenBucket(rate=UNLIMITED, period=1.0)
+        app.tracked_symbols = symbols
+        app.sentiment_analyzer.warm_up()
+
+        start = time.perf_counter()
+        if concurrent:
+            news = asyncio.run(app.get_all_tracked_symbols_news_async())
+        else:
+            news = app.get_all_tracked_symbols_news()
+        elapsed = time.perf_counter() - start
+        assert len(news) == len(symbols)
+        return elapsed
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial and concurrent multi-symbol fetches")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[5, 50, 500], help="Watchlist sizes")
+    parser.add_argument("--latency", type=float, default=0.1, help="Stand-in response delay in seconds")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight for the async client")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    server = FinnhubStandIn(StandInData.from_cache(articles_per_day=ARTICLES_PER_DAY), latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        print(f"stand-in latency {args.latency * 1000:.0f} ms, async concurrency {args.concurrency}")
+        print(f"{'symbols':>8} {'client serial s':>16} {'client async s':>15} {'app serial s':>13} {'app async s':>12}")
+        for size in args.sizes:
+            symbols = [f"SYM{index:03d}" for index in range(size)]
+            serial = timed(fetch_serial, server.base_url, symbols)
+            concurrent = timed(lambda: asyncio.run(fetch_concurrent(server.base_url, symbols, args.concurrency)))
+            app_serial = time_app(server.base_url, symbols, args.concurrency, concurrent=False)
+            app_concurrent = time_app(server.base_url, symbols, args.concurrency, concurrent=True)
+            print(f"{size:8d} {serial:16.2f} {concurrent:15.2f} {app_serial:13.2f} {app_concurrent:12.2f} "
+                  f"({serial / concurrent:.1f}x / {app_serial / app_concurrent:.1f}x)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
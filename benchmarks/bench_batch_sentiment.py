@@ -0,0 +1,54 @@
+"""Benchmark the vectorized batch sentiment engine against the per-item VADER loop.
+
+Checks score parity on the cached corpus first, then reports articles per second.
+Run from the repository root: ``python -m benchmarks.bench_batch_sentiment``
+"""
+
+import logging
+import argparse
+
+from benchmarks.common import load_cached_corpus, best_of
+from sentiment_analyzer import SentimentAnalyzer
+
+COMPOUND_TOLERANCE = 1e-4
+BREAKDOWN_TOLERANCE = 1e-3
+
+
+def check_parity(analyzer, texts):
+    clean_texts = [analyzer.preprocess_text(text) for text in texts]
+    batch = analyzer.batch_engine.polarity_scores_batch(clean_texts)
+    mismatches = 0
+    for clean_text, scores in zip(clean_texts, batch):
+        expected = analyzer.sid.polarity_scores(clean_text)
+        if abs(expected['compound'] - scores['compound']) > COMPOUND_TOLERANCE or any(
+            abs(expected[key] - scores[key]) > BREAKDOWN_TOLERANCE for key in ('pos', 'neg', 'neu')
+        ):
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=20, help='Replicate the corpus this many times')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    analyzer = SentimentAnalyzer()
+    articles = load_cached_corpus()
+    texts = [f"{item.get('headline', '')} {item.get('summary', '')}" for item in articles]
+
+    mismatches = check_parity(analyzer, texts)
+    print(f"Parity: {len(texts) - mismatches}/{len(texts)} articles within tolerance")
+
+    corpus = [analyzer.preprocess_text(text) for text in texts] * args.scale
+    loop_time = best_of(lambda: [analyzer.sid.polarity_scores(text) for text in corpus], args.repeat)
+    batch_time = best_of(lambda: analyzer.batch_engine.polarity_scores_batch(corpus), args.repeat)
+
+    print(f"Articles scored: {len(corpus)}")
+    print(f"Per-item loop:   {len(corpus) / loop_time:10.0f} articles/s")
+    print(f"Batch engine:    {len(corpus) / batch_time:10.0f} articles/s ({loop_time / batch_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
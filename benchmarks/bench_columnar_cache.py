@@ -0,0 +1,118 @@
+"""Benchmark the JSON and columnar news file formats.
+
+Cached articles, with a sentiment payload attached, are repeated to several
+corpus sizes and written once per format. For each file the script times a full
+load into article dicts and a summary read of the ``datetime`` and score
+columns, and reports the peak RSS each read adds, measured in a fresh
+interpreter per read.
+
+    python -m benchmarks.bench_columnar_cache --sizes 1000 10000 100000
+"""
+
+import os
+import sys
+import random
+import shutil
+import logging
+import argparse
+import resource
+import tempfile
+import subprocess
+
+from benchmarks.common import best_of, load_cached_corpus
+from utils.news_store import NEWS_FORMATS
+
+SUMMARY_COLUMNS = ('datetime', 'sentiment_score', 'sentiment_label')
+READS = ('load', 'summary')
+
+
+def build_corpus(articles, size, seed=0):
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(size):
+        item = dict(articles[index % len(articles)], id=index + 1)
+        score = round(rng.uniform(-1, 1), 4)
+        positive = round(rng.random() * 0.3, 3)
+        negative = round(rng.random() * 0.3, 3)
+        item['sentiment'] = {
+            'score': score,
+            'label': 'positive' if score >= 0.05 else 'negative' if score <= -0.05 else 'neutral',
+            'breakdown': {'positive': positive, 'negative': negative, 'neutral': round(1 - positive - negative, 3)},
+            'keywords': item.get('headline', '').lower().split()[:5]
+        }
+        item['sentiment_version'] = 'benchmark'
+        corpus.append(item)
+    return corpus
+
+
+def read(format_name, path, kind):
+    news_format = NEWS_FORMATS[format_name]
+    if kind == 'load':
+        return news_format.load(path)
+    return news_format.read_columns(path, SUMMARY_COLUMNS)
+
+
+def peak_rss_kib(format_name, path, kind):
+    """Peak RSS a read adds to a fresh interpreter that has already imported everything."""
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_columnar_cache', '--child', format_name, path, kind],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return int(output.split()[-1])
+
+
+def rss_kib(field):
+    """``VmRSS`` or ``VmHWM`` (peak) of this process.
+
+    ``ru_maxrss`` is not used: it keeps the parent's peak across fork and exec.
+    """
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(format_name, path, kind):
+    logging.disable(logging.INFO)
+    before = rss_kib('VmRSS')
+    result = read(format_name, path, kind)
+    after = rss_kib('VmHWM')
+    # keep the result alive until the peak has been taken
+    del result
+    print(after - before)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON and columnar news files")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[1000, 10000, 100000], help="Articles per file")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--child", nargs=3, metavar=('FORMAT', 'PATH', 'READ'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    logging.disable(logging.INFO)
+    articles = load_cached_corpus()
+    work_dir = tempfile.mkdtemp(prefix='finpulse-columnar-')
+    try:
+        print(f"{'articles':>9} {'format':>9} {'file KiB':>9} {'load ms':>9} {'summary ms':>11} "
+              f"{'load RSS KiB':>13} {'summary RSS KiB':>16}")
+        for size in args.sizes:
+            corpus = build_corpus(articles, size)
+            for format_name, news_format in NEWS_FORMATS.items():
+                path = os.path.join(work_dir, f"news_{size}{news_format.extension}")
+                news_format.save(corpus, path)
+                timings = {kind: best_of(lambda: read(format_name, path, kind), args.repeat) for kind in READS}
+                rss = {kind: peak_rss_kib(format_name, path, kind) for kind in READS}
+                print(f"{size:9d} {format_name:>9} {os.path.getsize(path) / 1024:9.0f} "
+                      f"{timings['load'] * 1000:9.1f} {timings['summary'] * 1000:11.2f} "
+                      f"{rss['load']:13d} {rss['summary']:16d}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark ``/company-news`` work on a warm article cache.
+
+The cached ``{SYMBOL}_news.json`` files are split into day partitions in a
+scratch directory, once as plain articles (how they were stored before sentiment
+was persisted) and once with the stored sentiment and extracted data. Each
+request runs what the route does: ``get_company_news_with_sentiment``,
+``get_sentiment_summary`` and JSON encoding. The in-memory sentiment cache is
+cleared before every request, as in a freshly started worker.
+
+    python -m benchmarks.bench_company_news --repeat 5
+"""
+
+import os
+import json
+import glob
+import shutil
+import logging
+import argparse
+import tempfile
+import time
+
+from benchmarks.common import CACHE_DIR
+from finpulse_app import FinPulseApp
+from utils.finnhub_utils import load_news_from_json
+from utils.news_store import article_day, day_range
+
+
+def build_partitions(app, cache_dir):
+    """Write every cached company news file into day partitions; return the request ranges."""
+    ranges = {}
+    for path in sorted(glob.glob(os.path.join(cache_dir, '*_news.json'))):
+        symbol = os.path.basename(path)[:-len('_news.json')]
+        by_day = {}
+        for item in load_news_from_json(path):
+            by_day.setdefault(article_day(item), []).append(item)
+        by_day.pop(None, None)
+        if not by_day:
+            continue
+
+        first, last = min(by_day), max(by_day)
+        for day in day_range(first, last):
+            app.news_store.write_day(symbol, day, by_day.get(day, []))
+        ranges[symbol] = (first.isoformat(), last.isoformat())
+    return ranges
+
+
+def time_requests(app, ranges):
+    start = time.perf_counter()
+    for symbol, (from_date, to_date) in ranges.items():
+        app.sentiment_cache.clear()
+        news = app.get_company_news_with_sentiment(symbol, from_date, to_date, limit=100)
+        json.dumps({'stats': app.get_sentiment_summary(symbol, news), 'news': news}, default=str)
+    return (time.perf_counter() - start) / len(ranges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /company-news on a warm cache")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    work_dir = tempfile.mkdtemp(prefix='finpulse-news-')
+    cwd = os.getcwd()
+    try:
+        # the app logs to finpulse.log in the working directory
+        os.chdir(work_dir)
+        app = FinPulseApp(api_key='benchmark', cache_dir=os.path.join(work_dir, 'cache'))
+        app.sentiment_analyzer.warm_up()
+        ranges = build_partitions(app, CACHE_DIR)
+
+        store_root = app.news_store.root
+        plain_copy = os.path.join(work_dir, 'plain')
+        shutil.copytree(store_root, plain_copy)
+
+        plain = []
+        for _ in range(args.repeat):
+            shutil.rmtree(store_root)
+            shutil.copytree(plain_copy, store_root)
+            plain.append(time_requests(app, ranges))
+
+        # the last plain run wrote the enriched articles back
+        persisted = [time_requests(app, ranges) for _ in range(args.repeat)]
+
+        articles = sum(len(app.news_store.read_range(symbol, day_range(*bounds))) for symbol, bounds in ranges.items())
+        print(f"{len(ranges)} symbols, {articles} articles")
+        print(f"Plain articles (analyzed per request): {min(plain) * 1000:7.1f} ms/request")
+        print(f"Persisted sentiment:                   {min(persisted) * 1000:7.1f} ms/request "
+              f"({min(plain) / min(persisted):.1f}x)")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
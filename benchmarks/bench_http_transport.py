@@ -0,0 +1,108 @@
+"""Benchmark the pooled HTTP transport against one connection per request.
+
+Threads fetch ``company-news`` from the local Finnhub stand-in
+(``utils.finnhub_standin``), either with a bare ``requests.get`` per call, which
+opens a new connection every time, or through the session of the shared
+``HttpTransport``. With ``--tls`` the stand-in serves HTTPS with a throwaway
+self-signed certificate (needs ``openssl``), where every new connection also pays
+for a handshake.
+
+    python -m benchmarks.bench_http_transport --threads 32 --requests 2000 --tls
+"""
+
+import os
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+import urllib3
+
+from utils.finnhub_standin import FinnhubStandIn, StandInData
+from utils.http_transport import HttpTransport
+
+TO_DATE = date.today().isoformat()
+FROM_DATE = (date.today() - timedelta(days=7)).isoformat()
+
+
+def make_certificate(work_dir):
+    """A throwaway self-signed certificate and key for 127.0.0.1."""
+    cert = os.path.join(work_dir, 'cert.pem')
+    key = os.path.join(work_dir, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=127.0.0.1',
+         '-keyout', key, '-out', cert],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+def run(server, threads, count, fetch):
+    latencies = []
+    lock = threading.Lock()
+    url = f"{server.base_url}/company-news"
+
+    def call(index):
+        start = time.perf_counter()
+        response = fetch(url, {'symbol': f"SYM{index % 50:03d}", 'from': FROM_DATE, 'to': TO_DATE,
+                               'token': 'benchmark'})
+        response.raise_for_status()
+        response.content
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    before = server.stats()['connections']
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(call, range(count)))
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    connections = server.stats()['connections'] - before
+    return elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99), connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled and per-request HTTP connections")
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent callers")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run")
+    parser.add_argument("--latency", type=float, default=0.005, help="Stand-in response delay in seconds")
+    parser.add_argument("--tls", action='store_true', help="Serve HTTPS with a self-signed certificate")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    work_dir = tempfile.mkdtemp(prefix='finpulse-transport-')
+    cert, key = make_certificate(work_dir) if args.tls else (None, None)
+    server = FinnhubStandIn(
+        StandInData.from_cache(articles_per_day=3), latency=args.latency, certfile=cert, keyfile=key
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    transport = HttpTransport(pool_maxsize=args.threads)
+    try:
+        print(f"{args.requests} requests on {args.threads} threads, {server.scheme}, "
+              f"stand-in latency {args.latency * 1000:.0f} ms")
+        print(f"{'client':>22} {'total s':>8} {'req/s':>7} {'p50 ms':>7} {'p99 ms':>7} {'connections':>12}")
+        runs = [
+            ('requests.get per call', lambda url, params: requests.get(url, params=params, verify=False, timeout=30)),
+            ('shared transport', lambda url, params: transport.session.get(url, params=params, verify=False))
+        ]
+        for name, fetch in runs:
+            elapsed, p50, p99, connections = run(server, args.threads, args.requests, fetch)
+            print(f"{name:>22} {elapsed:8.2f} {args.requests / elapsed:7.0f} {p50:7.1f} {p99:7.1f} {connections:12d}")
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Parity check and throughput benchmark for keyword tokenization.
+
+Compares the ``fast`` keyword tokenizer mode with the ``nltk`` (``word_tokenize``)
+mode on the preprocessed text and headlines of every cached article, and on the
+raw headlines ``/keywords`` and ``/word-cloud`` extract keywords from, then
+reports keyword extractions per second for both. ``tests/test_keyword_tokenizer.py``
+asserts the parity.
+Run from the repository root: ``python -m benchmarks.bench_keywords``
+"""
+
+import logging
+import argparse
+
+from analyzer import keyword_tokenizer
+from benchmarks.common import load_cached_corpus, best_of
+from sentiment_analyzer import SentimentAnalyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=10, help='Replicate the corpus this many times')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    fast = SentimentAnalyzer(keyword_tokenizer_mode='fast')
+    reference = SentimentAnalyzer(keyword_tokenizer_mode='nltk')
+    articles = load_cached_corpus()
+
+    texts = [fast.preprocess_text(f"{item.get('headline', '')} {item.get('summary', '')}") for item in articles]
+    texts += [fast.preprocess_text(item.get('headline', '')) for item in articles]
+    headlines = [item['headline'] for item in articles if item.get('headline')]
+
+    for name, sample in (('preprocessed', texts), ('raw headlines', headlines)):
+        mismatches = [text for text in sample if fast.extract_keywords(text) != reference.extract_keywords(text)]
+        supported = sum(1 for text in sample if keyword_tokenizer.supports(text))
+        print(f"{name}: keyword parity {len(sample) - len(mismatches)}/{len(sample)} texts identical, "
+              f"{supported} on the fast path")
+        for text in mismatches[:5]:
+            print(f"  differs: {text[:100]}...")
+
+        corpus = sample * args.scale
+        nltk_time = best_of(lambda: [reference.extract_keywords(text) for text in corpus], args.repeat)
+        fast_time = best_of(lambda: [fast.extract_keywords(text) for text in corpus], args.repeat)
+
+        print(f"  texts: {len(corpus)}")
+        print(f"  word_tokenize mode: {len(corpus) / nltk_time:10.0f} texts/s")
+        print(f"  fast mode:          {len(corpus) / fast_time:10.0f} texts/s ({nltk_time / fast_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
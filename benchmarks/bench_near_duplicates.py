@@ -0,0 +1,91 @@
+"""Benchmark near-duplicate story clustering.
+
+First reports clusters and saved scoring work on the cached corpus for a range of
+thresholds. Then grows a synthetic corpus (cached articles with random word
+edits) and times incremental insertion against a linear scan over every
+representative, which is what clustering without LSH would cost.
+
+    python -m benchmarks.bench_near_duplicates
+"""
+
+import random
+import logging
+import argparse
+import time
+
+import numpy as np
+
+from analyzer.near_duplicates import NearDuplicateIndex
+from benchmarks.common import load_cached_corpus
+from sentiment_analyzer import SentimentAnalyzer
+
+THRESHOLDS = (0.6, 0.7, 0.8, 0.9)
+SIZES = (1000, 10000, 50000)
+LINEAR_MAX_SIZE = 10000
+
+
+def perturb(text, rng, vocabulary):
+    words = text.split()
+    for _ in range(rng.randint(0, 3)):
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    if rng.random() < 0.7:
+        # most generated articles are distinct stories rather than copies
+        words = rng.sample(vocabulary, 4) + words[rng.randrange(len(words)):]
+    return ' '.join(words)
+
+
+def linear_scan_time(texts, threshold, sample=200):
+    """Per-article cost of comparing against every representative, sampled at the end of the corpus."""
+    index = NearDuplicateIndex(threshold=threshold)
+    signatures = np.array([index.hasher.signature(text) for text in texts])
+    start = time.perf_counter()
+    for signature in signatures[-sample:]:
+        np.mean(signatures == signature, axis=1).max()
+    return (time.perf_counter() - start) / sample
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate clustering")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Threshold for the scaling run")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    articles = load_cached_corpus()
+    texts = [
+        SentimentAnalyzer.preprocess_text(f"{article.get('headline', '')} {article.get('summary', '')}")
+        for article in articles
+    ]
+    keys = [article.get('id') for article in articles]
+
+    print(f"Cached corpus: {len(texts)} articles")
+    for threshold in THRESHOLDS:
+        index = NearDuplicateIndex(threshold=threshold)
+        for text, key in zip(texts, keys):
+            index.add(text, key=key)
+        stats = index.stats()
+        print(f"  threshold {threshold:.1f}: {stats['clusters']} clusters, "
+              f"{stats['near_duplicates']} near duplicates, {stats['saved_fraction']:.1%} scoring saved")
+
+    rng = random.Random(3)
+    base = [text for text in texts if len(text.split()) > 5]
+    vocabulary = sorted({word for text in base for word in text.split()})
+
+    print(f"Incremental insertion at threshold {args.threshold}:")
+    for size in SIZES:
+        corpus = [perturb(rng.choice(base), rng, vocabulary) for _ in range(size)]
+        index = NearDuplicateIndex(threshold=args.threshold)
+        start = time.perf_counter()
+        for text in corpus:
+            index.add(text)
+        elapsed = time.perf_counter() - start
+        stats = index.stats()
+
+        line = (f"  {size:6d} articles: {elapsed / size * 1e6:7.1f} us/article, "
+                f"{stats['saved_fraction']:.1%} scoring saved")
+        if size <= LINEAR_MAX_SIZE:
+            line += f" | linear scan {linear_scan_time(corpus, args.threshold) * 1e6:8.1f} us/article"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
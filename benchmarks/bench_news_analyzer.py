@@ -0,0 +1,49 @@
+"""Micro-benchmark for analyzer.news_analyzer.
+
+Shows what analyzer construction used to cost per article and compares the
+per-article cost of ``analyze_sentiment`` and ``analyze_sentiment_batch`` now
+that the analyzer is shared.
+Run from the repository root: ``python -m benchmarks.bench_news_analyzer``
+"""
+
+import logging
+import argparse
+
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+from benchmarks.common import load_cached_corpus, best_of
+from analyzer import news_analyzer
+
+
+def build_patched_analyzer():
+    sid = SentimentIntensityAnalyzer()
+    for term, score in news_analyzer.FINANCIAL_TERMS.items():
+        sid.lexicon[term] = score
+    return sid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    articles = load_cached_corpus()
+    news_analyzer.get_batch_engine()
+    news_analyzer.get_stop_words()
+
+    construction = best_of(build_patched_analyzer, args.repeat * 5)
+    single = best_of(lambda: [news_analyzer.analyze_sentiment(item) for item in articles], args.repeat)
+    batch = best_of(lambda: news_analyzer.analyze_sentiment_batch(articles), args.repeat)
+
+    per_single = single / len(articles) * 1000
+    per_batch = batch / len(articles) * 1000
+    print(f"Articles: {len(articles)}")
+    print(f"Analyzer construction (old per-article overhead): {construction * 1000:8.3f} ms")
+    print(f"analyze_sentiment per article:                    {per_single:8.3f} ms")
+    print(f"analyze_sentiment_batch per article:              {per_batch:8.3f} ms")
+    print(f"Old per-article estimate (construction + call):   {construction * 1000 + per_single:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Scaling benchmark for process-pool sentiment analysis.
+
+Scores a replicated copy of the cached corpus with 1, 2, 4 and 8 workers and
+reports throughput relative to the serial path. The result cache is disabled so
+every run does the full work.
+Run from the repository root: ``python -m benchmarks.bench_parallel_sentiment``
+"""
+
+import os
+import logging
+import argparse
+
+from benchmarks.common import load_cached_corpus, best_of
+from sentiment_analyzer import SentimentAnalyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=20, help='Replicate the corpus this many times')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    articles = load_cached_corpus()
+    # Make every copy distinct so in-batch deduplication doesn't hide the work
+    texts = [
+        f"{item.get('headline', '')} {item.get('summary', '')} {copy}"
+        for copy in range(args.scale)
+        for item in articles
+    ]
+    print(f"Articles: {len(texts)} | CPUs available: {os.cpu_count()}")
+
+    baseline = None
+    for workers in args.workers:
+        analyzer = SentimentAnalyzer(workers=workers)
+        analyzer.analyze_texts(texts[:analyzer.parallel_min_batch])  # warm up the pool
+        elapsed = best_of(lambda: analyzer.analyze_texts(texts), args.repeat)
+        analyzer.shutdown()
+
+        baseline = baseline or elapsed
+        print(f"{workers:2d} worker(s): {len(texts) / elapsed:8.0f} articles/s ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
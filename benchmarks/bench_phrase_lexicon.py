@@ -0,0 +1,85 @@
+"""Benchmark phrase lexicon scanning as the lexicon grows.
+
+Synthetic lexicons of 50 to 50,000 phrases are built from corpus words, with the
+same 50 phrases that actually occur in the cached corpus in every lexicon, and
+each is compiled into a ``PhraseAutomaton``. Scan time over the corpus should
+stay roughly flat across sizes; a naive ``phrase in text`` loop is timed
+alongside for the smaller lexicons.
+
+    python -m benchmarks.bench_phrase_lexicon --repeat 5
+"""
+
+import random
+import logging
+import argparse
+import time
+
+from analyzer.phrase_lexicon import PhraseAutomaton
+from benchmarks.common import best_of, load_cached_corpus
+from sentiment_analyzer import SentimentAnalyzer
+
+SIZES = (50, 500, 5000, 50000)
+NAIVE_MAX_SIZE = 5000
+
+
+def build_lexicon(word_docs, size, rng, matching=50):
+    """Draw ``matching`` phrases that occur in the corpus and pad with ones that don't.
+
+    Holding the number of hits steady isolates the effect of lexicon size; the
+    padding reuses corpus words, so partial matches still walk the automaton.
+    """
+    occurring = set()
+    for words in word_docs:
+        tokens = [word.strip('.') for word in words]
+        for n in (2, 3):
+            for start in range(len(tokens) - n + 1):
+                occurring.add(' '.join(tokens[start:start + n]))
+    occurring = sorted(phrase for phrase in occurring if '' not in phrase.split(' '))
+    vocabulary = sorted({word for phrase in occurring for word in phrase.split()})
+
+    phrases = set(random.Random(0).sample(occurring, min(matching, size)))
+    occurring = set(occurring)
+    while len(phrases) < size:
+        phrase = ' '.join(rng.sample(vocabulary, rng.choice((2, 3))))
+        if phrase not in occurring:
+            phrases.add(phrase)
+    return {phrase: round(rng.uniform(-2.5, 2.5), 2) for phrase in sorted(phrases)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark phrase lexicon scanning")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    analyzer = SentimentAnalyzer(phrase_lexicon={})
+    corpus = [
+        analyzer.preprocess_text(f"{article.get('headline', '')} {article.get('summary', '')}")
+        for article in load_cached_corpus()
+    ]
+    word_docs = [text.split() for text in corpus if text]
+    rng = random.Random(7)
+
+    print(f"{len(word_docs)} articles")
+    for size in SIZES:
+        lexicon = build_lexicon(word_docs, size, rng)
+
+        start = time.perf_counter()
+        automaton = PhraseAutomaton(lexicon)
+        build_time = time.perf_counter() - start
+
+        hits = sum(len(automaton.find(words)) for words in word_docs)
+        scan_time = best_of(lambda: [automaton.valence(words) for words in word_docs], args.repeat)
+        line = (f"{size:6d} phrases: build {build_time * 1000:8.1f} ms | scan {scan_time * 1000:6.1f} ms "
+                f"({hits} hits)")
+
+        if size <= NAIVE_MAX_SIZE:
+            padded = [f" {text} " for text in corpus if text]
+            needles = [f" {phrase} " for phrase in lexicon]
+            naive_time = best_of(lambda: [[n for n in needles if n in text] for text in padded], 1)
+            line += f" | naive substring loop {naive_time * 1000:8.1f} ms"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
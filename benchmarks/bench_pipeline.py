@@ -0,0 +1,48 @@
+"""Benchmark the single-pass ArticlePipeline against calling each stage separately.
+
+The separate path is what callers do today: ``SentimentAnalyzer.analyze_text``
+followed by ``news_processor.process_news_article`` for every article. The result
+cache is disabled so both paths do the full work.
+Run from the repository root: ``python -m benchmarks.bench_pipeline``
+"""
+
+import logging
+import argparse
+
+from benchmarks.common import load_cached_corpus, best_of
+from sentiment_analyzer import SentimentAnalyzer
+from analyzer.news_processor import process_news_article
+from analyzer.pipeline import ArticlePipeline
+
+
+def separate_stages(analyzer, articles):
+    records = []
+    for article in articles:
+        record = process_news_article(article)
+        record['sentiment'] = analyzer.analyze_text(f"{article.get('headline', '')} {article.get('summary', '')}")
+        records.append(record)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    analyzer = SentimentAnalyzer()
+    articles = load_cached_corpus()
+    pipeline = ArticlePipeline(analyzer)
+
+    separate = best_of(lambda: separate_stages(analyzer, articles), args.repeat)
+    single_pass = best_of(lambda: pipeline.process(articles), args.repeat)
+    sentiment_only = best_of(lambda: pipeline.with_stages('sentiment').process(articles), args.repeat)
+
+    print(f"Articles: {len(articles)}")
+    print(f"Separate stages:          {separate * 1000:8.1f} ms")
+    print(f"ArticlePipeline (all):    {single_pass * 1000:8.1f} ms ({separate / single_pass:.1f}x)")
+    print(f"ArticlePipeline (sentiment only): {sentiment_only * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark fetching long company-news ranges in one call, serial chunks and parallel adaptive chunks.
+
+The local Finnhub stand-in (``utils.finnhub_standin``) serves ``--articles-per-day``
+articles per symbol and day and at most ``--max-results`` per response, like
+Finnhub. For each range length every strategy fetches a fresh symbol:
+
+- single: one ``company-news`` call for the whole range, cut off at the cap
+- serial: fixed ``--chunk-days`` chunks, one after another
+- adaptive: ``NewsRangeFetcher`` chunks sized by article density, ``--workers`` at a time
+
+    python -m benchmarks.bench_range_fetcher --days 30 90 365 --latency 0.1
+"""
+
+import time
+import logging
+import argparse
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+from finnhub_client import FinnhubClient
+from utils.finnhub_standin import FinnhubStandIn, StandInData
+from utils.http_transport import HttpTransport
+from utils.range_fetcher import NewsRangeFetcher, merge_chunks
+from utils.rate_limiter import TokenBucket
+
+UNLIMITED = 1000000
+
+
+def fetch_single(client, symbol, first, last, args):
+    return client.get_company_news(symbol, first.isoformat(), last.isoformat())
+
+
+def fetch_serial(client, symbol, first, last, args):
+    articles = []
+    while last >= first:
+        chunk_first = max(first, last - timedelta(days=args.chunk_days - 1))
+        articles.extend(client.get_company_news(symbol, chunk_first.isoformat(), last.isoformat()))
+        last = chunk_first - timedelta(days=1)
+    return articles
+
+
+def fetch_adaptive(client, symbol, first, last, args):
+    return merge_chunks(client.iter_company_news(symbol, first.isoformat(), last.isoformat()))
+
+
+STRATEGIES = {'single': fetch_single, 'serial': fetch_serial, 'adaptive': fetch_adaptive}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunked fetching of long company-news ranges")
+    parser.add_argument("--days", type=int, nargs='+', default=[30, 90, 365], help="Range lengths to fetch")
+    parser.add_argument("--articles-per-day", type=int, default=20, help="Stand-in articles per symbol and day")
+    parser.add_argument("--max-results", type=int, default=250, help="Most articles one response returns")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Chunk length of the serial strategy")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent chunks of the adaptive strategy")
+    parser.add_argument("--latency", type=float, default=0.1, help="Stand-in response delay in seconds")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    server = FinnhubStandIn(
+        StandInData.from_cache(articles_per_day=args.articles_per_day, max_results=args.max_results),
+        latency=args.latency
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    transport = HttpTransport()
+    try:
+        print(f"{args.articles_per_day} articles/day, at most {args.max_results} per response, "
+              f"{args.latency * 1000:.0f} ms latency")
+        print(f"{'days':>5} {'strategy':>9} {'articles':>9} {'missing':>8} {'calls':>6} {'seconds':>8}")
+        for days in args.days:
+            last = date.today()
+            first = last - timedelta(days=days - 1)
+            expected = days * args.articles_per_day
+            for name, fetch in STRATEGIES.items():
+                client = FinnhubClient(
+                    'benchmark', rate_limiter=TokenBucket(rate=UNLIMITED, period=1.0), transport=transport,
+                    base_url=server.base_url,
+                    range_fetcher=NewsRangeFetcher(max_results=args.max_results, workers=args.workers)
+                )
+                # A symbol per run, so no strategy starts from another's density estimate
+                symbol = f"{name.upper()}{days}"
+                start = time.perf_counter()
+                articles = fetch(client, symbol, first, last, args)
+                elapsed = time.perf_counter() - start
+                count = len(np.unique([item['id'] for item in articles]))
+                print(f"{days:5d} {name:>9} {count:9d} {expected - count:8d} {client.requests_made:6d} {elapsed:8.2f}")
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
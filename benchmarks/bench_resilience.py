@@ -0,0 +1,121 @@
+"""Exercise retries, circuit breaking and stale fallbacks against a faulty stand-in.
+
+The local Finnhub stand-in (``utils.finnhub_standin``) answers ``company-news``
+while failing a share of requests with 5xx or 429, or stalling them past the
+client's read timeout. Each scenario runs threads of
+``FinnhubClient`` calls through a fresh transport after one healthy warm-up
+call per symbol, so fallbacks have something to serve, and reports how the calls
+ended and how long they took:
+
+- ok: a live response, possibly after retries
+- stale: the last good payload, served because retries ran out or the circuit was open
+- error: no response and nothing to fall back to
+
+    python -m benchmarks.bench_resilience --requests 200 --threads 8
+"""
+
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from finnhub_client import FinnhubClient
+from utils.finnhub_standin import FinnhubStandIn, StandInData
+from utils.http_transport import HttpTransport
+from utils.rate_limiter import TokenBucket
+from utils.resilience import Resilience, RetryPolicy, is_stale
+
+UNLIMITED = 1000000
+READ_TIMEOUT = 0.5
+
+SCENARIOS = {
+    'healthy': {},
+    '20% 5xx': {'error_rate': 0.2},
+    '20% 429': {'throttle_rate': 0.2},
+    '20% slow': {'slow_rate': 0.2},
+    'outage': {'error_rate': 1.0}
+}
+FAULTS = ('error_rate', 'throttle_rate', 'slow_rate')
+
+
+def set_faults(server, faults):
+    for fault in FAULTS:
+        setattr(server, fault, faults.get(fault, 0.0))
+
+
+def run_scenario(server, faults, args):
+    resilience = Resilience(
+        RetryPolicy(max_retries=args.retries, base_delay=args.base_delay, deadline=args.deadline),
+        failure_threshold=args.failure_threshold,
+        reset_timeout=args.reset_timeout
+    )
+    transport = HttpTransport(timeouts={'company-news': (1.0, READ_TIMEOUT)}, resilience=resilience)
+    client = FinnhubClient('benchmark', rate_limiter=TokenBucket(rate=UNLIMITED, period=1.0), transport=transport,
+                           base_url=server.base_url)
+    symbols = [f"SYM{index:02d}" for index in range(args.symbols)]
+
+    set_faults(server, {})
+    for symbol in symbols:
+        client.get_company_news(symbol)
+    set_faults(server, faults)
+
+    outcomes = {'ok': 0, 'stale': 0, 'error': 0}
+    latencies = []
+    lock = threading.Lock()
+
+    def call(index):
+        start = time.perf_counter()
+        payload = client.get_company_news(symbols[index % len(symbols)])
+        elapsed = time.perf_counter() - start
+        outcome = 'stale' if is_stale(payload) else 'error' if isinstance(payload, dict) else 'ok'
+        with lock:
+            outcomes[outcome] += 1
+            latencies.append(elapsed)
+
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(call, range(args.requests)))
+
+    latencies = np.array(latencies) * 1000
+    report = resilience.stats()['endpoints'].get('company-news', {})
+    transport.close()
+    return outcomes, latencies, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise Finnhub retries and circuit breaking under injected faults")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per scenario")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent callers")
+    parser.add_argument("--symbols", type=int, default=20, help="Distinct requests warmed before the faults start")
+    parser.add_argument("--latency", type=float, default=0.01, help="Stand-in response delay in seconds")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per call")
+    parser.add_argument("--base-delay", type=float, default=0.1, help="Backoff window of the first retry in seconds")
+    parser.add_argument("--deadline", type=float, default=3.0, help="No retry starts later than this after a call")
+    parser.add_argument("--failure-threshold", type=int, default=5, help="Consecutive failures that open a circuit")
+    parser.add_argument("--reset-timeout", type=float, default=1.0, help="Seconds a circuit stays open")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    server = FinnhubStandIn(
+        StandInData.from_cache(articles_per_day=3), latency=args.latency, slow_seconds=READ_TIMEOUT * 3, seed=1
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        print(f"{args.requests} calls on {args.threads} threads, {args.retries} retries, "
+              f"read timeout {READ_TIMEOUT * 1000:.0f} ms")
+        print(f"{'scenario':>9} {'ok':>5} {'stale':>6} {'error':>6} {'retries':>8} {'opened':>7} "
+              f"{'fail-fast':>10} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7}")
+        for name, faults in SCENARIOS.items():
+            outcomes, latencies, report = run_scenario(server, faults, args)
+            print(f"{name:>9} {outcomes['ok']:5d} {outcomes['stale']:6d} {outcomes['error']:6d} "
+                  f"{report.get('retries', 0):8d} {report.get('opened', 0):7d} {report.get('short_circuited', 0):10d} "
+                  f"{np.percentile(latencies, 50):7.0f} {np.percentile(latencies, 99):7.0f} {latencies.max():7.0f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
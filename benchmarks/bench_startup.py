@@ -0,0 +1,83 @@
+"""Benchmark process startup: importing ``finpulse_app`` and building ``FinPulseApp``.
+
+Each run is a fresh interpreter. ``cold`` runs start from an empty cache
+directory, so the first scored text has to import NLTK and read its lexicon data
+(and writes the lexicon snapshot); ``warm`` runs reuse that directory and load the
+snapshot instead.
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from benchmarks.common import CACHE_DIR
+
+REPO_ROOT = os.path.dirname(CACHE_DIR)
+
+STARTUP_SCRIPT = """
+import json, logging, sys, time
+start = time.perf_counter()
+import finpulse_app
+imported = time.perf_counter()
+app = finpulse_app.FinPulseApp(api_key='benchmark', cache_dir=sys.argv[1])
+constructed = time.perf_counter()
+nltk_loaded = 'nltk' in sys.modules
+app.sentiment_analyzer.analyze_text('Apple shares surge after earnings beat expectations')
+scored = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'construct': constructed - imported,
+    'first_score': scored - constructed,
+    'nltk_loaded': nltk_loaded
+}))
+"""
+
+
+def run_once(cache_dir, work_dir):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    # run from a scratch directory so the app's log file does not land in the repo
+    output = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT, cache_dir],
+        cwd=work_dir, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(name, timings):
+    best = {key: min(run[key] for run in timings) for key in ('import', 'construct', 'first_score')}
+    total = best['import'] + best['construct']
+    print(f"{name:5} import {best['import'] * 1000:7.1f} ms | FinPulseApp() {best['construct'] * 1000:6.1f} ms | "
+          f"startup {total * 1000:7.1f} ms | first score {best['first_score'] * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FinPulse startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter launches per mode")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='finpulse-startup-')
+    try:
+        cold = []
+        for index in range(args.runs):
+            cache_dir = os.path.join(work_dir, f'cold-{index}')
+            cold.append(run_once(cache_dir, work_dir))
+
+        warm_dir = os.path.join(work_dir, 'cold-0')
+        warm = [run_once(warm_dir, work_dir) for _ in range(args.runs)]
+
+        print(f"NLTK imported during startup: {any(run['nltk_loaded'] for run in cold + warm)} "
+              f"(best of {args.runs} launches)")
+        report('cold', cold)
+        report('warm', warm)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Shared helpers for the FinPulse benchmark scripts.
+
+Benchmarks are plain scripts meant to be run from the repository root, e.g.
+``python -m benchmarks.bench_batch_sentiment``.
+"""
+
+import os
+import glob
+import time
+
+from utils.finnhub_utils import load_news_from_json
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
+
+
+def load_cached_corpus(cache_dir=CACHE_DIR):
+    """Return every article found in the ``cache/*_news*.json`` files."""
+    articles = []
+    for path in sorted(glob.glob(os.path.join(cache_dir, '*news*.json'))):
+        articles.extend(load_news_from_json(path))
+    return articles
+
+
+def best_of(func, repeat=5):
+    """Run ``func`` ``repeat`` times and return the fastest wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -6,11 +6,16 @@ import os
 import json
 import time
 import logging
+import threading
 import requests
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from typing import Dict, List, Optional, Union, Any
 
+from utils.api_scheduler import shared_scheduler
+from utils.http_transport import default_transport
+from utils.range_fetcher import NewsRangeFetcher, merge_chunks
+from utils.resilience import mark_stale, wait_hint
 from utils.finnhub_utils import (
     format_finnhub_date,
     calculate_date_range,
@@ -24,56 +29,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://finnhub.io/api/v1"
+
 class FinnhubClient:
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, rate_limiter=None, transport=None, base_url=None, range_fetcher=None):
         self.api_key = api_key or os.getenv('FINNHUB_API_KEY')
         if not self.api_key:
             raise ValueError("Finnhub API key not provided. Set FINNHUB_API_KEY environment variable.")
         
-        self.base_url = "https://finnhub.io/api/v1"
-        self.session = requests.Session()
-        self.rate_limit_remaining = 60  
-        self.rate_limit_reset = time.time() + 60
+        # FINNHUB_BASE_URL points every client at a stand-in (see utils.finnhub_standin)
+        self.base_url = (base_url or os.getenv('FINNHUB_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        # Pooled keep-alive connections shared with FinnhubService; timeouts are set per endpoint
+        self.transport = transport or default_transport()
+        self.session = self.transport.new_session()
+        # Every attempt, retries included, is counted and draws from the rate limit
+        self.session.hooks['response'].append(self._track_response)
+        self.session.before_retry = self._handle_rate_limiting
+        # One budget for every client, service and worker process using this key, interactive calls first
+        self.rate_limiter = rate_limiter or shared_scheduler(self.api_key)
+        # Long company-news ranges are fetched in chunks that each fit one response
+        self.range_fetcher = range_fetcher or NewsRangeFetcher()
+        self.requests_made = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
     
     def _handle_rate_limiting(self):
-        current_time = time.time()
-        
-        if current_time > self.rate_limit_reset:
-            self.rate_limit_remaining = 60
-            self.rate_limit_reset = current_time + 60
-        
-        if self.rate_limit_remaining <= 0:
-            sleep_time = self.rate_limit_reset - current_time
-            if sleep_time > 0:
-                logger.info(f"Rate limit reached. Waiting {sleep_time:.2f} seconds.")
-                time.sleep(sleep_time)
-                self.rate_limit_remaining = 60
-                self.rate_limit_reset = time.time() + 60
+        self.rate_limiter.acquire()
+    
+    def _track_response(self, response, *args, **kwargs):
+        with self._lock:
+            self.requests_made += 1
+            self.bytes_received += len(response.content)
+        self.rate_limiter.update_from_headers(response.headers)
+        if response.status_code == 429 and 'X-Ratelimit-Reset' not in response.headers:
+            self.rate_limiter.block(wait_hint(response.headers) or 1.0)
     
     def _make_request(self, endpoint, params=None):
+        """GET ``endpoint`` and return the decoded payload, or ``{"error": ...}``.
+        
+        The session retries 429s and server errors a bounded number of times with
+        backoff; when the endpoint's circuit is open or retries run out, the last
+        good payload of the request is returned marked stale (see ``utils.resilience``).
+        """
         self._handle_rate_limiting()
         url = f"{self.base_url}/{endpoint}"
         headers = {"X-Finnhub-Token": self.api_key}
         try:
             response = self.session.get(url, headers=headers, params=params)
-            self.rate_limit_remaining -= 1
-            if 'X-Ratelimit-Remaining' in response.headers:
-                self.rate_limit_remaining = int(response.headers['X-Ratelimit-Remaining'])
-            if 'X-Ratelimit-Reset' in response.headers:
-                self.rate_limit_reset = int(response.headers['X-Ratelimit-Reset'])
             response.raise_for_status()
+            payload = response.json()
             
-            return response.json()
+            return mark_stale(payload) if getattr(response, 'stale', False) else payload
         
         except requests.exceptions.HTTPError as e:
-            if response.status_code == 429:
-                logger.warning("Rate limit exceeded. Retrying after reset.")
-                time.sleep(max(0, self.rate_limit_reset - time.time()))
-                return self._make_request(endpoint, params)
-            else:
-                logger.error(f"HTTP error: {str(e)}")
-                return {"error": str(e)}
+            logger.error(f"HTTP error: {str(e)}")
+            return {"error": str(e)}
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error: {str(e)}")
@@ -95,12 +106,27 @@ class FinnhubClient:
         
         return self._make_request('company-news', params)
     
-    def get_market_news(self, category='general'):
+    def iter_company_news(self, symbol, from_date, to_date):
+        """Yield ``(first, last, articles)`` per chunk of a long range as chunks complete.
+        
+        Articles are deduplicated by id across chunks; a failed chunk yields the
+        error payload instead of a list (see ``utils.range_fetcher``).
+        """
+        return self.range_fetcher.iter_chunks(self.get_company_news, symbol, from_date, to_date)
+    
+    def get_company_news_range(self, symbol, from_date, to_date):
+        """All news of ``symbol`` from ``from_date`` to ``to_date``, newest first, however many responses it takes."""
+        return merge_chunks(self.iter_company_news(symbol, from_date, to_date))
+    
+    def get_market_news(self, category='general', min_id=None):
         logger.info(f"Fetching market news for category: {category}")
         
         params = {
             'category': category
         }
+        if min_id:
+            # Only articles newer than this id are returned
+            params['minId'] = min_id
         
         return self._make_request('news', params)
     
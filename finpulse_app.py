@@ -6,20 +6,44 @@ and analyzes sentiment.
 import os
 import sys
 import json
+import time
 import logging
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 import argparse
+import asyncio
+import threading
+import contextvars
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 from finnhub_client import FinnhubClient
+from async_finnhub_client import AsyncFinnhubClient
 from utils.finnhub_utils import (
     format_finnhub_date,
+    parse_finnhub_timestamp,
     save_news_to_json,
     load_news_from_json,
+    save_data_to_json,
+    load_data_from_json,
     filter_news_by_keywords,
     group_news_by_symbol
 )
 from sentiment_analyzer import SentimentAnalyzer
+from analyzer.sentiment_cache import SentimentCache
+from analyzer.lexicon_snapshot import DEFAULT_SNAPSHOT_NAME
+from analyzer.phrase_lexicon import load_phrase_lexicon
+from analyzer.near_duplicates import NearDuplicateIndex
+from analyzer.pipeline import ArticlePipeline
+from utils.news_cache import NewsCache, read_cache_timestamp
+from utils.single_flight import SingleFlight
+from utils.cache_manager import CacheManager, print_stats as print_cache_stats
+from utils.delta_fetch import FetchState, DeltaStats, article_key, merge_news, newest_mark
+from utils.news_store import DayPartitionStore, MISSING, STALE, adjacent_runs, article_day, day_range
+from utils.columnar_news import LABELS, NO_SENTIMENT
+from utils.article_repository import ArticleRepository, DEFAULT_REPOSITORY_NAME
+from utils.resilience import is_stale
+from utils.api_scheduler import BACKGROUND, BATCH, api_priority
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,19 +57,87 @@ logger = logging.getLogger(__name__)
 
 class FinPulseApp:
     
-    def __init__(self, api_key: Optional[str] = None, cache_dir: str = "cache"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_dir: str = "cache",
+        sentiment_cache_size: int = 10000,
+        persist_sentiment_cache: bool = False,
+        sentiment_workers: int = 0,
+        phrase_lexicon_path: Optional[str] = None,
+        duplicate_threshold: Optional[float] = 0.8,
+        cache_ttls: Optional[Dict[str, int]] = None,
+        incremental_fetch: bool = True,
+        storage_format: str = "json",
+        article_index: bool = True,
+        cache_max_bytes: Optional[int] = None,
+        cache_eviction: str = "lru",
+        cache_retention_days: Optional[int] = None,
+        api_concurrency: int = 10,
+        base_url: Optional[str] = None
+    ):
         self.api_key = api_key or os.environ.get("FINNHUB_API_KEY")
         self.cache_dir = cache_dir
     
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
             
-        self.client = FinnhubClient(self.api_key)
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.client = FinnhubClient(self.api_key, base_url=base_url)
+        self.api_concurrency = api_concurrency
+        # Concurrent misses of one cache entry, in any thread or worker process, share one API call
+        self.single_flight = SingleFlight(lock_dir=os.path.join(cache_dir, "locks"))
+        self.cache_manager = CacheManager(
+            cache_dir,
+            max_bytes=cache_max_bytes,
+            policy=cache_eviction,
+            retention_days=cache_retention_days
+        )
+        self.news_cache = NewsCache(ttls=cache_ttls, single_flight=self.single_flight, cache_manager=self.cache_manager)
+        self.incremental_fetch = incremental_fetch
+        self.fetch_state = FetchState(os.path.join(cache_dir, "fetch_state.json"))
+        self.delta_stats = DeltaStats()
+        self.news_store = DayPartitionStore(os.path.join(cache_dir, "news"), news_format=storage_format)
+        self.news_format = self.news_store.news_format
+        self.article_repository = (
+            ArticleRepository(os.path.join(cache_dir, DEFAULT_REPOSITORY_NAME)) if article_index else None
+        )
+        self.sentiment_cache = SentimentCache(
+            max_entries=sentiment_cache_size,
+            disk_path=os.path.join(cache_dir, "sentiment_cache.db") if persist_sentiment_cache else None
+        )
+        self.sentiment_analyzer = SentimentAnalyzer(
+            cache=self.sentiment_cache,
+            workers=sentiment_workers,
+            lexicon_snapshot=os.path.join(cache_dir, DEFAULT_SNAPSHOT_NAME),
+            phrase_lexicon=load_phrase_lexicon(phrase_lexicon_path) if phrase_lexicon_path else None
+        )
+        self.story_index = NearDuplicateIndex(threshold=duplicate_threshold) if duplicate_threshold else None
+        self.extraction_pipeline = ArticlePipeline(self.sentiment_analyzer, stages=('symbols', 'metrics', 'categories'))
         self.tracked_symbols = self._load_tracked_symbols()
         
         logger.info("FinPulse application initialized")
     
+    @classmethod
+    def from_env(cls, **kwargs) -> 'FinPulseApp':
+        """An application configured from the environment, as the web app and its commands run it.
+
+        Keyword arguments override the settings read from the environment.
+        """
+        env = os.environ
+        settings = dict(
+            api_key=env.get('FINNHUB_API_KEY'),
+            sentiment_cache_size=int(env.get('SENTIMENT_CACHE_SIZE', 10000)),
+            persist_sentiment_cache=env.get('PERSIST_SENTIMENT_CACHE', '').lower() in ('1', 'true', 'yes'),
+            phrase_lexicon_path=env.get('PHRASE_LEXICON'),
+            duplicate_threshold=float(env.get('DUPLICATE_THRESHOLD', 0.8)),
+            storage_format=env.get('NEWS_STORAGE_FORMAT', 'json'),
+            cache_max_bytes=int(float(env['CACHE_MAX_MB']) * 2 ** 20) if env.get('CACHE_MAX_MB') else None,
+            cache_eviction=env.get('CACHE_EVICTION', 'lru'),
+            cache_retention_days=int(env['CACHE_RETENTION_DAYS']) if env.get('CACHE_RETENTION_DAYS') else None
+        )
+        settings.update(kwargs)
+        return cls(**settings)
+    
     def _load_tracked_symbols(self) -> List[str]:
         symbols_file = os.path.join(self.cache_dir, "tracked_symbols.json")
         
@@ -96,52 +188,376 @@ class FinPulseApp:
         limit: int = 50,
         use_cache: bool = True
     ) -> List[Dict]:
-        cache_file = os.path.join(self.cache_dir, f"{symbol}_news.json")
+        """Return the news of ``symbol`` published from ``from_date`` to ``to_date``.
         
-        if use_cache and os.path.exists(cache_file):
-            logger.info(f"Loading cached news for {symbol}")
-            news_items = load_news_from_json(cache_file)
-        else:
-            logger.info(f"Fetching fresh news for {symbol}")
-            news_items = self.client.get_company_news(symbol, from_date, to_date)
+        Both bounds are days (``YYYY-MM-DD``, UTC) and default to the last week.
+        The range is assembled from day partitions; missing days are fetched, with
+        adjacent missing days batched into one API call (or concurrent chunks when
+        they hold more articles than one response), and stale days are
+        refreshed in the background. At most ``limit`` articles, newest first,
+        are returned.
+        """
+        symbol = symbol.upper()
+        days = self._request_days(from_date, to_date)
+        self._ensure_company_news(symbol, days, use_cache)
+        return self._read_company_news(symbol, days, limit)
+    
+    def iter_company_news_with_sentiment(
+        self,
+        symbol: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Iterator[List[Dict]]:
+        """Yield the news of ``symbol`` from ``from_date`` to ``to_date`` in scored batches, newest first within each.
         
-            if news_items:
-                news_items = self.client.format_news_data(news_items)
-                news_items = news_items[:limit]  # Apply limit after getting the news
-                save_news_to_json(news_items, cache_file)
+        The cached days come first, then the missing days chunk by chunk as their
+        fetches complete, so a long range can be shown before all of it arrived.
+        Unlike ``get_company_news_with_sentiment``, concurrent requests for the
+        same missing days are not coalesced.
+        """
+        symbol = symbol.upper()
+        days = self._request_days(from_date, to_date)
+        missing = self._missing_company_news(symbol, days, use_cache)
+        missing_days = {day for first, last in missing for day in day_range(first, last)}
+        
+        cached = self._read_company_news(symbol, [day for day in days if day not in missing_days])
+        if cached:
+            yield cached
+        for first, last in missing:
+            for chunk_first, chunk_last, raw_items in self.client.iter_company_news(
+                symbol, first.isoformat(), last.isoformat()
+            ):
+                if self._store_company_news(
+                    symbol, chunk_first, chunk_last, raw_items,
+                    bytes_received=len(json.dumps(raw_items, default=str))
+                ):
+                    news_items = self._read_company_news(symbol, day_range(chunk_first, chunk_last))
+                    if news_items:
+                        yield news_items
+    
+    def _read_company_news(self, symbol: str, days: List[date], limit: Optional[int] = None) -> List[Dict]:
+        news_items = self.news_store.read_range(symbol, days)[:limit]
         
         if news_items:
-            logger.info(f"Analyzing sentiment for {len(news_items)} news items")
-            return self._add_sentiment_to_news(news_items)
+            # Articles stored with a current sentiment skip analysis; re-scored ones are written back
+            changed = self._enrich_news(news_items)
+            if changed:
+                logger.info(f"Analyzed sentiment for {len(changed)} of {len(news_items)} news items")
+                self._store_enriched_company_news(symbol, changed)
+            return news_items
         
         return []
     
+    @staticmethod
+    def _request_days(from_date: Optional[str], to_date: Optional[str]) -> List[date]:
+        to_date = to_date or datetime.now().strftime('%Y-%m-%d')
+        from_date = from_date or (datetime.strptime(to_date, '%Y-%m-%d') - timedelta(days=7)).strftime('%Y-%m-%d')
+        return day_range(from_date, to_date)
+    
+    def _ensure_company_news(self, symbol: str, days: List[date], use_cache: bool = True) -> None:
+        """Fetch the missing partitions of ``days`` and refresh stale ones in the background.
+        
+        Concurrent fetches of the same days, in any thread or worker process, are
+        coalesced into one API call.
+        """
+        for first, last in self._missing_company_news(symbol, days, use_cache):
+            self.news_cache.fetch_once(
+                f"company_news:{symbol}:{first}:{last}",
+                partial(self._fetch_company_news, symbol, first, last),
+                partial(self._partitions_stored, symbol, first, last, (MISSING,)) if use_cache else None
+            )
+    
+    async def _ensure_company_news_async(
+        self,
+        client: AsyncFinnhubClient,
+        symbol: str,
+        days: List[date],
+        executor: ThreadPoolExecutor,
+        use_cache: bool = True
+    ) -> None:
+        """``_ensure_company_news`` with the missing days requested through ``client``.
+        
+        Each missing run is coalesced under the same single-flight key as the
+        synchronous path, so a concurrent request for the same days in any thread
+        or worker waits for this fetch instead of repeating it. The coalescing
+        waits on ``executor`` threads while the leader's requests run on this
+        event loop, and responses are merged into the partitions on a worker
+        thread, so scoring one symbol's news does not hold up the requests of the
+        others.
+        """
+        loop = asyncio.get_running_loop()
+        
+        async def fetch_chunks(first, last):
+            stored = True
+            async for chunk_first, chunk_last, raw_items in client.iter_company_news(
+                symbol, first.isoformat(), last.isoformat()
+            ):
+                stored = await asyncio.to_thread(
+                    self._store_company_news, symbol, chunk_first, chunk_last, raw_items,
+                    bytes_received=len(json.dumps(raw_items, default=str))
+                ) and stored
+            return stored
+        
+        def fetch_on_loop(first, last):
+            return asyncio.run_coroutine_threadsafe(fetch_chunks(first, last), loop).result()
+        
+        async def fetch(first, last):
+            # The caller's API priority carries over to the coalescing thread
+            context = contextvars.copy_context()
+            await loop.run_in_executor(executor, partial(
+                context.run,
+                self.news_cache.fetch_once,
+                f"company_news:{symbol}:{first}:{last}",
+                partial(fetch_on_loop, first, last),
+                partial(self._partitions_stored, symbol, first, last, (MISSING,)) if use_cache else None
+            ))
+        
+        await asyncio.gather(*(
+            fetch(first, last) for first, last in self._missing_company_news(symbol, days, use_cache)
+        ))
+    
+    def _missing_company_news(self, symbol: str, days: List[date], use_cache: bool = True) -> List[Tuple[date, date]]:
+        """The runs of adjacent ``days`` that must be fetched before they can be read.
+        
+        Lookups are recorded, and stale runs are handed to a background refresh.
+        """
+        if not use_cache:
+            return adjacent_runs(days)
+        
+        ttl = self.news_cache.ttl('company_news')
+        states = {day: self.news_store.state(symbol, day, ttl) for day in days}
+        for day, state in states.items():
+            self.news_cache.record(state, self.news_store.partition_path(symbol, day))
+        
+        for first, last in adjacent_runs([day for day in days if states[day] == STALE]):
+            self.news_cache.refresh_in_background(
+                f"company_news:{symbol}:{first}:{last}",
+                partial(self._fetch_company_news, symbol, first, last),
+                partial(self._partitions_stored, symbol, first, last, (MISSING, STALE))
+            )
+        return adjacent_runs([day for day in days if states[day] == MISSING])
+    
+    def _partitions_stored(self, symbol: str, first: date, last: date, pending_states) -> Optional[bool]:
+        """``True`` once no day from ``first`` to ``last`` is in ``pending_states``, else ``None``."""
+        ttl = self.news_cache.ttl('company_news')
+        if any(self.news_store.state(symbol, day, ttl) in pending_states for day in day_range(first, last)):
+            return None
+        return True
+    
+    def _store_enriched_company_news(self, symbol: str, news_items: List[Dict]) -> None:
+        by_day = {}
+        for item in news_items:
+            by_day.setdefault(article_day(item), []).append(item)
+        
+        for day, day_items in by_day.items():
+            if day is not None:
+                self.news_store.update_day(symbol, day, day_items)
+    
+    def _fetch_company_news(self, symbol: str, first: date, last: date) -> bool:
+        """Fetch the news of days ``first`` to ``last`` and store it by day.
+        
+        A range too long for one response is fetched in concurrent chunks (see
+        ``utils.range_fetcher``), each stored as soon as it completes. Articles
+        already in the partitions are skipped before formatting, and only the new
+        ones are scored. Returns ``False`` if a request failed.
+        """
+        logger.info(f"Fetching fresh news for {symbol} from {first} to {last}")
+        stored = True
+        for chunk_first, chunk_last, raw_items in self.client.iter_company_news(
+            symbol, first.isoformat(), last.isoformat()
+        ):
+            stored = self._store_company_news(
+                symbol, chunk_first, chunk_last, raw_items,
+                bytes_received=len(json.dumps(raw_items, default=str))
+            ) and stored
+        return stored
+    
+    def _store_company_news(
+        self,
+        symbol: str,
+        first: date,
+        last: date,
+        raw_items,
+        api_calls: int = 1,
+        bytes_received: int = 0
+    ) -> bool:
+        """Merge the ``company-news`` response ``raw_items`` for days ``first`` to ``last`` into their partitions."""
+        if is_stale(raw_items):
+            # A fallback copy must not make the partitions look freshly fetched
+            logger.warning(f"Finnhub unavailable, keeping the cached news of {symbol} from {first} to {last}")
+            return False
+        if not isinstance(raw_items, list):
+            logger.warning(f"Could not fetch news for {symbol}: {raw_items}")
+            return False
+        
+        days = day_range(first, last)
+        cached = {day: self.news_store.read_day(symbol, day) for day in days}
+        cached_items = [item for items in cached.values() if items for item in items]
+        
+        known = {article_key(item) for item in cached_items}
+        new_items = self.client.format_news_data(
+            [item for item in raw_items if isinstance(item, dict) and article_key(item) not in known]
+        )
+        self._enrich_news(new_items)
+        
+        by_day = {day: [] for day in days}
+        for item in new_items:
+            day = article_day(item)
+            if day in by_day:
+                by_day[day].append(item)
+        
+        added = []
+        for day in days:
+            day_items, day_added = merge_news(cached[day] or [], by_day[day])
+            self.news_store.write_day(symbol, day, day_items)
+            added.extend(day_added)
+        
+        if added and self.article_repository is not None:
+            self.article_repository.add(added, symbol=symbol)
+        if cached_items:
+            self.delta_stats.record(
+                f"company_news:{symbol}:{first}:{last}",
+                api_calls=api_calls,
+                bytes_received=bytes_received,
+                bytes_saved=sum(len(json.dumps(item, default=str)) for item in cached_items),
+                new_articles=len(added),
+                reused_articles=len(cached_items)
+            )
+        return True
+    
     def get_market_news_with_sentiment(
         self,
         category: str = "general",
         limit: int = 50,
         use_cache: bool = True
     ) -> List[Dict]:
-        cache_file = os.path.join(self.cache_dir, f"market_news_{category}.json")
+        cache_file = os.path.join(self.cache_dir, f"market_news_{category}{self.news_format.extension}")
+        fetch = partial(self._fetch_market_news, category, limit, cache_file)
         
-        if use_cache and os.path.exists(cache_file):
-            logger.info(f"Loading cached market news for {category}")
-            news_items = load_news_from_json(cache_file)
+        if use_cache:
+            news_items = self.news_cache.get(cache_file, 'market_news', self.news_format.load, fetch, qualifier=category)
         else:
-            logger.info(f"Fetching fresh market news for {category}")
-            news_items = self.client.get_market_news(category)
-            
-            if news_items:
-                news_items = self.client.format_news_data(news_items)
-                news_items = news_items[:limit]  # Apply limit after getting the news
-                save_news_to_json(news_items, cache_file)
+            news_items = fetch(incremental=False)
         
         if news_items:
-            logger.info(f"Analyzing sentiment for {len(news_items)} market news items")
-            return self._add_sentiment_to_news(news_items)
+            changed = self._enrich_news(news_items)
+            if changed:
+                logger.info(f"Analyzed sentiment for {len(changed)} of {len(news_items)} market news items")
+                self.news_format.save(news_items, cache_file, timestamp=read_cache_timestamp(cache_file))
+            return news_items
         
         return []
     
+    def _fetch_market_news(self, category: str, limit: int, cache_file: str, incremental: bool = True) -> List[Dict]:
+        logger.info(f"Fetching fresh market news for {category}")
+        
+        def request(mark):
+            return self.client.get_market_news(category, min_id=mark['id'] if mark else None)
+        
+        return self._refresh_feed(
+            f"market_news:{category}", cache_file, limit, request, incremental=incremental, category=category
+        )
+    
+    def _refresh_feed(
+        self,
+        feed: str,
+        cache_file: str,
+        limit: int,
+        request,
+        incremental: bool = True,
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        """Fetch a news feed and store it in ``cache_file``.
+        
+        With a high-water mark and a cached copy, ``request(mark)`` only asks for
+        articles newer than the mark; they are merged into the cached ones and only
+        they are formatted and enriched. Without them, the whole feed is fetched.
+        """
+        cached_items = []
+        if incremental and self.incremental_fetch and os.path.exists(cache_file):
+            cached_items = self.news_format.load(cache_file)
+        # Files cached before marks were recorded get one from their newest article
+        mark = (self.fetch_state.get(feed) or newest_mark(cached_items)) if cached_items else None
+        
+        requests_before = self.client.requests_made
+        bytes_before = self.client.bytes_received
+        raw_items = request(mark)
+        if is_stale(raw_items):
+            logger.warning(f"Finnhub unavailable, serving {feed} without storing it")
+            return cached_items or self.client.format_news_data(raw_items)[:limit]
+        if not isinstance(raw_items, list):
+            logger.warning(f"Could not fetch {feed}: {raw_items}")
+            return []
+        
+        known = {article_key(item) for item in cached_items}
+        new_items = self.client.format_news_data(
+            [item for item in raw_items if isinstance(item, dict) and article_key(item) not in known]
+        )
+        self._enrich_news(new_items)
+        news_items, added = merge_news(cached_items, new_items, limit)
+        if not news_items:
+            return []
+        
+        self.news_format.save(news_items, cache_file)
+        self.fetch_state.update(feed, news_items)
+        if added and self.article_repository is not None:
+            self.article_repository.add(added, category=category)
+        
+        if mark is not None:
+            # A full refresh would have downloaded every cached article again
+            bytes_saved = sum(len(json.dumps(item, default=str)) for item in cached_items)
+            self.delta_stats.record(
+                feed,
+                api_calls=self.client.requests_made - requests_before,
+                bytes_received=self.client.bytes_received - bytes_before,
+                bytes_saved=bytes_saved,
+                new_articles=len(added),
+                reused_articles=len(news_items) - len(added)
+            )
+        
+        return news_items
+    
+    def get_stock_quote(self, symbol: str, use_cache: bool = True) -> Optional[Dict]:
+        return self._get_cached_data('quote', symbol, self.client.get_stock_quote, use_cache)
+    
+    def get_company_profile(self, symbol: str, use_cache: bool = True) -> Optional[Dict]:
+        return self._get_cached_data('profile', symbol, self.client.get_company_profile, use_cache)
+    
+    def _get_cached_data(self, kind: str, symbol: str, request, use_cache: bool) -> Optional[Dict]:
+        symbol = symbol.upper()
+        cache_file = os.path.join(self.cache_dir, f"{symbol}_{kind}.json")
+        
+        def fetch():
+            data = request(symbol)
+            if not data or 'error' in data:
+                return None
+            if is_stale(data):
+                return data
+            save_data_to_json(data, cache_file)
+            return data
+        
+        if use_cache:
+            return self.news_cache.get(cache_file, kind, load_data_from_json, fetch)
+        return fetch()
+    
+    def search_news(
+        self,
+        query: str,
+        symbol: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict]:
+        """Search the headlines and summaries of every article fetched so far."""
+        if self.article_repository is None:
+            return []
+        return self.article_repository.search(
+            query,
+            symbols=[symbol] if symbol else None,
+            categories=[category] if category else None,
+            limit=limit
+        )
+    
     def get_all_tracked_symbols_news(
         self,
         days: int = 7,
@@ -167,24 +583,246 @@ class FinPulseApp:
         
         return result
     
-    def _add_sentiment_to_news(self, news_items: List[Dict]) -> List[Dict]:
+    def rank_symbols(self, symbols: List[str], demand: Optional[Dict[str, int]] = None) -> List[str]:
+        """``symbols``, deduplicated and ordered by how often they are requested.
+        
+        Demand is the number of recorded lookups of each symbol's cache entries
+        plus ``demand`` (e.g. how many watchlists hold it); ties keep the given order.
+        """
+        counts = self.cache_manager.symbol_demand()
+        for symbol, count in (demand or {}).items():
+            counts[symbol.upper()] = counts.get(symbol.upper(), 0) + count
+        
+        unique = list(dict.fromkeys(symbol.upper() for symbol in symbols if symbol))
+        return sorted(unique, key=lambda symbol: -counts.get(symbol, 0))
+    
+    def prefetch(
+        self,
+        symbols: Optional[List[str]] = None,
+        days: int = 7,
+        limit: int = 50,
+        categories: Tuple[str, ...] = ("general",),
+        demand: Optional[Dict[str, int]] = None,
+        workers: int = 4,
+        max_requests: Optional[int] = None
+    ) -> Dict:
+        """Warm the cache with the news, sentiment, quote and profile of ``symbols``.
+        
+        ``symbols`` default to the tracked ones. Market news of ``categories`` is
+        warmed first, then the symbols from most to least requested, on ``workers``
+        threads that share the client's rate limit. Once ``max_requests`` API calls
+        have been made, the remaining entries are skipped. Entries that are already
+        fresh cost no API call; stale ones are refreshed before this returns.
+        """
+        ranked = self.rank_symbols(symbols if symbols is not None else self.tracked_symbols, demand)
+        to_date = datetime.now().strftime('%Y-%m-%d')
+        from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        
+        tasks = [('market_news', category, partial(self.get_market_news_with_sentiment, category))
+                 for category in categories]
+        for symbol in ranked:
+            tasks.append(('news', symbol, partial(
+                self.get_company_news_with_sentiment, symbol, from_date=from_date, to_date=to_date, limit=limit
+            )))
+            tasks.append(('quote', symbol, partial(self.get_stock_quote, symbol)))
+            tasks.append(('profile', symbol, partial(self.get_company_profile, symbol)))
+        
+        requests_before = self.client.requests_made
+        report = {'symbols': ranked, 'warmed': 0, 'failed': 0, 'skipped': 0}
+        report_lock = threading.Lock()
+        
+        def run(task):
+            kind, name, warm = task
+            if max_requests is not None and self.client.requests_made - requests_before >= max_requests:
+                outcome = 'skipped'
+            else:
+                try:
+                    # Prefetching yields the API budget to anything a user is waiting on
+                    with api_priority(BACKGROUND):
+                        outcome = 'failed' if warm() is None else 'warmed'
+                except Exception as e:
+                    logger.error(f"Error prefetching {kind} for {name}: {e}")
+                    outcome = 'failed'
+            with report_lock:
+                report[outcome] += 1
+        
+        start = time.perf_counter()
+        # Tasks are queued in priority order, so the most requested symbols are fetched first
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='prefetch') as executor:
+            list(executor.map(run, tasks))
+        # Stale entries were served as they were and are refreshing in the background
+        self.news_cache.shutdown(wait=True)
+        
+        report['api_calls'] = self.client.requests_made - requests_before
+        report['seconds'] = round(time.perf_counter() - start, 2)
+        logger.info(f"Prefetched {len(ranked)} symbols: {report['warmed']} entries warmed, "
+                    f"{report['failed']} failed, {report['skipped']} skipped, {report['api_calls']} API calls")
+        return report
+    
+    def _async_client(self) -> AsyncFinnhubClient:
+        return AsyncFinnhubClient(
+            self.api_key,
+            base_url=self.client.base_url,
+            max_concurrency=self.api_concurrency,
+            rate_limiter=self.client.rate_limiter,
+            range_fetcher=self.client.range_fetcher
+        )
+    
+    async def _ensure_tracked_news_async(self, days: List[date], use_cache: bool = True) -> None:
+        # Threads that wait on single-flight keys, kept apart from the default executor that stores the responses
+        with ThreadPoolExecutor(max_workers=self.api_concurrency, thread_name_prefix='async-fetch') as executor:
+            async with self._async_client() as client:
+                await asyncio.gather(*(
+                    self._ensure_company_news_async(client, symbol.upper(), days, executor, use_cache)
+                    for symbol in self.tracked_symbols
+                ))
+    
+    async def get_all_tracked_symbols_news_async(
+        self,
+        days: int = 7,
+        limit_per_symbol: int = 20,
+        use_cache: bool = True
+    ) -> Dict[str, List[Dict]]:
+        """``get_all_tracked_symbols_news`` with the symbols fetched concurrently."""
+        from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        to_date = datetime.now().strftime('%Y-%m-%d')
+        request_days = self._request_days(from_date, to_date)
+        await self._ensure_tracked_news_async(request_days, use_cache)
+        
+        result = {}
+        for symbol in self.tracked_symbols:
+            news = self._read_company_news(symbol.upper(), request_days, limit_per_symbol)
+            if news:
+                result[symbol] = news
+        return result
+    
+    def _enrich_news(self, news_items: List[Dict]) -> List[Dict]:
+        """Add sentiment and extracted data to articles that lack a current copy.
+        
+        An article keeps its stored sentiment when ``sentiment_version`` matches the
+        analyzer's lexicon version, so only new articles and ones scored by an older
+        lexicon are analyzed. Returns the articles that changed.
+        """
+        version = self.sentiment_analyzer.lexicon_version
+        
+        # Combine headline and summary for better sentiment analysis
+        texts = [f"{item.get('headline', '')} {item.get('summary', '')}" for item in news_items]
+        
+        if self.story_index is not None:
+            # Near-duplicate copies of a story inherit the representative's sentiment
+            texts = [self.sentiment_analyzer.preprocess_text(text) for text in texts]
+            for index, item in enumerate(news_items):
+                # Cluster ids only mean something inside this index, so they stay out of the stored articles
+                item.pop('cluster_id', None)
+                cluster_id = self.story_index.add(texts[index], key=article_key(item))
+                # A cluster evicted meanwhile by another thread has no representative left
+                texts[index] = self.story_index.representative(cluster_id) or texts[index]
+        
+        pending = [
+            index for index, item in enumerate(news_items)
+            if item.get('sentiment_version') != version or 'sentiment' not in item
+        ]
+        # Score the whole batch at once
+        sentiments = self.sentiment_analyzer.analyze_texts([texts[index] for index in pending])
+        for index, sentiment in zip(pending, sentiments):
+            news_items[index]['sentiment'] = sentiment
+            news_items[index]['sentiment_version'] = version
+        
+        unextracted = [index for index, item in enumerate(news_items) if 'extracted_data' not in item]
+        records = self.extraction_pipeline.process([news_items[index] for index in unextracted])
+        for index, record in zip(unextracted, records):
+            news_items[index]['extracted_data'] = record.get('extracted_data', {})
+        
+        return [news_items[index] for index in sorted(set(pending) | set(unextracted))]
+    
+    def _distinct_stories(self, news_items: List[Dict]) -> List[Dict]:
+        """``news_items`` with one article per near-duplicate cluster of ``story_index``."""
+        if self.story_index is None:
+            return news_items
+        
+        seen = set()
+        stories = []
+        for item in news_items:
+            cluster_id = self.story_index.cluster(article_key(item))
+            if cluster_id is not None:
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+            stories.append(item)
+        return stories
+    
+    def get_sentiment_summary(self, identifier: str, news_items: List[Dict]) -> Dict:
+        count = len(news_items)
+        # Each story counts once, however many near-duplicate copies were fetched
+        news_items = self._distinct_stories(news_items)
+        
+        stories = []
         for item in news_items:
-            # Combine headline and summary for better sentiment analysis
-            text = f"{item.get('headline', '')} {item.get('summary', '')}"
+            date_str = None
+            if 'formatted_date' in item and item['formatted_date']:
+                if isinstance(item['formatted_date'], datetime):
+                    date_str = item['formatted_date'].strftime('%Y-%m-%d')
+                elif isinstance(item['formatted_date'], str):
+                    try:
+                        date_str = datetime.fromisoformat(item['formatted_date']).strftime('%Y-%m-%d')
+                    except (ValueError, TypeError):
+                        if len(item['formatted_date']) >= 8:  
+                            date_str = item['formatted_date']
+            
+            if not date_str and 'date' in item and item['date']:
+                date_str = item['date']
             
-            # Get sentiment score
-            sentiment = self.sentiment_analyzer.analyze_text(text)
+            if not date_str and 'datetime' in item and item['datetime']:
+                try:
+                    if isinstance(item['datetime'], (int, float)):
+                        date_obj = datetime.fromtimestamp(item['datetime'])
+                        date_str = date_obj.strftime('%Y-%m-%d')
+                except (ValueError, TypeError, OSError):
+                    date_str = None
             
-            # Add sentiment to news item
-            item['sentiment'] = sentiment
+            sentiment = item.get('sentiment', {})
+            stories.append((sentiment.get('label'), sentiment.get('score', 0), date_str))
         
-        return news_items
+        return self._summarize(identifier, count, stories)
     
-    def get_sentiment_summary(self, identifier: str, news_items: List[Dict]) -> Dict:
-        if not news_items:
+    def get_stored_sentiment_summary(
+        self,
+        symbol: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None
+    ) -> Dict:
+        """Summarize the stored news of ``symbol`` from its ``datetime`` and score columns.
+        
+        Nothing is fetched or analyzed, and with the columnar format no headline or
+        summary is decoded. Near-duplicate clusters only exist in memory, so every
+        stored article counts as a story.
+        """
+        columns = self.news_store.read_range_columns(
+            symbol.upper(),
+            self._request_days(from_date, to_date),
+            ('datetime', 'sentiment_score', 'sentiment_label')
+        )
+        
+        stories = []
+        for timestamp, score, code in zip(
+            columns['datetime'].tolist(), columns['sentiment_score'].tolist(), columns['sentiment_label'].tolist()
+        ):
+            date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d') if timestamp > 0 else None
+            if code == NO_SENTIMENT:
+                stories.append((None, 0, date_str))
+            else:
+                stories.append((LABELS[code], score, date_str))
+        
+        return self._summarize(symbol.upper(), len(stories), stories)
+    
+    @staticmethod
+    def _summarize(identifier: str, count: int, stories: List[Tuple[Optional[str], float, Optional[str]]]) -> Dict:
+        """Build a sentiment summary from ``(label, score, day)`` of each distinct story."""
+        if not stories:
             return {
                 "identifier": identifier,
                 "count": 0,
+                "story_count": 0,
                 "avg_score": 0.0,
                 "sentiment_distribution": {
                     "positive": {"count": 0, "percentage": 0},
@@ -195,16 +833,16 @@ class FinPulseApp:
                 "time_series": []
             }
         
-        positive = sum(1 for item in news_items if item.get('sentiment', {}).get('label') == 'positive')
-        negative = sum(1 for item in news_items if item.get('sentiment', {}).get('label') == 'negative')
-        neutral = sum(1 for item in news_items if item.get('sentiment', {}).get('label') == 'neutral')
+        positive = sum(1 for label, _, _ in stories if label == 'positive')
+        negative = sum(1 for label, _, _ in stories if label == 'negative')
+        neutral = sum(1 for label, _, _ in stories if label == 'neutral')
         
-        total = len(news_items)
+        total = len(stories)
         pos_pct = (positive / total) * 100 if total else 0
         neg_pct = (negative / total) * 100 if total else 0
         neu_pct = (neutral / total) * 100 if total else 0
         
-        avg_score = sum(item.get('sentiment', {}).get('score', 0) for item in news_items) / total if total else 0
+        avg_score = sum(score for _, score, _ in stories) / total if total else 0
         
         if avg_score >= 0.2:
             overall_sentiment = "positive"
@@ -215,29 +853,7 @@ class FinPulseApp:
         
         date_sentiment = {}
         
-        for item in news_items:
-            date_str = None
-            if 'formatted_date' in item and item['formatted_date']:
-                if isinstance(item['formatted_date'], datetime):
-                    date_str = item['formatted_date'].strftime('%Y-%m-%d')
-                elif isinstance(item['formatted_date'], str):
-                    try:
-                        date_str = datetime.fromisoformat(item['formatted_date']).strftime('%Y-%m-%d')
-                    except (ValueError, TypeError):
-                        if len(item['formatted_date']) >= 8:  
-                            date_str = item['formatted_date']
-            
-            if not date_str and 'date' in item and item['date']:
-                date_str = item['date']
-            
-            if not date_str and 'datetime' in item and item['datetime']:
-                try:
-                    if isinstance(item['datetime'], (int, float)):
-                        date_obj = datetime.fromtimestamp(item['datetime'])
-                        date_str = date_obj.strftime('%Y-%m-%d')
-                except (ValueError, TypeError, OSError):
-                    continue
-            
+        for sentiment_label, score, date_str in stories:
             if date_str:
                 if date_str not in date_sentiment:
                     date_sentiment[date_str] = {
@@ -249,10 +865,9 @@ class FinPulseApp:
                         'count': 0
                     }
                 
-                sentiment_label = item.get('sentiment', {}).get('label', 'neutral')
-                date_sentiment[date_str][sentiment_label] += 1
+                date_sentiment[date_str][sentiment_label or 'neutral'] += 1
                 date_sentiment[date_str]['count'] += 1
-                date_sentiment[date_str]['avg_score'] += item.get('sentiment', {}).get('score', 0)
+                date_sentiment[date_str]['avg_score'] += score
         
         for date_str in date_sentiment:
             if date_sentiment[date_str]['count'] > 0:
@@ -262,7 +877,8 @@ class FinPulseApp:
         
         return {
             "identifier": identifier,
-            "count": total,
+            "count": count,
+            "story_count": total,
             "avg_score": avg_score,
             "sentiment_distribution": {
                 "positive": {
@@ -282,10 +898,19 @@ class FinPulseApp:
             "time_series": time_series
         }
     
-    def get_symbol_sentiment_summary(self, symbol: str) -> Dict:
-        news = self.get_company_news_with_sentiment(symbol)
+    def get_symbol_sentiment_summary(self, symbol: str, limit: int = 50) -> Dict:
+        days = self._request_days(None, None)
+        self._ensure_company_news(symbol.upper(), days)
+        
+        # Only the score columns are read; articles stored without a score are analyzed first
+        columns = self.news_store.read_range_columns(symbol.upper(), days, ('sentiment_score', 'sentiment_label'))
+        if (columns['sentiment_label'][:limit] == NO_SENTIMENT).any():
+            news = self.get_company_news_with_sentiment(symbol, limit=limit)
+            sentiment_scores = [item.get('sentiment', {}).get('score', 0) for item in news]
+        else:
+            sentiment_scores = columns['sentiment_score'][:limit].tolist()
         
-        if not news:
+        if not sentiment_scores:
             return {
                 "symbol": symbol,
                 "average_sentiment": 0,
@@ -293,7 +918,6 @@ class FinPulseApp:
                 "news_count": 0
             }
         
-        sentiment_scores = [item.get('sentiment', {}).get('score', 0) for item in news]
         avg_sentiment = sum(sentiment_scores) / len(sentiment_scores)
         
         if avg_sentiment > 0.2:
@@ -307,12 +931,17 @@ class FinPulseApp:
             "symbol": symbol,
             "average_sentiment": round(avg_sentiment, 2),
             "sentiment_trend": trend,
-            "news_count": len(news)
+            "news_count": len(sentiment_scores)
         }
     
     def get_all_tracked_symbols_sentiment(self) -> List[Dict]:
         return [self.get_symbol_sentiment_summary(symbol) for symbol in self.tracked_symbols]
     
+    async def get_all_tracked_symbols_sentiment_async(self) -> List[Dict]:
+        """``get_all_tracked_symbols_sentiment`` with the missing news fetched concurrently first."""
+        await self._ensure_tracked_news_async(self._request_days(None, None))
+        return self.get_all_tracked_symbols_sentiment()
+    
     def run_dashboard(self):
        
         logger.info("Dashboard functionality not yet implemented")
@@ -322,7 +951,9 @@ class FinPulseApp:
         print(f"\nTracked Symbols: {', '.join(self.tracked_symbols)}")
     
         print("\nSymbol Sentiment:")
-        for summary in self.get_all_tracked_symbols_sentiment():
+        with api_priority(BATCH):
+            summaries = asyncio.run(self.get_all_tracked_symbols_sentiment_async())
+        for summary in summaries:
             print(f"  {summary['symbol']}: {summary['sentiment_trend']} ({summary['average_sentiment']}) - {summary['news_count']} news items")
     
         print("\nRecent Market News:")
@@ -345,10 +976,37 @@ def main():
     parser.add_argument("--days", type=int, default=7, help="Number of days to analyze")
     parser.add_argument("--no-cache", action="store_true", help="Don't use cached data")
     parser.add_argument("--limit", type=int, default=20, help="Limit number of news items per symbol")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes for sentiment analysis of large batches")
+    parser.add_argument("--phrase-lexicon", help="JSON or tab separated file of weighted phrases to score")
+    parser.add_argument("--duplicate-threshold", type=float, default=0.8,
+                        help="Similarity above which stories share one sentiment score (0 disables)")
+    parser.add_argument("--cache-stats", action="store_true", help="Report cache size, hit rates and largest entries")
+    parser.add_argument("--cache-max-mb", type=float, help="Disk budget of the cache directory in MiB")
+    parser.add_argument("--cache-eviction", choices=("lru", "lfu"), default="lru",
+                        help="Which entries to evict first when the cache exceeds its budget")
+    parser.add_argument("--retention-days", type=int, help="Drop cached news older than this many days")
+    parser.add_argument("--search", help="Search the headlines and summaries of cached articles")
+    parser.add_argument("--storage-format", choices=("json", "columnar"), default="json",
+                        help="File format of the news cache")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="Warm the cache for the tracked symbols (or --symbol) and exit")
+    parser.add_argument("--prefetch-workers", type=int, default=4, help="Threads used by --prefetch")
+    parser.add_argument("--max-requests", type=int, help="Stop --prefetch after this many API calls")
+    parser.add_argument("--base-url", help="Finnhub API URL, e.g. of a local stand-in (or set FINNHUB_BASE_URL)")
     
     args = parser.parse_args()
     
-    app = FinPulseApp(api_key=args.api_key)
+    app = FinPulseApp(
+        api_key=args.api_key,
+        sentiment_workers=args.workers,
+        phrase_lexicon_path=args.phrase_lexicon,
+        duplicate_threshold=args.duplicate_threshold,
+        storage_format=args.storage_format,
+        cache_max_bytes=int(args.cache_max_mb * 2 ** 20) if args.cache_max_mb else None,
+        cache_eviction=args.cache_eviction,
+        cache_retention_days=args.retention_days,
+        base_url=args.base_url
+    )
     
     if args.add_symbol:
         app.add_tracked_symbol(args.add_symbol)
@@ -361,13 +1019,42 @@ def main():
     elif args.list_symbols:
         print(f"Tracked symbols: {', '.join(app.tracked_symbols)}")
     
-    elif args.symbol:
-        print(f"Analyzing news for {args.symbol}:")
-        news = app.get_company_news_with_sentiment(
-            args.symbol, 
+    elif args.cache_stats:
+        print_cache_stats(app.cache_manager.stats())
+    
+    elif args.prefetch:
+        report = app.prefetch(
+            symbols=[args.symbol] if args.symbol else None,
+            days=args.days,
             limit=args.limit,
-            use_cache=not args.no_cache
+            workers=args.prefetch_workers,
+            max_requests=args.max_requests
         )
+        print(f"Prefetched {', '.join(report['symbols'])}")
+        print(f"  {report['warmed']} entries warmed, {report['failed']} failed, {report['skipped']} skipped; "
+              f"{report['api_calls']} API calls in {report['seconds']} s")
+    
+    elif args.search:
+        results = app.search_news(args.search, symbol=args.symbol, limit=args.limit)
+        print(f"{len(results)} articles matching '{args.search}':")
+        for i, item in enumerate(results, 1):
+            print(f"{i}. {item.get('headline', '')}")
+            published = parse_finnhub_timestamp(item.get('datetime'))
+            print(f"   Source: {item.get('source', 'Unknown')} | "
+                  f"Date: {format_finnhub_date(published) if published else 'Unknown'}")
+    
+    elif args.symbol:
+        print(f"Analyzing news for {args.symbol} over the last {args.days} days:")
+        news = []
+        # Long ranges arrive chunk by chunk
+        for batch in app.iter_company_news_with_sentiment(
+            args.symbol,
+            from_date=(datetime.now() - timedelta(days=args.days)).strftime('%Y-%m-%d'),
+            use_cache=not args.no_cache
+        ):
+            news.extend(batch)
+            print(f"  {len(news)} articles so far")
+        news = sorted(news, key=lambda item: item.get('datetime') or 0, reverse=True)[:args.limit]
         
         summary = app.get_symbol_sentiment_summary(args.symbol)
         print(f"\nOverall sentiment: {summary['sentiment_trend']} ({summary['average_sentiment']})")
@@ -379,7 +1066,9 @@ def main():
             score = sentiment.get('score', 0)
             print(f"{i}. [{label} {score:.2f}] {item['headline']}")
             print(f"   {item['summary'][:100]}..." if item.get('summary') else "   No summary available")
-            print(f"   Source: {item.get('source', 'Unknown')} | Date: {item.get('date', 'Unknown')}")
+            published = parse_finnhub_timestamp(item.get('datetime'))
+            print(f"   Source: {item.get('source', 'Unknown')} | "
+                  f"Date: {format_finnhub_date(published) if published else 'Unknown'}")
             print()
     
     else:
@@ -6,10 +6,15 @@ with special handling for financial terminology and enhanced scoring for financi
 
 import re
 import logging
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from analyzer import keyword_tokenizer
+from analyzer.batch_sentiment import BatchSentimentEngine
+from analyzer.lexicon_snapshot import load_snapshot, save_snapshot
+from analyzer.phrase_lexicon import get_automaton, merge_valence
+from analyzer.sentiment_cache import copy_sentiment, lexicon_version
 
 logging.basicConfig(
     level=logging.INFO,
@@ -65,18 +70,151 @@ FINANCIAL_TERMS = {
     'lawsuit': -1.8
 }
 
+# Multi-word terms, matched on preprocessed text by the phrase automaton
+FINANCIAL_PHRASES = {
+    'beat expectations': 1.8,
+    'beats expectations': 1.8,
+    'raised guidance': 1.9,
+    'raises guidance': 1.9,
+    'record revenue': 1.8,
+    'share buyback': 1.2,
+    'all time high': 1.5,
+    'missed expectations': -1.8,
+    'misses expectations': -1.8,
+    'guidance cut': -2.0,
+    'cuts guidance': -2.0,
+    'lowered guidance': -1.9,
+    'profit warning': -2.2,
+    'selloff': -1.7,
+    'sell off': -1.7,
+    'going concern': -2.3,
+    'chapter 11': -2.5,
+    'credit downgrade': -2.0
+}
+
+LEXICON_VERSION = lexicon_version(FINANCIAL_TERMS)
+
+# Batches smaller than this are scored serially even when parallel mode is on
+PARALLEL_MIN_BATCH = 500
+PARALLEL_CHUNK_SIZE = 250
+
+_worker_analyzer = None
+
+
+def _init_worker(lexicon_snapshot=None, phrase_lexicon=None):
+    """Build the analyzer and its lexicon once per pool worker."""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(lexicon_snapshot=lexicon_snapshot, phrase_lexicon=phrase_lexicon)
+
+
+def _score_chunk(clean_texts):
+    return _worker_analyzer._score_clean_texts(clean_texts)
+
 
 class SentimentAnalyzer:
+    """Financial sentiment analyzer built on VADER.
     
-    def __init__(self):
-        self.ensure_nltk_resources()
-        self.sid = SentimentIntensityAnalyzer()
+    NLTK is not imported and no lexicon is loaded until the first text is scored.
+    When ``lexicon_snapshot`` names a snapshot file matching ``LEXICON_VERSION``,
+    the merged lexicon and stop words are read from it instead of the NLTK data;
+    otherwise they are built from NLTK and the snapshot is written for next time.
+    
+    ``phrase_lexicon`` maps multi-word phrases to weights (``FINANCIAL_PHRASES``
+    by default, an empty dict to turn phrase scoring off). Phrase hits are added
+    to the VADER compound score.
+    """
+    
+    def __init__(self, cache=None, workers=0, parallel_min_batch=PARALLEL_MIN_BATCH,
+                 chunk_size=PARALLEL_CHUNK_SIZE, keyword_tokenizer_mode='fast',
+                 lexicon_snapshot=None, phrase_lexicon=None):
+        if phrase_lexicon is None:
+            phrase_lexicon = FINANCIAL_PHRASES
+        self.phrase_lexicon = {
+            self.preprocess_text(phrase): weight for phrase, weight in phrase_lexicon.items()
+        }
+        self.phrase_lexicon.pop('', None)
+        
+        self.keyword_tokenizer_mode = keyword_tokenizer_mode
+        self.lexicon_version = LEXICON_VERSION
+        if self.phrase_lexicon:
+            self.lexicon_version = f"{LEXICON_VERSION}-{lexicon_version(self.phrase_lexicon)}"
+        self.lexicon_snapshot = lexicon_snapshot
+        self.cache = cache
+        
+        self.workers = workers
+        self.parallel_min_batch = parallel_min_batch
+        self.chunk_size = chunk_size
+        self._pool = None
         
-        for term, score in FINANCIAL_TERMS.items():
-            self.sid.lexicon[term] = score
+        self._load_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._sid = None
+        self._batch_engine = None
+        self._stop_words = None
+    
+    @property
+    def sid(self):
+        if self._sid is None:
+            self._load()
+        return self._sid
+    
+    @property
+    def batch_engine(self):
+        if self._batch_engine is None:
+            self._load()
+        return self._batch_engine
+    
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            self._load()
+        return self._stop_words
+    
+    def _load(self):
+        """Build the VADER analyzer, batch engine and stop words on first use."""
+        with self._load_lock:
+            if self._sid is not None:
+                return
+            
+            from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+            
+            snapshot = load_snapshot(self.lexicon_snapshot, LEXICON_VERSION)
+            if snapshot is not None:
+                sid = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+                sid.lexicon = snapshot['lexicon']
+                sid.constants = VaderConstants()
+                stop_words = frozenset(snapshot['stop_words'])
+            else:
+                from nltk.corpus import stopwords
+                
+                self.ensure_nltk_resources()
+                sid = SentimentIntensityAnalyzer()
+                for term, score in FINANCIAL_TERMS.items():
+                    sid.lexicon[term] = score
+                stop_words = frozenset(stopwords.words('english'))
+                
+                if self.lexicon_snapshot:
+                    try:
+                        save_snapshot(self.lexicon_snapshot, LEXICON_VERSION, sid.lexicon, stop_words)
+                    except OSError as e:
+                        logger.warning(f"Could not save lexicon snapshot: {e}")
+            
+            self._batch_engine = BatchSentimentEngine(sid)
+            self._stop_words = stop_words
+            self._sid = sid
+    
+    def warm_up(self):
+        """Load the lexicon now rather than on the first request."""
+        self._load()
+        if self.phrase_lexicon:
+            get_automaton(self.phrase_lexicon)
+        return self
     
     @staticmethod
     def ensure_nltk_resources():
+        import nltk
+        from nltk.tokenize import word_tokenize
+        
         try:
             word_tokenize("Test sentence.")
         except LookupError:
@@ -102,40 +240,54 @@ class SentimentAnalyzer:
         
         return text
     
-    def extract_keywords(self, text, max_keywords=10):
+    def keyword_tokens(self, text):
+        """Tokenize text for keyword extraction.
+        
+        In ``fast`` mode, text the compiled keyword tokenizer supports (preprocessed
+        text and most raw headlines) goes through it; anything else (or ``nltk``
+        mode) uses ``word_tokenize``.
+        """
         if not text:
             return []
-    
-        tokens = word_tokenize(text)
-        stop_words = set(stopwords.words('english'))
-        filtered_tokens = [w for w in tokens if w.lower() not in stop_words and len(w) > 2]
+        if self.keyword_tokenizer_mode == 'fast' and keyword_tokenizer.supports(text):
+            return keyword_tokenizer.tokenize(text)
         
-        word_freq = {}
-        for token in filtered_tokens:
-            word_freq[token] = word_freq.get(token, 0) + 1
-            
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        keywords = [word for word, freq in sorted_words[:max_keywords]]
-        
-        return keywords
+        from nltk.tokenize import word_tokenize
+        try:
+            return word_tokenize(text)
+        except LookupError:
+            self.ensure_nltk_resources()
+            return word_tokenize(text)
     
-    def analyze_text(self, text):
-        clean_text = self.preprocess_text(text)
-        
-        if not clean_text:
-            return {
-                'score': 0.0,
-                'label': 'neutral',
-                'breakdown': {
-                    'positive': 0.0,
-                    'negative': 0.0,
-                    'neutral': 1.0
-                },
-                'keywords': []
-            }
+    def keywords_from_tokens(self, tokens, max_keywords=10):
+        stop_words = self.stop_words
+        word_freq = Counter(w for w in tokens if len(w) > 2 and w.lower() not in stop_words)
         
-        scores = self.sid.polarity_scores(clean_text)
+        # most_common selects with a heap and keeps first-seen order among ties
+        return [word for word, freq in word_freq.most_common(max_keywords)]
+    
+    def extract_keywords(self, text, max_keywords=10):
+        if not text:
+            return []
         
+        return self.keywords_from_tokens(self.keyword_tokens(text), max_keywords)
+    
+    @staticmethod
+    def empty_sentiment():
+        return {
+            'score': 0.0,
+            'label': 'neutral',
+            'breakdown': {
+                'positive': 0.0,
+                'negative': 0.0,
+                'neutral': 1.0
+            },
+            'keywords': []
+        }
+    
+    @staticmethod
+    def sentiment_from_scores(scores):
+        """Turn VADER polarity scores into the score/label/breakdown payload."""
         if scores['compound'] >= 0.05:
             label = 'positive'
         elif scores['compound'] <= -0.05:
@@ -143,7 +295,6 @@ class SentimentAnalyzer:
         else:
             label = 'neutral'
         
-        keywords = self.extract_keywords(clean_text)
         return {
             'score': scores['compound'],
             'label': label,
@@ -151,10 +302,114 @@ class SentimentAnalyzer:
                 'positive': scores['pos'],
                 'negative': scores['neg'],
                 'neutral': scores['neu']
-            },
-            'keywords': keywords
+            }
         }
     
+    def apply_phrases(self, scores, words):
+        """Return ``scores`` with phrase lexicon hits in ``words`` merged into ``compound``."""
+        if not self.phrase_lexicon:
+            return scores
+        
+        valence = get_automaton(self.phrase_lexicon).valence(words)
+        if not valence:
+            return scores
+        return {**scores, 'compound': merge_valence(scores['compound'], valence)}
+    
+    def _build_sentiment(self, scores, clean_text):
+        sentiment = self.sentiment_from_scores(self.apply_phrases(scores, clean_text.split()))
+        sentiment['keywords'] = self.extract_keywords(clean_text)
+        return sentiment
+    
+    def analyze_text(self, text):
+        clean_text = self.preprocess_text(text)
+        
+        if not clean_text:
+            return self.empty_sentiment()
+        
+        if self.cache is not None:
+            cached = self.cache.get(clean_text, self.lexicon_version)
+            if cached is not None:
+                return cached
+        
+        scores = self.sid.polarity_scores(clean_text)
+        sentiment = self._build_sentiment(scores, clean_text)
+        
+        if self.cache is not None:
+            self.cache.put(clean_text, self.lexicon_version, sentiment)
+        return sentiment
+    
+    def analyze_texts(self, texts):
+        """Analyze many texts at once through the vectorized batch engine.
+        
+        Returns the same payload as ``analyze_text`` for each text, in input order.
+        Cached results are reused and each distinct text is scored only once. With
+        ``workers`` > 1, large batches are spread over a process pool in chunks.
+        """
+        clean_texts = [self.preprocess_text(text) for text in texts]
+        
+        resolved = {}
+        pending = []
+        for clean_text in clean_texts:
+            if not clean_text or clean_text in resolved:
+                continue
+            cached = self.cache.get(clean_text, self.lexicon_version) if self.cache is not None else None
+            resolved[clean_text] = cached
+            if cached is None:
+                pending.append(clean_text)
+        
+        for clean_text, sentiment in zip(pending, self._score_pending(pending)):
+            resolved[clean_text] = sentiment
+            if self.cache is not None:
+                self.cache.put(clean_text, self.lexicon_version, sentiment)
+        
+        results = []
+        for clean_text in clean_texts:
+            if not clean_text:
+                results.append(self.empty_sentiment())
+            else:
+                # Duplicates get their own copy, so enriching one article leaves the others alone
+                results.append(copy_sentiment(resolved[clean_text]))
+        
+        return results
+    
+    def _score_clean_texts(self, clean_texts):
+        batch_scores = self.batch_engine.polarity_scores_batch(clean_texts)
+        return [
+            self._build_sentiment(scores, clean_text)
+            for clean_text, scores in zip(clean_texts, batch_scores)
+        ]
+    
+    def _score_pending(self, clean_texts):
+        if self.workers <= 1 or len(clean_texts) < self.parallel_min_batch:
+            return self._score_clean_texts(clean_texts)
+        
+        # Request threads scoring at the same time share one pool
+        with self._pool_lock:
+            if self._pool is None:
+                logger.info(f"Starting sentiment worker pool with {self.workers} processes")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.lexicon_snapshot, self.phrase_lexicon)
+                )
+            pool = self._pool
+        
+        chunks = [
+            clean_texts[start:start + self.chunk_size]
+            for start in range(0, len(clean_texts), self.chunk_size)
+        ]
+        results = []
+        for chunk_results in pool.map(_score_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+    
+    def shutdown(self):
+        """Stop the parallel worker pool, if one was started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+    
     def analyze_news_item(self, news_item):
         headline = news_item.get('headline', '')
         summary = news_item.get('summary', '')
@@ -166,7 +421,12 @@ class SentimentAnalyzer:
         }
     
     def analyze_news_batch(self, news_items):
-        return [self.analyze_news_item(item) for item in news_items]
+        texts = [f"{item.get('headline', '')}. {item.get('summary', '')}" for item in news_items]
+        sentiments = self.analyze_texts(texts)
+        return [
+            {**item, 'sentiment': sentiment}
+            for item, sentiment in zip(news_items, sentiments)
+        ]
     
     def get_sentiment_summary(self, news_items):
         if not news_items:
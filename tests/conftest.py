@@ -0,0 +1,25 @@
+import threading
+
+import pytest
+
+from utils.finnhub_standin import FinnhubStandIn, StandInData
+from utils.rate_limiter import TokenBucket
+
+UNLIMITED = 1000000
+
+
+@pytest.fixture
+def standin():
+    """A stand-in serving generated news on a free port, with a rate limit high enough to never bind."""
+    server = FinnhubStandIn(StandInData(), rate_limit=UNLIMITED, seed=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def rate_limiter():
+    return TokenBucket(rate=UNLIMITED, period=1.0)
@@ -0,0 +1,81 @@
+import time
+import threading
+
+from utils.api_scheduler import BACKGROUND, BATCH, INTERACTIVE, ApiScheduler, api_priority, current_caller
+from utils.rate_limiter import TokenBucket
+
+
+def make_scheduler(rate=40):
+    # Four tokens of burst: batch keeps one back, background two
+    scheduler = ApiScheduler(TokenBucket(rate=rate, period=1.0, burst=4))
+    for _ in range(4):
+        scheduler.bucket.reserve()
+    return scheduler
+
+
+def wait_queued(scheduler, priority, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while scheduler.stats()['classes'][priority]['queued'] < count:
+        assert time.monotonic() < deadline, f"{count} {priority} callers never queued"
+        time.sleep(0.005)
+
+
+def start_callers(scheduler, callers, granted):
+    lock = threading.Lock()
+
+    def call(priority, user, label):
+        scheduler.acquire(priority, user)
+        with lock:
+            granted.append(label)
+
+    threads = [threading.Thread(target=call, args=caller) for caller in callers]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_interactive_call_overtakes_queued_background_calls():
+    scheduler = make_scheduler()
+    granted = []
+    threads = start_callers(scheduler, [(BACKGROUND, None, f"background-{n}") for n in range(3)], granted)
+    wait_queued(scheduler, BACKGROUND, 3)
+    threads += start_callers(scheduler, [(INTERACTIVE, 'alice', 'interactive')], granted)
+    for thread in threads:
+        thread.join()
+
+    assert granted[0] == 'interactive'
+    classes = scheduler.stats()['classes']
+    assert classes[BACKGROUND]['preempted'] >= 1
+    assert classes[INTERACTIVE]['granted'] == 1 and classes[BACKGROUND]['granted'] == 3
+
+
+def test_users_of_a_class_take_turns():
+    scheduler = make_scheduler()
+    granted = []
+    threads = start_callers(scheduler, [(BATCH, 'alice', 'alice') for _ in range(5)], granted)
+    wait_queued(scheduler, BATCH, 5)
+    threads += start_callers(scheduler, [(BATCH, 'bob', 'bob') for _ in range(2)], granted)
+    wait_queued(scheduler, BATCH, 6)
+    for thread in threads:
+        thread.join()
+
+    # Bob's calls do not wait behind all of Alice's
+    assert granted.count('bob') == 2
+    assert granted[:4].count('bob') == 2
+
+
+def test_background_leaves_its_reserve_to_interactive_calls():
+    scheduler = ApiScheduler(TokenBucket(rate=1, period=60.0, burst=4))
+    for _ in range(2):
+        scheduler.bucket.reserve()
+    # Two tokens left: an interactive call takes one at once, background keeps its two back
+    assert scheduler.acquire(INTERACTIVE) < 0.1
+    assert scheduler._budget_wait(BACKGROUND) > 0
+    assert scheduler._budget_wait(INTERACTIVE) <= 0
+
+
+def test_api_priority_sets_and_restores_the_caller():
+    assert current_caller() == (INTERACTIVE, None)
+    with api_priority(BACKGROUND, user='prefetch'):
+        assert current_caller() == (BACKGROUND, 'prefetch')
+    assert current_caller() == (INTERACTIVE, None)
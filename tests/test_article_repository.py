@@ -0,0 +1,49 @@
+import pytest
+
+from utils.article_repository import ArticleRepository
+from utils.finnhub_utils import filter_news_by_keywords
+
+HEADLINES = [
+    ('Apple raises its dividend', 'The board approved a higher payout.'),
+    ('Microsoft guidance beats estimates', 'Cloud revenue grew faster than expected.'),
+    ('Oil slips as supply rises', 'Brent fell for a third session.'),
+    ('Fed holds rates', 'Officials see AI spending lifting growth.'),
+    ('Nvidia sets a record', 'Shares of the chipmaker hit an all-time high.'),
+]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = ArticleRepository(str(tmp_path / 'articles.db'))
+    yield repository
+    repository.close()
+
+
+def make_articles():
+    return [
+        {'id': index + 1, 'datetime': 1760000000 + index, 'headline': headline, 'summary': summary,
+         'url': f"https://example.com/{index}", 'source': 'Example', 'related': 'AAPL'}
+        for index, (headline, summary) in enumerate(HEADLINES)
+    ]
+
+
+@pytest.mark.parametrize('keywords', [['dividend'], ['GUIDANCE', 'oil'], ['chip'], ['AI'], ['absent']])
+def test_keyword_search_matches_the_list_filter(repository, keywords):
+    articles = make_articles()
+    repository.add(articles, symbol='AAPL')
+
+    expected = {item['id'] for item in filter_news_by_keywords(articles, keywords)}
+    assert {item['id'] for item in repository.search(keywords=keywords, limit=100)} == expected
+
+
+def test_unanalysed_copy_keeps_the_stored_sentiment(repository):
+    raw = make_articles()[0]
+    scored = {**raw, 'text': 'formatted', 'sentiment': {'score': 0.4, 'label': 'positive'}, 'sentiment_version': 'v1'}
+    repository.add([scored], symbol='AAPL')
+    repository.add([{**raw, 'headline': 'Apple raises its dividend again'}], category='general')
+
+    [stored] = repository.search(keywords=['dividend'])
+    assert stored['headline'] == 'Apple raises its dividend again'
+    assert stored['sentiment'] == {'score': 0.4, 'label': 'positive'}
+    assert 'text' not in stored
+    assert repository.count() == 1
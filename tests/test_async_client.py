@@ -0,0 +1,49 @@
+import json
+import asyncio
+import threading
+from urllib.parse import urlparse, parse_qsl
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from async_finnhub_client import AsyncFinnhubClient
+from utils.resilience import Resilience
+
+
+class MixedHandler(BaseHTTPRequestHandler):
+    """Answers quotes with JSON, except for ``BAD``, which gets an HTML page with status 200."""
+
+    def do_GET(self):
+        symbol = dict(parse_qsl(urlparse(self.path).query)).get('symbol')
+        if symbol == 'BAD':
+            body, content_type = b'<html>maintenance</html>', 'text/html'
+        else:
+            body, content_type = json.dumps({'c': 100.0}).encode('utf-8'), 'application/json'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MixedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_non_json_body_fails_only_its_own_request(server, rate_limiter):
+    async def run():
+        async with AsyncFinnhubClient('test', base_url=server, rate_limiter=rate_limiter,
+                                      resilience=Resilience()) as client:
+            return await client.get_many('get_stock_quote', ['AAPL', 'BAD', 'MSFT'])
+
+    quotes = asyncio.run(run())
+    assert quotes['AAPL'] == quotes['MSFT'] == {'c': 100.0}
+    assert 'error' in quotes['BAD']
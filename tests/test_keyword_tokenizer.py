@@ -0,0 +1,58 @@
+import pytest
+
+from analyzer import keyword_tokenizer
+from benchmarks.common import load_cached_corpus
+from sentiment_analyzer import SentimentAnalyzer
+
+word_tokenize = pytest.importorskip('nltk.tokenize').word_tokenize
+
+CASES = [
+    "Apple (AAPL) beats: revenue up 5%, shares +3% — report",
+    "S&P 500 hits record; Dow flat?",
+    "“Buy” says analyst… ‘really’",
+    "Q3 2024: EPS of $1.23 beats, rev $5,000m [est $4,900m]",
+    "He said: 3,5 or 3:30, then left",
+    "Tesla's run isn't over, analysts' say \"buy\"",
+    "AI-driven rally; Nvidia’s #1 spot",
+    "Up 10%! Is it time? We can't say",
+    "cannot-miss stock, gonna-be winner",
+    "Fed holds rates. J. Powell speaks at 3 p.m. today.",
+    "Up 3. ,then J. ;Smith and 4. (May)",
+]
+
+
+@pytest.fixture(scope='module')
+def headlines():
+    return [item['headline'] for item in load_cached_corpus() if item.get('headline')]
+
+
+@pytest.fixture(scope='module')
+def analyzers():
+    return SentimentAnalyzer(keyword_tokenizer_mode='fast'), SentimentAnalyzer(keyword_tokenizer_mode='nltk')
+
+
+@pytest.mark.parametrize('text', CASES)
+def test_tokens_match_word_tokenize(text):
+    assert keyword_tokenizer.supports(text)
+    assert keyword_tokenizer.tokenize(text) == word_tokenize(text)
+
+
+@pytest.mark.parametrize('text', ["Shares of (Reuters).", "U.S.-China talks", "Really?) yes"])
+def test_punkt_dependent_text_is_not_supported(text):
+    assert not keyword_tokenizer.supports(text)
+
+
+def test_cached_headlines_tokenize_like_word_tokenize(headlines):
+    supported = [text for text in headlines if keyword_tokenizer.supports(text)]
+    # Nearly every raw headline takes the fast path
+    assert len(supported) >= 0.9 * len(headlines)
+    assert [text for text in supported if keyword_tokenizer.tokenize(text) != word_tokenize(text)] == []
+
+
+def test_headline_keywords_match_the_nltk_mode(headlines, analyzers):
+    fast, reference = analyzers
+    for text in headlines:
+        assert fast.extract_keywords(text, max_keywords=5) == reference.extract_keywords(text, max_keywords=5), text
+    preprocessed = [fast.preprocess_text(text) for text in headlines]
+    for text in preprocessed:
+        assert fast.extract_keywords(text) == reference.extract_keywords(text), text
@@ -0,0 +1,94 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from finpulse_app import FinPulseApp
+from utils.news_store import COMPLETE, FRESH, MISSING, STALE, DayPartitionStore, adjacent_runs, article_day
+
+SYMBOL = 'AAPL'
+DAY = date(2024, 3, 4)
+
+
+def article(article_id, day, hour=12):
+    published = datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+    return {'id': article_id, 'headline': f"Article {article_id}", 'datetime': int(published.timestamp())}
+
+
+@pytest.fixture(params=['json', 'columnar'])
+def store(request, tmp_path):
+    return DayPartitionStore(str(tmp_path / 'news'), news_format=request.param)
+
+
+def test_day_written_after_it_ended_is_complete(store):
+    assert store.state(SYMBOL, DAY, ttl=60) == MISSING
+    assert store.read_day(SYMBOL, DAY) is None
+
+    store.write_day(SYMBOL, DAY, [article(1, DAY)])
+    assert store.state(SYMBOL, DAY, ttl=0) == COMPLETE
+
+
+def test_today_is_fresh_until_its_ttl_passes(store):
+    today = datetime.now(timezone.utc).date()
+    store.write_day(SYMBOL, today, [article(1, today, hour=0)])
+    assert store.state(SYMBOL, today, ttl=3600) == FRESH
+    assert store.state(SYMBOL, today, ttl=-1) == STALE
+
+
+def test_day_written_before_it_ended_expires(store):
+    written = datetime(DAY.year, DAY.month, DAY.day, 12)
+    store.news_format.save([article(1, DAY)], store.partition_path(SYMBOL, DAY), allow_empty=True, timestamp=written)
+    assert store.state(SYMBOL, DAY, ttl=3600) == STALE
+
+
+def test_empty_partition_records_a_day_without_news(store):
+    store.write_day(SYMBOL, DAY, [])
+    assert store.read_day(SYMBOL, DAY) == []
+    assert store.state(SYMBOL, DAY, ttl=0) == COMPLETE
+
+
+def test_update_day_keeps_the_partition_age(store):
+    written = datetime(DAY.year, DAY.month, DAY.day, 12)
+    store.news_format.save([article(2, DAY, hour=13), article(1, DAY)], store.partition_path(SYMBOL, DAY),
+                           allow_empty=True, timestamp=written)
+
+    assert store.update_day(SYMBOL, DAY, [{**article(2, DAY, hour=13), 'headline': 'Updated'}])
+    assert [item['headline'] for item in store.read_day(SYMBOL, DAY)] == ['Updated', 'Article 1']
+    assert store.state(SYMBOL, DAY, ttl=3600) == STALE
+    assert not store.update_day(SYMBOL, DAY + timedelta(days=1), [article(3, DAY)])
+
+
+def test_read_range_returns_the_newest_day_first(store):
+    days = [DAY + timedelta(days=offset) for offset in range(3)]
+    for index, day in enumerate(days):
+        store.write_day(SYMBOL, day, [article(index, day)])
+    assert [article_day(item) for item in store.read_range(SYMBOL, days)] == days[::-1]
+
+
+def test_adjacent_runs():
+    days = [DAY, DAY + timedelta(days=1), DAY + timedelta(days=3), DAY + timedelta(days=5), DAY + timedelta(days=6)]
+    assert adjacent_runs(days) == [
+        (DAY, DAY + timedelta(days=1)),
+        (DAY + timedelta(days=3), DAY + timedelta(days=3)),
+        (DAY + timedelta(days=5), DAY + timedelta(days=6)),
+    ]
+    assert adjacent_runs([]) == []
+
+
+def test_partial_range_fetches_only_the_missing_days(standin, tmp_path):
+    app = FinPulseApp(api_key='test', cache_dir=str(tmp_path), base_url=standin.base_url)
+    today = datetime.now(timezone.utc).date()
+    day = lambda offset: (today - timedelta(days=offset)).isoformat()
+
+    assert len(app.get_company_news_with_sentiment(SYMBOL, day(5), day(3), limit=100)) == 30
+    assert standin.stats()['endpoints']['company-news'] == 1
+
+    # Days 6 and 2-1 are missing: one call for each run of adjacent days
+    news = app.get_company_news_with_sentiment(SYMBOL, day(6), day(1), limit=100)
+    assert standin.stats()['endpoints']['company-news'] == 3
+    assert len(news) == 60 and len({item['id'] for item in news}) == 60
+    assert [item['datetime'] for item in news] == sorted((item['datetime'] for item in news), reverse=True)
+
+    # A refetch merges into the stored days by article id
+    news = app.get_company_news_with_sentiment(SYMBOL, day(6), day(1), limit=100, use_cache=False)
+    assert standin.stats()['endpoints']['company-news'] == 4
+    assert len(news) == 60 and len({item['id'] for item in news}) == 60
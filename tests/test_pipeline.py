@@ -0,0 +1,30 @@
+import pytest
+
+from analyzer.pipeline import ArticlePipeline
+from sentiment_analyzer import SentimentAnalyzer
+
+ARTICLES = [
+    {'headline': 'Apple (AAPL) raises guidance', 'summary': 'Revenue grew 12% to $90 billion.'},
+    {},
+    {'headline': 'Oil slips', 'summary': ''},
+]
+
+
+@pytest.fixture(scope='module')
+def pipeline():
+    return ArticlePipeline(SentimentAnalyzer())
+
+
+def test_records_stay_aligned_with_their_articles(pipeline):
+    records = pipeline.process(ARTICLES)
+    assert len(records) == len(ARTICLES)
+    for article, record in zip(ARTICLES, records):
+        assert record.get('headline') == article.get('headline')
+        assert 'sentiment' in record
+    assert records[1]['sentiment'] == pipeline.analyzer.empty_sentiment()
+    assert 'AAPL' in records[0]['extracted_data']['symbols']
+
+
+def test_non_dict_articles_are_rejected(pipeline):
+    with pytest.raises(TypeError):
+        pipeline.process([ARTICLES[0], None])
@@ -0,0 +1,166 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from finnhub_client import FinnhubClient
+from utils.news_store import article_day, day_range
+from utils.range_fetcher import NewsRangeFetcher, merge_chunks
+
+SYMBOL = 'AAPL'
+FIRST, LAST = date(2024, 3, 1), date(2024, 3, 20)
+
+
+def day_articles(day, count):
+    """``count`` articles published on ``day``, newest first."""
+    start = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+    return [{'id': day.toordinal() * 1000 + index, 'datetime': start + 3600 - index} for index in range(count)]
+
+
+class FakeNews:
+    """``company-news`` over generated days, newest first and cut off at ``max_results`` like the API.
+
+    ``overlap`` days before a range are returned as well, as a response that
+    spills past its bounds would.
+    """
+
+    def __init__(self, per_day=10, max_results=25, overlap=0, busy=None, failing=()):
+        self.per_day = per_day
+        self.max_results = max_results
+        self.overlap = overlap
+        self.busy = busy or {}
+        self.failing = set(failing)
+        self.calls = []
+
+    def articles(self, first, last):
+        return [
+            item for day in reversed(day_range(first, last))
+            for item in day_articles(day, self.busy.get(day, self.per_day))
+        ]
+
+    def __call__(self, symbol, from_date, to_date):
+        first, last = date.fromisoformat(from_date), date.fromisoformat(to_date)
+        self.calls.append((first, last))
+        if (first, last) in self.failing:
+            raise ConnectionError('connection reset')
+        return self.articles(first - timedelta(days=self.overlap), last)[:self.max_results]
+
+
+def ids(articles):
+    return [item['id'] for item in articles]
+
+
+def test_truncated_responses_are_refetched_until_the_range_is_whole():
+    news = FakeNews(per_day=10, max_results=25)
+    fetcher = NewsRangeFetcher(max_results=25, workers=4)
+    chunks = list(fetcher.iter_chunks(news, SYMBOL, FIRST, LAST))
+
+    merged = merge_chunks(chunks)
+    assert ids(merged) == ids(news.articles(FIRST, LAST))
+    assert fetcher.stats()['truncated'] >= 1 and len(news.calls) > 1
+    for first, last, articles in chunks:
+        assert all(first <= article_day(item) <= last for item in articles)
+
+
+def test_first_response_sets_the_chunk_size_for_the_rest_of_the_range():
+    news = FakeNews(per_day=10, max_results=1000)
+    fetcher = NewsRangeFetcher(max_results=40, workers=2, max_chunk_days=5)
+    merged = merge_chunks(fetcher.iter_chunks(news, SYMBOL, FIRST, LAST))
+
+    assert ids(merged) == ids(news.articles(FIRST, LAST))
+    # Probed with the newest 5 days, then 10 articles a day fill 80% of 40 in 3 days
+    assert news.calls[0] == (LAST - timedelta(days=4), LAST)
+    assert all((last - first).days + 1 <= 3 for first, last in news.calls[1:])
+
+
+def test_articles_spilling_into_another_chunk_are_kept_by_their_day():
+    news = FakeNews(per_day=2, max_results=1000, overlap=1)
+    fetcher = NewsRangeFetcher(max_results=1000, workers=4, max_chunk_days=3)
+    merged = merge_chunks(fetcher.iter_chunks(news, SYMBOL, FIRST, LAST))
+
+    assert ids(merged) == ids(news.articles(FIRST, LAST))
+    assert fetcher.stats()['duplicates'] == 0
+
+
+def test_article_returned_by_two_chunks_is_handed_out_once():
+    republished = date(2024, 3, 18)
+    # An article of March 2 comes back again, re-dated, with the news of March 18
+    copy = {**day_articles(date(2024, 3, 2), 1)[0], 'datetime': day_articles(republished, 1)[0]['datetime'] - 1}
+    news = FakeNews(per_day=2, max_results=1000)
+
+    def fetch(symbol, from_date, to_date):
+        articles = news(symbol, from_date, to_date)
+        if date.fromisoformat(from_date) <= republished <= date.fromisoformat(to_date):
+            articles.append(copy)
+        return articles
+
+    fetcher = NewsRangeFetcher(max_results=1000, workers=1, max_chunk_days=5)
+    merged = merge_chunks(fetcher.iter_chunks(fetch, SYMBOL, FIRST, LAST))
+
+    assert len(merged) == len(set(ids(merged))) == len(news.articles(FIRST, LAST))
+    assert fetcher.stats()['duplicates'] == 1
+
+
+def test_day_with_more_articles_than_one_response_keeps_its_newest():
+    busy_day = date(2024, 3, 10)
+    news = FakeNews(per_day=2, max_results=30, busy={busy_day: 50})
+    fetcher = NewsRangeFetcher(max_results=30, workers=2)
+    merged = merge_chunks(fetcher.iter_chunks(news, SYMBOL, FIRST, LAST))
+
+    busy = [item for item in merged if article_day(item) == busy_day]
+    assert ids(busy) == ids(day_articles(busy_day, 50))[:30]
+    assert [item for item in merged if article_day(item) != busy_day] == [
+        item for item in news.articles(FIRST, LAST) if article_day(item) != busy_day
+    ]
+
+
+def test_failed_chunk_is_handed_out_as_an_error_and_skipped_when_merging():
+    failing = (date(2024, 3, 11), date(2024, 3, 15))
+    news = FakeNews(per_day=1, max_results=1000, failing=[failing])
+    fetcher = NewsRangeFetcher(max_results=1000, workers=2, max_chunk_days=5)
+    chunks = list(fetcher.iter_chunks(news, SYMBOL, FIRST, LAST))
+
+    assert [(first, last) for first, last, articles in chunks if not isinstance(articles, list)] == [failing]
+    merged = merge_chunks(chunks)
+    assert ids(merged) == [
+        item['id'] for item in news.articles(FIRST, LAST) if not failing[0] <= article_day(item) <= failing[1]
+    ]
+
+
+def test_merge_chunks_orders_articles_newest_first():
+    chunks = [
+        (date(2024, 3, 1), date(2024, 3, 1), day_articles(date(2024, 3, 1), 2)),
+        (date(2024, 3, 2), date(2024, 3, 3), {'error': 'API limit reached'}),
+        (date(2024, 3, 4), date(2024, 3, 4), day_articles(date(2024, 3, 4), 2)),
+    ]
+    merged = merge_chunks(chunks)
+    assert [item['datetime'] for item in merged] == sorted((item['datetime'] for item in merged), reverse=True)
+    assert len(merged) == 4
+
+
+def test_async_chunks_match_the_threaded_ones():
+    news = FakeNews(per_day=10, max_results=25, overlap=1)
+
+    async def fetch(symbol, from_date, to_date):
+        return news(symbol, from_date, to_date)
+
+    async def collect():
+        return [chunk async for chunk in NewsRangeFetcher(max_results=25).iter_chunks_async(fetch, SYMBOL, FIRST, LAST)]
+
+    assert ids(merge_chunks(asyncio.run(collect()))) == ids(news.articles(FIRST, LAST))
+
+
+def test_client_range_against_the_standin(standin, rate_limiter):
+    standin.data.max_results = 25
+    client = FinnhubClient(
+        'test', rate_limiter=rate_limiter, base_url=standin.base_url, range_fetcher=NewsRangeFetcher(max_results=25)
+    )
+    today = datetime.now(timezone.utc).date()
+    from_date, to_date = (today - timedelta(days=20)).isoformat(), (today - timedelta(days=1)).isoformat()
+
+    news = client.get_company_news_range(SYMBOL, from_date, to_date)
+    # Day by day, no response of the stand-in is cut off
+    expected = [
+        item for day in day_range(from_date, to_date)
+        for item in standin.data.get_company_news(SYMBOL, day.isoformat(), day.isoformat())
+    ]
+    assert len(news) == 200 and sorted(ids(news)) == sorted(ids(expected))
+    assert standin.stats()['endpoints']['company-news'] > 1
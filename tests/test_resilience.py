@@ -0,0 +1,101 @@
+import time
+import asyncio
+
+import pytest
+
+from async_finnhub_client import AsyncFinnhubClient
+from finnhub_client import FinnhubClient
+from utils.http_transport import HttpTransport
+from utils.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, Resilience, RetryPolicy
+
+RESET_TIMEOUT = 0.05
+
+
+@pytest.fixture
+def transport():
+    transport = HttpTransport(
+        resilience=Resilience(RetryPolicy(max_retries=0), failure_threshold=2, reset_timeout=RESET_TIMEOUT)
+    )
+    yield transport
+    transport.close()
+
+
+def open_circuit(standin, get_quote):
+    standin.error_rate = 1.0
+    for _ in range(2):
+        assert 'error' in get_quote()
+    standin.error_rate = 0.0
+
+
+def test_breaker_lets_one_trial_through_after_the_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_TIMEOUT)
+    assert breaker.allow() == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    time.sleep(RESET_TIMEOUT)
+    assert breaker.allow() == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_released_trial_lets_the_next_call_try_again():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_TIMEOUT)
+    breaker.record_failure()
+    time.sleep(RESET_TIMEOUT)
+    assert breaker.allow() == HALF_OPEN
+    breaker.release()
+    assert breaker.allow() == HALF_OPEN
+
+
+def test_rate_limited_trial_does_not_wedge_the_circuit(standin, transport, rate_limiter):
+    client = FinnhubClient('test', rate_limiter=rate_limiter, transport=transport, base_url=standin.base_url)
+    breaker = transport.resilience.breaker('quote')
+    open_circuit(standin, lambda: client.get_stock_quote('AAPL'))
+    assert breaker.state == OPEN
+
+    time.sleep(RESET_TIMEOUT)
+    standin.throttle_rate = 1.0
+    assert 'error' in client.get_stock_quote('AAPL')
+    assert breaker.state == HALF_OPEN
+
+    standin.throttle_rate = 0.0
+    assert 'c' in client.get_stock_quote('AAPL')
+    assert breaker.stats()['state'] == CLOSED
+
+
+def test_trial_ending_in_an_unexpected_error_is_released(standin, transport, rate_limiter, monkeypatch):
+    client = FinnhubClient('test', rate_limiter=rate_limiter, transport=transport, base_url=standin.base_url)
+    breaker = transport.resilience.breaker('quote')
+    open_circuit(standin, lambda: client.get_stock_quote('AAPL'))
+    time.sleep(RESET_TIMEOUT)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("unexpected")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(client.session, '_send_timed', fail)
+        with pytest.raises(RuntimeError):
+            client.get_stock_quote('AAPL')
+    assert 'c' in client.get_stock_quote('AAPL')
+    assert breaker.state == CLOSED
+
+
+def test_async_rate_limited_trial_does_not_wedge_the_circuit(standin, transport, rate_limiter):
+    async def run():
+        async with AsyncFinnhubClient('test', base_url=standin.base_url, rate_limiter=rate_limiter,
+                                      resilience=transport.resilience) as client:
+            standin.error_rate = 1.0
+            for _ in range(2):
+                assert 'error' in await client.get_stock_quote('AAPL')
+            standin.error_rate = 0.0
+
+            await asyncio.sleep(RESET_TIMEOUT)
+            standin.throttle_rate = 1.0
+            assert 'error' in await client.get_stock_quote('AAPL')
+            standin.throttle_rate = 0.0
+            return await client.get_stock_quote('AAPL')
+
+    assert 'c' in asyncio.run(run())
+    assert transport.resilience.breaker('quote').state == CLOSED
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+import sentiment_analyzer
+from analyzer.sentiment_cache import SentimentCache
+from sentiment_analyzer import SentimentAnalyzer
+
+TEXT = "Apple beats estimates as iPhone sales surge"
+
+
+@pytest.mark.parametrize('cache', [None, SentimentCache()], ids=['uncached', 'cached'])
+def test_duplicate_texts_get_independent_results(cache):
+    analyzer = SentimentAnalyzer(cache=cache)
+    first, second, third = analyzer.analyze_texts([TEXT, TEXT, TEXT.upper()])
+    assert first == second == third
+
+    first['label'] = 'mutated'
+    first['breakdown']['positive'] = -1.0
+    first['keywords'].append('mutated')
+    for other in (second, third, analyzer.analyze_texts([TEXT])[0]):
+        assert other['label'] != 'mutated'
+        assert other['breakdown']['positive'] >= 0
+        assert 'mutated' not in other['keywords']
+
+
+def test_concurrent_batches_share_one_worker_pool(monkeypatch):
+    pools = []
+
+    class CountingPool(sentiment_analyzer.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(sentiment_analyzer, 'ProcessPoolExecutor', CountingPool)
+    analyzer = SentimentAnalyzer(workers=2, parallel_min_batch=2, chunk_size=2)
+    start = threading.Barrier(4)
+    results = {}
+
+    def score(index):
+        start.wait()
+        results[index] = analyzer.analyze_texts([f"{TEXT} {index} {n}" for n in range(4)])
+
+    threads = [threading.Thread(target=score, args=(index,)) for index in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        analyzer.shutdown()
+    assert len(pools) == 1
+    assert all(len(batch) == 4 for batch in results.values()) and len(results) == 4
@@ -0,0 +1,158 @@
+import os
+import time
+import fcntl
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from finpulse_app import FinPulseApp
+from utils.single_flight import SingleFlight
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def run_callers(count, call):
+    results, errors = [None] * count, []
+
+    def run(index):
+        try:
+            results[index] = call()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+class BlockingFetch:
+    """A fetch that counts its calls and returns only once released."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        assert self.release.wait(5.0)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def flight(tmp_path):
+    return SingleFlight(lock_dir=str(tmp_path / 'locks'), lock_timeout=5.0, poll_interval=0.01)
+
+
+def test_concurrent_callers_of_one_key_share_one_fetch(flight):
+    fetch = BlockingFetch(result={'news': [1, 2, 3]})
+    threads, results, errors = run_callers(4, lambda: flight.do('company_news:AAPL', fetch))
+
+    wait_for(lambda: flight.stats()['coalesced'] == 3)
+    fetch.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors and fetch.calls == 1
+    assert results == [{'news': [1, 2, 3]}] * 4
+    assert flight.stats()['fetches'] == 1 and flight.stats()['in_flight'] == 0
+
+
+def test_waiters_read_their_own_copy_through_recheck(flight):
+    fetch = BlockingFetch(result=['fetched'])
+    leader, _, _ = run_callers(1, lambda: flight.do('key', fetch, lambda: ['stored']))
+    wait_for(lambda: flight.stats()['in_flight'] == 1)
+    waiters, results, _ = run_callers(2, lambda: flight.do('key', fetch, lambda: ['stored']))
+
+    wait_for(lambda: flight.stats()['coalesced'] == 2)
+    fetch.release.set()
+    for thread in leader + waiters:
+        thread.join()
+
+    assert results == [['stored'], ['stored']] and results[0] is not results[1]
+
+
+def test_failed_fetch_reaches_every_waiter_and_is_not_kept(flight):
+    fetch = BlockingFetch(error=RuntimeError('API down'))
+    threads, results, errors = run_callers(3, lambda: flight.do('key', fetch))
+
+    wait_for(lambda: flight.stats()['coalesced'] == 2)
+    fetch.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3 and all(str(e) == 'API down' for e in errors)
+    assert flight.do('key', lambda: 'retried') == 'retried'
+
+
+def test_different_keys_are_fetched_separately(flight):
+    assert [flight.do(key, lambda key=key: key) for key in ('a', 'b', 'a')] == ['a', 'b', 'a']
+    assert flight.stats()['fetches'] == 3 and flight.stats()['coalesced'] == 0
+
+
+def test_lock_files_are_bounded_by_the_stripes(tmp_path):
+    flight = SingleFlight(lock_dir=str(tmp_path), lock_stripes=4)
+    for index in range(50):
+        flight.do(f"key-{index}", lambda: index)
+    assert len(os.listdir(tmp_path)) <= 4
+
+
+def hold_lock(flight, key):
+    lock_file = open(flight.lock_path(key), 'a+')
+    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    return lock_file
+
+
+def test_fetch_stored_by_another_process_is_reused(flight):
+    # Another open file description stands in for a second worker holding the stripe
+    lock_file = hold_lock(flight, 'key')
+    stored = []
+    threading.Timer(0.05, lambda: (stored.append('stored'), lock_file.close())).start()
+
+    assert flight.do('key', lambda: 'fetched', lambda: stored[0] if stored else None) == 'stored'
+    assert flight.stats()['coalesced_across_processes'] == 1 and flight.stats()['fetches'] == 0
+
+
+def test_key_sharing_a_stripe_still_fetches(flight):
+    lock_file = hold_lock(flight, 'key')
+    threading.Timer(0.05, lock_file.close).start()
+
+    assert flight.do('key', lambda: 'fetched', lambda: None) == 'fetched'
+    assert flight.stats()['fetches'] == 1
+
+
+def test_hung_lock_holder_times_out_into_a_fetch(tmp_path):
+    flight = SingleFlight(lock_dir=str(tmp_path), lock_timeout=0.05, poll_interval=0.01)
+    lock_file = hold_lock(flight, 'key')
+    try:
+        assert flight.do('key', lambda: 'fetched', lambda: None) == 'fetched'
+    finally:
+        lock_file.close()
+    assert flight.stats()['lock_timeouts'] == 1
+
+
+def test_concurrent_requests_for_a_range_make_one_api_call(standin, tmp_path):
+    app = FinPulseApp(api_key='test', cache_dir=str(tmp_path), base_url=standin.base_url)
+    today = datetime.now(timezone.utc).date()
+    from_date, to_date = (today - timedelta(days=4)).isoformat(), (today - timedelta(days=2)).isoformat()
+    # Slow enough that every request misses the cache while the first fetch is in flight
+    standin.latency = 0.2
+
+    threads, results, errors = run_callers(
+        4, lambda: app.get_company_news_with_sentiment('AAPL', from_date, to_date, limit=100)
+    )
+    for thread in threads:
+        thread.join()
+
+    assert not errors and [len(news) for news in results] == [30] * 4
+    assert standin.stats()['endpoints']['company-news'] == 1
@@ -0,0 +1,254 @@
+"""Priority scheduling of Finnhub calls in front of the shared token bucket.
+
+Every call belongs to a class:
+
+- ``interactive``: a lookup a user is waiting on (the default)
+- ``batch``: user-triggered work spanning many calls, such as a portfolio analysis
+- ``background``: cache refreshes and prefetching
+
+An ``ApiScheduler`` queues callers per class and, within a class, per user, and
+lets only the head of the queue take a token: the oldest caller of the highest
+class with anyone waiting, taking users of that class in turn so one user's
+batch cannot starve another's. Lower classes also leave part of the bucket's
+burst untouched (``reserves``), so when the budget runs low they stop drawing
+from it, leaving the rest for interactive calls from this and every other
+worker process. A waiting caller that is overtaken by a higher class is
+counted as preempted.
+
+The class and user come from the calling context, so code deep inside the
+clients needs no extra arguments:
+
+    with api_priority(BACKGROUND):
+        app.prefetch()
+
+The scheduler has the ``TokenBucket`` interface and can stand in for it as the
+``rate_limiter`` of any client.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import numpy as np
+
+from utils.rate_limiter import shared_bucket
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+BACKGROUND = 'background'
+PRIORITIES = (INTERACTIVE, BATCH, BACKGROUND)
+
+# Share of the bucket's burst a class leaves to the classes above it
+DEFAULT_RESERVES = {INTERACTIVE: 0.0, BATCH: 0.25, BACKGROUND: 0.5}
+
+# Longest a waiting head sleeps before re-reading a budget other processes also draw from
+MAX_POLL_SECONDS = 1.0
+
+_priority = ContextVar('finnhub_priority', default=INTERACTIVE)
+_user = ContextVar('finnhub_user', default=None)
+
+
+@contextmanager
+def api_priority(priority, user=None):
+    """Run the enclosed Finnhub calls as ``priority`` (and on behalf of ``user``, if given)."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r}, expected one of {PRIORITIES}")
+    tokens = set_caller(user, priority) if user is not None else (None, _priority.set(priority))
+    try:
+        yield
+    finally:
+        reset_caller(tokens)
+
+
+def set_caller(user, priority=INTERACTIVE):
+    """Attribute this context's calls to ``user`` at ``priority``; returns what ``reset_caller`` needs."""
+    return _user.set(user), _priority.set(priority)
+
+
+def reset_caller(tokens):
+    user_token, priority_token = tokens
+    _priority.reset(priority_token)
+    if user_token is not None:
+        _user.reset(user_token)
+
+
+def current_caller():
+    return _priority.get(), _user.get()
+
+
+class _Ticket:
+    __slots__ = ('priority', 'user', 'enqueued')
+
+    def __init__(self, priority, user):
+        self.priority = priority
+        self.user = user
+        self.enqueued = time.monotonic()
+
+
+class ApiScheduler:
+
+    def __init__(self, bucket, reserves=None, samples=1024):
+        self.bucket = bucket
+        self.reserves = {**DEFAULT_RESERVES, **(reserves or {})}
+        self._cond = threading.Condition()
+        # priority -> user -> waiting tickets, users in turn order
+        self._queues = {priority: OrderedDict() for priority in PRIORITIES}
+        self.stats_counts = {
+            priority: {'granted': 0, 'preempted': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+            for priority in PRIORITIES
+        }
+        self._waits = {priority: deque(maxlen=samples) for priority in PRIORITIES}
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    @property
+    def period(self):
+        return self.bucket.period
+
+    @property
+    def burst(self):
+        return self.bucket.burst
+
+    def _head(self):
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            if queue:
+                return next(iter(queue.values()))[0]
+        return None
+
+    def _enqueue(self, ticket):
+        head = self._head()
+        if head is not None and PRIORITIES.index(head.priority) > PRIORITIES.index(ticket.priority):
+            self.stats_counts[head.priority]['preempted'] += 1
+        self._queues[ticket.priority].setdefault(ticket.user, deque()).append(ticket)
+        self._cond.notify_all()
+
+    def _dequeue(self, ticket):
+        queue = self._queues[ticket.priority]
+        waiting = queue[ticket.user]
+        served = waiting[0] is ticket
+        waiting.remove(ticket)
+        if not waiting:
+            del queue[ticket.user]
+        elif served:
+            # The user's next call queues behind the other users of the class
+            queue.move_to_end(ticket.user)
+        self._cond.notify_all()
+
+    def _budget_wait(self, priority):
+        """Seconds until the bucket holds a token beyond the reserve of ``priority``."""
+        tokens, blocked_for = self.bucket.budget()
+        needed = 1 + self.reserves[priority] * self.bucket.burst - tokens
+        return max(blocked_for, needed * self.bucket.period / self.bucket.rate if needed > 0 else 0.0)
+
+    def _wait_turn(self, priority, user):
+        ticket = _Ticket(priority, user)
+        with self._cond:
+            self._enqueue(ticket)
+            try:
+                while True:
+                    if self._head() is ticket:
+                        wait = self._budget_wait(priority)
+                        if wait <= 0:
+                            break
+                        self._cond.wait(min(wait, MAX_POLL_SECONDS))
+                    else:
+                        self._cond.wait()
+                delay = self.bucket.reserve()
+            finally:
+                self._dequeue(ticket)
+        return time.monotonic() - ticket.enqueued + delay, delay
+
+    def _record_wait(self, priority, wait):
+        self.bucket.record_wait(wait)
+        with self._cond:
+            counts = self.stats_counts[priority]
+            counts['granted'] += 1
+            counts['wait_seconds'] += wait
+            counts['max_wait_seconds'] = max(counts['max_wait_seconds'], wait)
+            self._waits[priority].append(wait)
+
+    def acquire(self, priority=None, user=None):
+        """Block until this caller's turn and a token come; returns the seconds waited.
+
+        ``priority`` and ``user`` default to those of the calling context.
+        """
+        context_priority, context_user = current_caller()
+        priority = priority or context_priority
+        user = user if user is not None else context_user
+        wait, delay = self._wait_turn(priority, user)
+        if delay > 0:
+            time.sleep(delay)
+        self._record_wait(priority, wait)
+        if wait > 1:
+            logger.info(f"{priority} call waited {wait:.2f} seconds for the API budget")
+        return wait
+
+    async def acquire_async(self, priority=None, user=None):
+        """``acquire`` for coroutines; the wait runs on a worker thread in the caller's context."""
+        return await asyncio.to_thread(self.acquire, priority, user)
+
+    def reserve(self):
+        return self.bucket.reserve()
+
+    def update(self, remaining=None, reset=None):
+        self.bucket.update(remaining, reset)
+        with self._cond:
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers):
+        self.bucket.update_from_headers(headers)
+
+    def block(self, seconds):
+        self.bucket.block(seconds)
+
+    def budget(self):
+        return self.bucket.budget()
+
+    def stats(self):
+        """The bucket's stats plus queue depth, grants, preemptions and waits per class (waits in ms)."""
+        with self._cond:
+            counts = {priority: dict(values) for priority, values in self.stats_counts.items()}
+            waits = {priority: list(samples) for priority, samples in self._waits.items()}
+            depth = {
+                priority: (sum(len(waiting) for waiting in queue.values()), len(queue))
+                for priority, queue in self._queues.items()
+            }
+
+        classes = {}
+        for priority in PRIORITIES:
+            granted = counts[priority]['granted']
+            samples = np.array(waits[priority] or [0.0]) * 1000
+            classes[priority] = {
+                'queued': depth[priority][0],
+                'users_queued': depth[priority][1],
+                'granted': granted,
+                'preempted': counts[priority]['preempted'],
+                'reserve': self.reserves[priority],
+                'avg_wait_ms': round(counts[priority]['wait_seconds'] * 1000 / granted, 2) if granted else 0.0,
+                'p95_wait_ms': round(float(np.percentile(samples, 95)), 2),
+                'max_wait_ms': round(counts[priority]['max_wait_seconds'] * 1000, 2)
+            }
+        return {**self.bucket.stats(), 'classes': classes}
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def shared_scheduler(api_key):
+    """The scheduler in front of ``shared_bucket(api_key)``, one per process."""
+    bucket = shared_bucket(api_key)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(id(bucket))
+        if scheduler is None:
+            scheduler = _schedulers[id(bucket)] = ApiScheduler(bucket)
+        return scheduler
@@ -0,0 +1,348 @@
+"""SQLite article repository with a full-text index.
+
+Articles are stored once per article key (Finnhub id, or url and time) as JSON
+in one normalised form: the Finnhub fields, plus sentiment and extracted data
+once the article has been analysed, which later unanalysed copies do not erase.
+``article_symbols`` and ``article_categories`` link them to the symbols and
+market news categories they were fetched for, indexed on ``(symbol, datetime)``
+and ``(category, datetime)``, and the FTS5 table ``articles_fts`` indexes
+headline and summary.
+
+The full-text index uses the ``trigram`` tokenizer, so a keyword matches
+anywhere inside a word, case-insensitively, like the substring tests of
+``filter_news_by_keywords``. Keywords shorter than three characters cannot be
+looked up in a trigram index and fall back to ``LIKE``.
+
+    python -m utils.article_repository ingest cache/
+    python -m utils.article_repository search "rate cut" --symbol AAPL
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import logging
+import argparse
+import threading
+
+from utils.delta_fetch import article_key
+from utils.news_store import NEWS_FORMATS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPOSITORY_NAME = 'articles.db'
+MIN_TRIGRAM_LENGTH = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    datetime INTEGER NOT NULL DEFAULT 0,
+    headline TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_datetime ON articles (datetime);
+
+CREATE TABLE IF NOT EXISTS article_symbols (
+    symbol TEXT NOT NULL,
+    datetime INTEGER NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    PRIMARY KEY (symbol, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_article_symbols_datetime ON article_symbols (symbol, datetime);
+
+CREATE TABLE IF NOT EXISTS article_categories (
+    category TEXT NOT NULL,
+    datetime INTEGER NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    PRIMARY KEY (category, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_article_categories_datetime ON article_categories (category, datetime);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    headline, summary, content='articles', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, headline, summary) VALUES (new.id, new.headline, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, headline, summary) VALUES ('delete', old.id, old.headline, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF headline, summary ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, headline, summary) VALUES ('delete', old.id, old.headline, old.summary);
+    INSERT INTO articles_fts (rowid, headline, summary) VALUES (new.id, new.headline, new.summary);
+END;
+"""
+
+# A copy without analysis (e.g. from the API blueprints) keeps the sentiment a scored copy stored
+UPSERT = """
+INSERT INTO articles (key, datetime, headline, summary, data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    datetime = excluded.datetime, headline = excluded.headline, summary = excluded.summary,
+    data = json_patch(data, excluded.data)
+WHERE data != json_patch(data, excluded.data)
+"""
+
+LINK_SYMBOL = """
+INSERT OR IGNORE INTO article_symbols (symbol, datetime, article_id)
+SELECT ?, datetime, id FROM articles WHERE key = ?
+"""
+
+LINK_CATEGORY = """
+INSERT OR IGNORE INTO article_categories (category, datetime, article_id)
+SELECT ?, datetime, id FROM articles WHERE key = ?
+"""
+
+# Every stored article is reduced to these, whichever client fetched and formatted it
+ARTICLE_FIELDS = ('id', 'category', 'datetime', 'headline', 'image', 'source', 'summary', 'url', 'related')
+ANALYSIS_FIELDS = ('sentiment', 'sentiment_version', 'extracted_data')
+
+COMPANY_NEWS_FILE = re.compile(r'^([A-Za-z0-9.\-]+)_news$')
+MARKET_NEWS_FILE = re.compile(r'^market_news_(\w+)$')
+
+
+def repository_key(item):
+    return json.dumps(article_key(item), default=str)
+
+
+def normalize_article(item):
+    """The Finnhub fields of ``item``, plus its analysis when it has one."""
+    article = {field: item.get(field, 0 if field == 'datetime' else '') for field in ARTICLE_FIELDS}
+    article.update({field: item[field] for field in ANALYSIS_FIELDS if field in item})
+    return article
+
+
+def _text(value):
+    return value if isinstance(value, str) else ''
+
+
+def _timestamp(value):
+    try:
+        return int(value or 0)
+    except (ValueError, TypeError):
+        return 0
+
+
+def _phrase(keyword):
+    return '"' + keyword.replace('"', '""') + '"'
+
+
+def _like(keyword):
+    return '%' + keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def keyword_condition(keywords, match_all=False):
+    """SQL condition on ``articles`` matching any (or every) keyword, with its parameters.
+
+    Keywords long enough for the trigram index become one FTS5 ``MATCH``; shorter
+    ones are tested with ``LIKE``.
+    """
+    keywords = [keyword.strip() for keyword in keywords if keyword and keyword.strip()]
+    indexed = [keyword for keyword in keywords if len(keyword) >= MIN_TRIGRAM_LENGTH]
+    short = [keyword for keyword in keywords if len(keyword) < MIN_TRIGRAM_LENGTH]
+
+    conditions = []
+    params = []
+    if indexed:
+        operator = ' AND ' if match_all else ' OR '
+        conditions.append("articles.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+        params.append(operator.join(_phrase(keyword) for keyword in indexed))
+    for keyword in short:
+        conditions.append("(articles.headline LIKE ? ESCAPE '\\' OR articles.summary LIKE ? ESCAPE '\\')")
+        params.extend([_like(keyword)] * 2)
+
+    if not conditions:
+        return None, []
+    return '(' + (' AND ' if match_all else ' OR ').join(conditions) + ')', params
+
+
+class ArticleRepository:
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def add(self, news_items, symbol=None, category=None):
+        """Insert or update ``news_items``, linking them to ``symbol`` and/or ``category``."""
+        rows = []
+        keys = []
+        for item in news_items:
+            if not isinstance(item, dict):
+                continue
+            key = repository_key(item)
+            keys.append(key)
+            rows.append((
+                key,
+                _timestamp(item.get('datetime')),
+                _text(item.get('headline')),
+                _text(item.get('summary')),
+                json.dumps(normalize_article(item), default=str)
+            ))
+        if not rows:
+            return 0
+
+        with self._lock:
+            try:
+                with self._db:
+                    self._db.executemany(UPSERT, rows)
+                    if symbol:
+                        self._db.executemany(LINK_SYMBOL, [(symbol.upper(), key) for key in keys])
+                    if category:
+                        self._db.executemany(LINK_CATEGORY, [(category, key) for key in keys])
+            except sqlite3.Error as e:
+                logger.error(f"Error adding articles to {self.path}: {e}")
+                return 0
+        return len(rows)
+
+    def search(self, query=None, symbols=None, categories=None, keywords=None,
+               since=None, until=None, limit=50, offset=0):
+        """Articles matching every filter, newest first.
+
+        ``query`` matches articles containing all of its words, ``keywords``
+        articles containing any of them. ``symbols`` and ``categories`` select
+        articles linked to any of them (either kind when both are given);
+        ``since`` and ``until`` bound the publication timestamp.
+        """
+        conditions = []
+        params = []
+
+        sources = []
+        if symbols:
+            placeholders = ', '.join('?' * len(symbols))
+            sources.append(f"SELECT article_id FROM article_symbols WHERE symbol IN ({placeholders})"
+                           + self._time_bounds(params, [symbol.upper() for symbol in symbols], since, until))
+        if categories:
+            placeholders = ', '.join('?' * len(categories))
+            sources.append(f"SELECT article_id FROM article_categories WHERE category IN ({placeholders})"
+                           + self._time_bounds(params, list(categories), since, until))
+        if sources:
+            conditions.append(f"articles.id IN ({' UNION '.join(sources)})")
+
+        for terms, match_all in ((query.split() if query else [], True), (keywords or [], False)):
+            condition, condition_params = keyword_condition(terms, match_all=match_all)
+            if condition:
+                conditions.append(condition)
+                params.extend(condition_params)
+
+        if since is not None:
+            conditions.append("articles.datetime >= ?")
+            params.append(int(since))
+        if until is not None:
+            conditions.append("articles.datetime <= ?")
+            params.append(int(until))
+
+        sql = "SELECT data FROM articles"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY articles.datetime DESC LIMIT ? OFFSET ?"
+        params.extend([int(limit), int(offset)])
+
+        with self._lock:
+            try:
+                rows = self._db.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Error searching articles in {self.path}: {e}")
+                return []
+        return [json.loads(row[0]) for row in rows]
+
+    @staticmethod
+    def _time_bounds(params, values, since, until):
+        params.extend(values)
+        clause = ""
+        if since is not None:
+            clause += " AND datetime >= ?"
+            params.append(int(since))
+        if until is not None:
+            clause += " AND datetime <= ?"
+            params.append(int(until))
+        return clause
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'path': self.path,
+                'articles': self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+                'symbols': self._db.execute("SELECT COUNT(DISTINCT symbol) FROM article_symbols").fetchone()[0],
+                'categories': self._db.execute(
+                    "SELECT COUNT(DISTINCT category) FROM article_categories"
+                ).fetchone()[0]
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def ingest_cache(self, cache_dir):
+        """Add every cached news file under ``cache_dir``; returns the number of articles read.
+
+        ``{SYMBOL}_news`` files and ``news/{SYMBOL}/`` day partitions are linked to
+        their symbol, ``market_news_{category}`` files to their category, in either
+        storage format.
+        """
+        added = 0
+        for directory, _, filenames in os.walk(cache_dir):
+            for filename in sorted(filenames):
+                stem, extension = os.path.splitext(filename)
+                news_format = next((fmt for fmt in NEWS_FORMATS.values() if fmt.extension == extension), None)
+                if news_format is None:
+                    continue
+
+                symbol = category = None
+                parent = os.path.relpath(directory, cache_dir).split(os.sep)
+                if len(parent) == 2 and parent[0] == 'news':
+                    symbol = parent[1]
+                elif COMPANY_NEWS_FILE.match(stem):
+                    symbol = COMPANY_NEWS_FILE.match(stem).group(1)
+                elif MARKET_NEWS_FILE.match(stem):
+                    category = MARKET_NEWS_FILE.match(stem).group(1)
+                else:
+                    continue
+
+                news_items = news_format.load(os.path.join(directory, filename))
+                added += self.add(news_items, symbol=symbol, category=category)
+        return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the article search index")
+    parser.add_argument('--db', default=os.path.join('cache', DEFAULT_REPOSITORY_NAME), help="Repository file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subparsers.add_parser('ingest', help="Add every cached news file")
+    ingest.add_argument('cache_dir', nargs='?', default='cache')
+
+    search = subparsers.add_parser('search', help="Search headlines and summaries")
+    search.add_argument('query')
+    search.add_argument('--symbol', action='append', help="Only articles about this symbol (repeatable)")
+    search.add_argument('--category', action='append', help="Only articles of this category (repeatable)")
+    search.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    repository = ArticleRepository(args.db)
+    if args.command == 'ingest':
+        read = repository.ingest_cache(args.cache_dir)
+        print(f"Read {read} articles; {repository.count()} articles in {args.db}")
+    else:
+        for item in repository.search(args.query, symbols=args.symbol, categories=args.category, limit=args.limit):
+            print(f"{item.get('datetime', 0)} {item.get('headline', '')}")
+    repository.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,446 @@
+"""Disk budget, eviction and compaction for the ``cache/`` directory.
+
+Every lookup of a cache entry (a news partition, market news file, quote or
+profile) is recorded in ``cache_access.db`` with its last access time and hit
+and miss counts; records are buffered and written in batches. When the entries
+outgrow the disk budget, the least recently used (``lru``) or least frequently
+used (``lfu``) ones are deleted until the cache is back under the low-water mark.
+
+Compaction deletes day partitions older than the retention window, drops
+expired articles from market news files, and rewrites JSON news files without
+indentation.
+
+    python -m utils.cache_manager stats cache/
+    python -m utils.cache_manager evict cache/ --max-mb 200
+    python -m utils.cache_manager compact cache/ --retention-days 30
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+
+from utils.news_cache import MISSING, read_cache_timestamp
+from utils.news_store import NEWS_FORMATS, parse_day
+from utils.finnhub_utils import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+ACCESS_DB_NAME = 'cache_access.db'
+POLICIES = ('lru', 'lfu')
+LOW_WATER = 0.9
+# Temporary files younger than this may belong to a write still in progress
+TEMP_FILE_MAX_AGE = 3600
+
+PARTITION_PATH = re.compile(r'^news/([^/]+)/(\d{4}-\d{2}-\d{2})\.\w+$')
+MARKET_NEWS_PATH = re.compile(r'^market_news_\w+\.\w+$')
+COMPANY_NEWS_PATH = re.compile(r'^([^/]+)_news\.\w+$')
+DATA_PATH = re.compile(r'^([^/]+)_(quote|profile)\.json$')
+NEWS_EXTENSIONS = tuple(news_format.extension for news_format in NEWS_FORMATS.values())
+
+
+def entry_kind(relative_path):
+    """The kind of cache entry at ``relative_path`` (relative to the cache root), or ``None``.
+
+    Only entries that can be fetched again are kinds; tracked symbols, fetch
+    state, databases and lock files are not.
+    """
+    relative_path = relative_path.replace(os.sep, '/')
+    if PARTITION_PATH.match(relative_path):
+        return 'company_news'
+    if not relative_path.endswith(NEWS_EXTENSIONS):
+        return None
+    if MARKET_NEWS_PATH.match(relative_path):
+        return 'market_news'
+    if COMPANY_NEWS_PATH.match(relative_path):
+        return 'company_news'
+    match = DATA_PATH.match(relative_path)
+    return match.group(2) if match else None
+
+
+def entry_symbol(relative_path):
+    """The symbol a company news, quote or profile entry belongs to, or ``None``."""
+    relative_path = relative_path.replace(os.sep, '/')
+    kind = entry_kind(relative_path)
+    if kind is None or kind == 'market_news':
+        return None
+    match = (
+        PARTITION_PATH.match(relative_path)
+        or COMPANY_NEWS_PATH.match(relative_path)
+        or DATA_PATH.match(relative_path)
+    )
+    return match.group(1) if match else None
+
+
+class CacheManager:
+
+    def __init__(self, cache_dir, max_bytes=None, policy='lru', retention_days=None,
+                 enforce_interval=60.0, compact_interval=24 * 60 * 60, flush_every=100):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r}; expected one of {', '.join(POLICIES)}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.retention_days = retention_days
+        self.enforce_interval = enforce_interval
+        self.compact_interval = compact_interval
+        self.flush_every = flush_every
+
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_enforced = 0.0
+        self._last_compacted = time.monotonic()
+        self.stats_counts = {'evicted_files': 0, 'evicted_bytes': 0, 'compactions': 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, ACCESS_DB_NAME), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS access ("
+            "path TEXT PRIMARY KEY, last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0, "
+            "misses INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.commit()
+
+    def relative(self, path):
+        return os.path.relpath(path, self.cache_dir).replace(os.sep, '/')
+
+    def record(self, path, state):
+        """Note a lookup of the entry at ``path`` that found it ``state``."""
+        relative_path = self.relative(path)
+        with self._lock:
+            last_access, hits, misses = self._pending.get(relative_path, (0.0, 0, 0))
+            if state == MISSING:
+                misses += 1
+            else:
+                hits += 1
+            self._pending[relative_path] = (time.time(), hits, misses)
+            flush = len(self._pending) >= self.flush_every
+        if flush:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            try:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT INTO access (path, last_access, hits, misses) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (path) DO UPDATE SET last_access = MAX(last_access, excluded.last_access), "
+                        "hits = hits + excluded.hits, misses = misses + excluded.misses",
+                        [(path, *counts) for path, counts in pending.items()]
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"Error recording cache access: {e}")
+
+    def entries(self):
+        """Every evictable entry as a dict with its path, kind, size and access counts."""
+        self.flush()
+        with self._lock:
+            access = {row[0]: row[1:] for row in self._db.execute("SELECT path, last_access, hits, misses FROM access")}
+
+        entries = []
+        for directory, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                relative_path = self.relative(path)
+                kind = entry_kind(relative_path)
+                if kind is None:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                last_access, hits, misses = access.get(relative_path, (stat.st_mtime, 0, 0))
+                entries.append({
+                    'path': relative_path,
+                    'kind': kind,
+                    'size': stat.st_size,
+                    'last_access': last_access,
+                    'hits': hits,
+                    'misses': misses
+                })
+        return entries
+
+    def symbol_demand(self):
+        """Recorded lookups (hits and misses) of each symbol's news, quote and profile entries.
+
+        Entries evicted since are forgotten with their counts.
+        """
+        self.flush()
+        with self._lock:
+            rows = self._db.execute("SELECT path, hits + misses FROM access").fetchall()
+
+        demand = {}
+        for relative_path, lookups in rows:
+            symbol = entry_symbol(relative_path)
+            if symbol is not None:
+                demand[symbol] = demand.get(symbol, 0) + lookups
+        return demand
+
+    def maybe_maintain(self):
+        """Enforce the disk budget at most every ``enforce_interval`` seconds, and compact
+        at most every ``compact_interval`` seconds when a retention window is set."""
+        now = time.monotonic()
+        with self._lock:
+            enforce = bool(self.max_bytes) and now - self._last_enforced >= self.enforce_interval
+            compact = bool(self.retention_days) and now - self._last_compacted >= self.compact_interval
+            if enforce:
+                self._last_enforced = now
+            if compact:
+                self._last_compacted = now
+
+        if compact:
+            self.compact()
+        if enforce:
+            self.enforce_budget()
+
+    def enforce_budget(self, max_bytes=None):
+        """Evict entries until they take at most ``LOW_WATER`` of the budget; returns the files deleted."""
+        max_bytes = max_bytes or self.max_bytes
+        if not max_bytes:
+            return 0
+
+        entries = self.entries()
+        total = sum(entry['size'] for entry in entries)
+        if total <= max_bytes:
+            return 0
+
+        if self.policy == 'lfu':
+            entries.sort(key=lambda entry: (entry['hits'], entry['last_access']))
+        else:
+            entries.sort(key=lambda entry: entry['last_access'])
+
+        target = max_bytes * LOW_WATER
+        evicted = []
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(os.path.join(self.cache_dir, entry['path']))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not evict {entry['path']}: {e}")
+                continue
+            total -= entry['size']
+            evicted.append(entry)
+
+        self._forget([entry['path'] for entry in evicted])
+        self._remove_empty_directories()
+        with self._lock:
+            self.stats_counts['evicted_files'] += len(evicted)
+            self.stats_counts['evicted_bytes'] += sum(entry['size'] for entry in evicted)
+        logger.info(f"Evicted {len(evicted)} cache entries ({self.policy}); {total} bytes remain")
+        return len(evicted)
+
+    def compact(self, retention_days=None):
+        """Drop news older than the retention window and rewrite news files compactly.
+
+        Returns a report of the partitions deleted, articles dropped and bytes saved.
+        """
+        retention_days = retention_days or self.retention_days
+        cutoff_day = None
+        cutoff = None
+        if retention_days:
+            cutoff_day = datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+            cutoff = int(datetime(cutoff_day.year, cutoff_day.month, cutoff_day.day, tzinfo=timezone.utc).timestamp())
+
+        report = {'partitions_deleted': 0, 'articles_dropped': 0, 'files_rewritten': 0, 'bytes_saved': 0}
+        deleted = []
+        for directory, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                relative_path = self.relative(path)
+                if filename.startswith('.') and filename.endswith('.tmp'):
+                    # Left behind by a writer that died mid-write, unless it is recent enough to be in use
+                    if self._older_than(path, TEMP_FILE_MAX_AGE):
+                        self._delete(path, report)
+                    continue
+                if entry_kind(relative_path) not in ('company_news', 'market_news'):
+                    continue
+
+                partition = PARTITION_PATH.match(relative_path)
+                if partition and cutoff_day and parse_day(partition.group(2)) < cutoff_day:
+                    self._delete(path, report)
+                    report['partitions_deleted'] += 1
+                    deleted.append(relative_path)
+                    continue
+                self._compact_file(path, cutoff, report)
+
+        self._forget(deleted)
+        self._remove_empty_directories()
+        with self._lock:
+            self.stats_counts['compactions'] += 1
+        logger.info(f"Compacted cache: {report}")
+        return report
+
+    @staticmethod
+    def _older_than(path, seconds):
+        try:
+            return time.time() - os.path.getmtime(path) > seconds
+        except OSError:
+            return False
+
+    def _compact_file(self, path, cutoff, report):
+        size = os.path.getsize(path)
+        if path.endswith('.json'):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable cache file {path}: {e}")
+                return
+            news_items = data.get('news', [])
+            kept = [item for item in news_items if not cutoff or (item.get('datetime') or 0) >= cutoff]
+            data['news'] = kept
+            if 'count' in data:
+                data['count'] = len(kept)
+            write_json_atomic(data, path, indent=None)
+        else:
+            news_format = next(fmt for fmt in NEWS_FORMATS.values() if path.endswith(fmt.extension))
+            news_items = news_format.load(path)
+            kept = [item for item in news_items if not cutoff or (item.get('datetime') or 0) >= cutoff]
+            if len(kept) == len(news_items):
+                return
+            news_format.save(kept, path, allow_empty=True, timestamp=read_cache_timestamp(path))
+
+        report['articles_dropped'] += len(news_items) - len(kept)
+        report['files_rewritten'] += 1
+        report['bytes_saved'] += size - os.path.getsize(path)
+
+    @staticmethod
+    def _delete(path, report):
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+            report['bytes_saved'] += size
+        except OSError as e:
+            logger.warning(f"Could not delete {path}: {e}")
+
+    def _forget(self, relative_paths):
+        if not relative_paths:
+            return
+        with self._lock:
+            try:
+                with self._db:
+                    self._db.executemany("DELETE FROM access WHERE path = ?", [(path,) for path in relative_paths])
+            except sqlite3.Error as e:
+                logger.error(f"Error forgetting evicted cache entries: {e}")
+
+    def _remove_empty_directories(self):
+        news_root = os.path.join(self.cache_dir, 'news')
+        if not os.path.isdir(news_root):
+            return
+        for name in os.listdir(news_root):
+            directory = os.path.join(news_root, name)
+            if os.path.isdir(directory) and not os.listdir(directory):
+                os.rmdir(directory)
+
+    def stats(self, largest=10):
+        """Cache size and hit rates per kind, and the ``largest`` entries."""
+        entries = self.entries()
+        kinds = {}
+        for entry in entries:
+            kind = kinds.setdefault(entry['kind'], {'files': 0, 'bytes': 0, 'hits': 0, 'misses': 0})
+            kind['files'] += 1
+            kind['bytes'] += entry['size']
+            kind['hits'] += entry['hits']
+            kind['misses'] += entry['misses']
+        for kind in kinds.values():
+            lookups = kind['hits'] + kind['misses']
+            kind['hit_rate'] = kind['hits'] / lookups if lookups else 0.0
+
+        hits = sum(kind['hits'] for kind in kinds.values())
+        lookups = hits + sum(kind['misses'] for kind in kinds.values())
+        with self._lock:
+            counts = dict(self.stats_counts)
+        return {
+            'files': len(entries),
+            'bytes': sum(entry['size'] for entry in entries),
+            'max_bytes': self.max_bytes,
+            'policy': self.policy,
+            'retention_days': self.retention_days,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'kinds': kinds,
+            'largest': sorted(entries, key=lambda entry: entry['size'], reverse=True)[:largest],
+            **counts
+        }
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+
+def _format_bytes(size):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if size < 1024 or unit == 'GiB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def print_stats(stats):
+    print(f"Cache size: {_format_bytes(stats['bytes'])} in {stats['files']} entries"
+          + (f" (budget {_format_bytes(stats['max_bytes'])}, {stats['policy']})" if stats['max_bytes'] else ""))
+    print(f"Hit rate: {stats['hit_rate']:.1%}")
+    for name, kind in sorted(stats['kinds'].items()):
+        print(f"  {name:13s} {kind['files']:6d} files {_format_bytes(kind['bytes']):>10s}  "
+              f"hit rate {kind['hit_rate']:6.1%} ({kind['hits']} hits, {kind['misses']} misses)")
+    print("Largest entries:")
+    for entry in stats['largest']:
+        last_access = datetime.fromtimestamp(entry['last_access']).strftime('%Y-%m-%d %H:%M')
+        print(f"  {_format_bytes(entry['size']):>10s}  {entry['path']}  (last used {last_access}, {entry['hits']} hits)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and trim the FinPulse cache directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stats = subparsers.add_parser('stats', help="Report cache size, hit rates and the largest entries")
+    stats.add_argument('cache_dir', nargs='?', default='cache')
+    stats.add_argument('--largest', type=int, default=10, help="Number of largest entries to list")
+    stats.add_argument('--json', action='store_true', help="Print the report as JSON")
+
+    evict = subparsers.add_parser('evict', help="Delete entries until the cache fits a budget")
+    evict.add_argument('cache_dir', nargs='?', default='cache')
+    evict.add_argument('--max-mb', type=float, required=True, help="Disk budget in MiB")
+    evict.add_argument('--policy', choices=POLICIES, default='lru')
+
+    compact = subparsers.add_parser('compact', help="Drop old news and rewrite news files compactly")
+    compact.add_argument('cache_dir', nargs='?', default='cache')
+    compact.add_argument('--retention-days', type=int, help="Keep news of this many days (default: keep all)")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    manager = CacheManager(args.cache_dir, policy=getattr(args, 'policy', 'lru'))
+    try:
+        if args.command == 'stats':
+            report = manager.stats(largest=args.largest)
+            if args.json:
+                print(json.dumps(report, indent=2))
+            else:
+                print_stats(report)
+        elif args.command == 'evict':
+            evicted = manager.enforce_budget(int(args.max_mb * 2 ** 20))
+            print(f"Evicted {evicted} entries ({_format_bytes(manager.stats_counts['evicted_bytes'])})")
+        else:
+            report = manager.compact(args.retention_days)
+            print(f"Deleted {report['partitions_deleted']} partitions, dropped {report['articles_dropped']} articles, "
+                  f"rewrote {report['files_rewritten']} files, saved {_format_bytes(report['bytes_saved'])}")
+    finally:
+        manager.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,362 @@
+"""Columnar binary storage for cached news.
+
+A ``.fpcol`` file holds the same articles as a ``save_news_to_json`` file, laid
+out by column so it can be memory-mapped and read a column at a time::
+
+    magic (8 bytes) | header length (uint32) | JSON header | column buffers
+
+The header starts with the write ``timestamp`` (so ``read_cache_timestamp``
+works unchanged) and lists every column's dtype, offset and length. Numbers are
+stored as little-endian arrays; a string column is an ``int64`` offsets array
+into a UTF-8 blob, so a string is only decoded when it is asked for. Whatever
+does not fit a fixed column (keywords, extracted data, unusual types) is kept
+per article in the JSON ``extra`` column.
+
+Summaries can read ``datetime``, ``sentiment_score`` and ``sentiment_label``
+without touching headlines or summaries::
+
+    python -m utils.columnar_news convert cache/
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import logging
+import argparse
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'FPCOL\x01\r\n'
+HEADER_LENGTH = struct.Struct('<I')
+ALIGNMENT = 64
+EXTENSION = '.fpcol'
+
+INT_COLUMNS = ('id', 'datetime')
+FLOAT_COLUMNS = ('sentiment_score', 'sentiment_positive', 'sentiment_negative', 'sentiment_neutral')
+STRING_COLUMNS = (
+    'headline', 'summary', 'source', 'url', 'related', 'image', 'category', 'date', 'formatted_date', 'sentiment_version'
+)
+# Bit ``i`` of the ``absent`` column is set when the article has no ``OPTIONAL_COLUMNS[i]`` key
+OPTIONAL_COLUMNS = INT_COLUMNS + STRING_COLUMNS
+
+# ``sentiment_label`` codes; NO_SENTIMENT marks articles whose sentiment is not in the columns
+LABELS = ('negative', 'neutral', 'positive')
+NO_SENTIMENT = -1
+MISSING_INT = -1
+
+COLUMN_DTYPES = {
+    **{name: '<i8' for name in INT_COLUMNS},
+    **{name: '<f8' for name in FLOAT_COLUMNS},
+    'sentiment_label': 'i1',
+    'absent': '<u2'
+}
+
+BREAKDOWN_COLUMNS = {'positive': 'sentiment_positive', 'negative': 'sentiment_negative', 'neutral': 'sentiment_neutral'}
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _split_sentiment(sentiment):
+    """Return ``(label_code, score, breakdown, rest)``, or ``None`` if ``sentiment`` has no fixed shape."""
+    if not isinstance(sentiment, dict) or sentiment.get('label') not in LABELS or not _is_number(sentiment.get('score')):
+        return None
+    breakdown = sentiment.get('breakdown')
+    if not isinstance(breakdown, dict) or set(breakdown) != set(BREAKDOWN_COLUMNS):
+        return None
+    if not all(_is_number(value) for value in breakdown.values()):
+        return None
+    rest = {key: value for key, value in sentiment.items() if key not in ('label', 'score', 'breakdown')}
+    return LABELS.index(sentiment['label']), sentiment['score'], breakdown, rest
+
+
+def _serializable(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def build_columns(news_items):
+    """Split ``news_items`` into column arrays and string lists, keyed by column name."""
+    count = len(news_items)
+    columns = {name: np.full(count, MISSING_INT, dtype=COLUMN_DTYPES[name]) for name in INT_COLUMNS}
+    columns.update({name: np.zeros(count, dtype=COLUMN_DTYPES[name]) for name in FLOAT_COLUMNS})
+    columns['sentiment_label'] = np.full(count, NO_SENTIMENT, dtype=COLUMN_DTYPES['sentiment_label'])
+    columns['absent'] = np.zeros(count, dtype=COLUMN_DTYPES['absent'])
+    strings = {name: [''] * count for name in STRING_COLUMNS}
+    strings['extra'] = [''] * count
+
+    for row, item in enumerate(news_items):
+        extra = {}
+        for key, value in item.items():
+            if key in INT_COLUMNS and isinstance(value, int) and not isinstance(value, bool) and 0 <= value < 2 ** 63:
+                columns[key][row] = value
+            elif key in STRING_COLUMNS and isinstance(value, (str, datetime)):
+                strings[key][row] = _serializable(value)
+            elif key == 'sentiment' and _split_sentiment(value) is not None:
+                code, score, breakdown, rest = _split_sentiment(value)
+                columns['sentiment_label'][row] = code
+                columns['sentiment_score'][row] = score
+                for part, name in BREAKDOWN_COLUMNS.items():
+                    columns[name][row] = breakdown[part]
+                if rest:
+                    extra['sentiment'] = rest
+            else:
+                extra[key] = _serializable(value)
+
+        columns['absent'][row] = sum(1 << bit for bit, name in enumerate(OPTIONAL_COLUMNS) if name not in item)
+        if extra:
+            strings['extra'][row] = json.dumps(extra, default=str)
+
+    return columns, strings
+
+
+def _string_table(values):
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype='<i8')
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, b''.join(encoded)
+
+
+def save_news_to_columnar(news_items, filename, allow_empty=False, timestamp=None):
+    """Write ``news_items`` to ``filename`` in the columnar format; mirrors ``save_news_to_json``."""
+    if not news_items and not allow_empty:
+        logger.warning("No news items to save")
+        return False
+
+    try:
+        columns, strings = build_columns(news_items)
+        buffers = []
+        layout = {}
+        for name, array in columns.items():
+            layout[name] = {'dtype': array.dtype.str, 'buffer': len(buffers)}
+            buffers.append(array.tobytes())
+        for name, values in strings.items():
+            offsets, blob = _string_table(values)
+            layout[name] = {'dtype': 'str', 'buffer': len(buffers)}
+            buffers.extend([offsets.tobytes(), blob])
+
+        # Offsets are relative to the end of the padded header, so they can be
+        # computed before the header's own length is known
+        positions = []
+        position = 0
+        for buffer in buffers:
+            positions.append(position)
+            position += -(-len(buffer) // ALIGNMENT) * ALIGNMENT
+        for spec in layout.values():
+            index = spec.pop('buffer')
+            spec['offset'] = positions[index]
+            spec['length'] = len(buffers[index])
+            if spec['dtype'] == 'str':
+                spec['data_offset'] = positions[index + 1]
+                spec['data_length'] = len(buffers[index + 1])
+
+        header = json.dumps({
+            'timestamp': (timestamp or datetime.now()).isoformat(),
+            'count': len(news_items),
+            'columns': layout
+        }).encode('utf-8')
+        prefix = MAGIC + HEADER_LENGTH.pack(len(header)) + header
+        prefix += b'\0' * (-len(prefix) % ALIGNMENT)
+
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(prefix)
+                for buffer in buffers:
+                    f.write(buffer)
+                    f.write(b'\0' * (-len(buffer) % ALIGNMENT))
+            os.replace(tmp_path, filename)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        logger.info(f"Saved {len(news_items)} news items to {filename}")
+        return True
+    except Exception as e:
+        logger.error(f"Error saving news to {filename}: {e}")
+        return False
+
+
+class ColumnarNewsFile:
+    """A memory-mapped ``.fpcol`` file; columns are zero-copy views of the mapping."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a columnar news file")
+        header_start = len(MAGIC) + HEADER_LENGTH.size
+        (header_length,) = HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        header = json.loads(bytes(self._map[header_start:header_start + header_length]))
+
+        self.timestamp = header['timestamp']
+        self.count = header['count']
+        self._columns = header['columns']
+        self._data_start = header_start + header_length + (-(header_start + header_length) % ALIGNMENT)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            try:
+                self._map.close()
+            except BufferError:
+                # Column views still reference the mapping; it closes when they are collected
+                pass
+
+    @property
+    def column_names(self):
+        return list(self._columns)
+
+    def column(self, name):
+        """A numeric column as a read-only array backed by the file mapping."""
+        spec = self._columns[name]
+        if spec['dtype'] == 'str':
+            raise TypeError(f"{name} is a string column; use strings()")
+        dtype = np.dtype(spec['dtype'])
+        return np.frombuffer(self._map, dtype=dtype, count=spec['length'] // dtype.itemsize,
+                             offset=self._data_start + spec['offset'])
+
+    def strings(self, name):
+        """Decode a string column into a list."""
+        spec = self._columns[name]
+        bounds = np.frombuffer(self._map, dtype='<i8', count=self.count + 1,
+                               offset=self._data_start + spec['offset']).tolist()
+        start = self._data_start + spec['data_offset']
+        blob = self._map[start:start + spec['data_length']]
+        if blob.isascii():
+            # Byte offsets are character offsets, so one decode serves every row
+            text = blob.decode('ascii')
+            return [text[begin:end] for begin, end in zip(bounds, bounds[1:])]
+        return [blob[begin:end].decode('utf-8') for begin, end in zip(bounds, bounds[1:])]
+
+    def records(self):
+        """Rebuild the articles as ``load_news_from_json`` returns them."""
+        numbers = {name: self.column(name).tolist() for name in INT_COLUMNS + FLOAT_COLUMNS}
+        labels = self.column('sentiment_label').tolist()
+        absent = self.column('absent').tolist()
+        fields = [numbers[name] for name in INT_COLUMNS] + [self.strings(name) for name in STRING_COLUMNS]
+        extras = json.loads('[' + ','.join(extra or '{}' for extra in self.strings('extra')) + ']')
+
+        news_items = []
+        for row, values in enumerate(zip(*fields)):
+            item = dict(zip(OPTIONAL_COLUMNS, values))
+            extra = extras[row]
+
+            if labels[row] != NO_SENTIMENT:
+                item['sentiment'] = {
+                    'score': numbers['sentiment_score'][row],
+                    'label': LABELS[labels[row]],
+                    'breakdown': {part: numbers[name][row] for part, name in BREAKDOWN_COLUMNS.items()},
+                    **extra.pop('sentiment', {})
+                }
+            if absent[row]:
+                for bit, name in enumerate(OPTIONAL_COLUMNS):
+                    if absent[row] >> bit & 1:
+                        del item[name]
+            if extra:
+                item.update(extra)
+
+            if isinstance(item.get('formatted_date'), str):
+                try:
+                    item['formatted_date'] = datetime.fromisoformat(item['formatted_date'])
+                except ValueError:
+                    pass
+            news_items.append(item)
+        return news_items
+
+
+def load_news_from_columnar(filename):
+    try:
+        with ColumnarNewsFile(filename) as news_file:
+            news_items = news_file.records()
+        logger.info(f"Loaded {len(news_items)} news items from {filename}")
+        return news_items
+    except Exception as e:
+        logger.error(f"Error loading news from {filename}: {e}")
+        return []
+
+
+def read_columns(filename, names):
+    """Copy the numeric columns ``names`` out of a columnar file; ``None`` if it cannot be read."""
+    try:
+        with ColumnarNewsFile(filename) as news_file:
+            return {name: np.array(news_file.column(name)) for name in names}
+    except Exception as e:
+        logger.error(f"Error reading columns from {filename}: {e}")
+        return None
+
+
+def convert_directory(root, remove=False):
+    """Convert every news JSON file under ``root`` to the columnar format.
+
+    Only files in the ``save_news_to_json`` layout are converted; quotes,
+    profiles and other JSON files are left alone. Returns ``(converted, bytes_before, bytes_after)``.
+    """
+    converted = 0
+    bytes_before = bytes_after = 0
+    for directory, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(data, dict) or not isinstance(data.get('news'), list):
+                continue
+
+            timestamp = None
+            if data.get('timestamp'):
+                try:
+                    timestamp = datetime.fromisoformat(data['timestamp'])
+                except ValueError:
+                    pass
+            target = path[:-len('.json')] + EXTENSION
+            if not save_news_to_columnar(data['news'], target, allow_empty=True, timestamp=timestamp):
+                continue
+
+            converted += 1
+            bytes_before += os.path.getsize(path)
+            bytes_after += os.path.getsize(target)
+            if remove:
+                os.unlink(path)
+    return converted, bytes_before, bytes_after
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert cached news JSON files to the columnar format")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    convert = subparsers.add_parser('convert', help="Write a .fpcol file next to every news .json file")
+    convert.add_argument('root', nargs='?', default='cache', help="Cache directory (default: cache)")
+    convert.add_argument('--remove', action='store_true', help="Delete the JSON files once converted")
+    args = parser.parse_args(argv)
+
+    converted, bytes_before, bytes_after = convert_directory(args.root, remove=args.remove)
+    print(f"Converted {converted} news files: {bytes_before / 1024:.0f} KiB of JSON -> {bytes_after / 1024:.0f} KiB columnar")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
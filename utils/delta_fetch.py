@@ -0,0 +1,139 @@
+"""Incremental (delta) fetching support for cached Finnhub news.
+
+``FetchState`` records a high-water mark (newest ``datetime`` and ``id``) per
+cached feed, so a refresh only asks Finnhub for the gap since then, and
+``merge_news`` folds the new articles into the cached ones. ``DeltaStats``
+reports what each refresh cycle cost and saved.
+"""
+
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+from utils.finnhub_utils import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+def article_key(item):
+    """Identify an article by its Finnhub id, or by url and time when it has none."""
+    return item.get('id') or (item.get('url'), item.get('datetime'))
+
+
+def newest_mark(news_items):
+    """Return the high-water mark ``{'datetime', 'id'}`` of ``news_items``."""
+    newest_datetime = 0
+    newest_id = 0
+    for item in news_items:
+        try:
+            newest_datetime = max(newest_datetime, int(item.get('datetime') or 0))
+            newest_id = max(newest_id, int(item.get('id') or 0))
+        except (ValueError, TypeError):
+            continue
+    return {'datetime': newest_datetime, 'id': newest_id}
+
+
+def merge_news(cached_items, new_items, limit=None):
+    """Merge ``new_items`` into ``cached_items``, dropping ids already present.
+
+    Returns ``(merged, added)``: the merged list newest first (cut to ``limit``)
+    and the new articles that were not cached yet.
+    """
+    seen = {article_key(item) for item in cached_items}
+    added = []
+    for item in new_items:
+        key = article_key(item)
+        if key not in seen:
+            seen.add(key)
+            added.append(item)
+
+    merged = sorted(added + list(cached_items), key=lambda item: item.get('datetime') or 0, reverse=True)
+    if limit is not None:
+        merged = merged[:limit]
+    return merged, added
+
+
+class FetchState:
+    """High-water marks per feed, kept in a small JSON file next to the cache."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._marks = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable fetch state {self.path}: {e}")
+            return {}
+
+    def get(self, feed):
+        with self._lock:
+            mark = self._marks.get(feed)
+            return dict(mark) if mark else None
+
+    def update(self, feed, news_items):
+        """Advance the mark of ``feed`` to the newest of ``news_items``."""
+        mark = newest_mark(news_items)
+        with self._lock:
+            previous = self._marks.get(feed, {})
+            self._marks[feed] = {
+                'datetime': max(mark['datetime'], previous.get('datetime', 0)),
+                'id': max(mark['id'], previous.get('id', 0)),
+                'fetched_at': datetime.now().isoformat()
+            }
+            self._write()
+
+    def _write(self):
+        try:
+            write_json_atomic(self._marks, self.path)
+        except OSError as e:
+            logger.error(f"Error saving fetch state {self.path}: {e}")
+
+
+class DeltaStats:
+    """Running totals and the most recent per-cycle reports of delta refreshes."""
+
+    def __init__(self, history=50):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=history)
+        self.totals = {
+            'refreshes': 0,
+            'api_calls': 0,
+            'bytes_received': 0,
+            'bytes_saved': 0,
+            'new_articles': 0,
+            'reused_articles': 0
+        }
+
+    def record(self, feed, api_calls, bytes_received, bytes_saved, new_articles, reused_articles):
+        report = {
+            'feed': feed,
+            'api_calls': api_calls,
+            'bytes_received': bytes_received,
+            'bytes_saved': bytes_saved,
+            'new_articles': new_articles,
+            'reused_articles': reused_articles,
+            'at': datetime.now().isoformat()
+        }
+        with self._lock:
+            self._recent.append(report)
+            self.totals['refreshes'] += 1
+            for field in ('api_calls', 'bytes_received', 'bytes_saved', 'new_articles', 'reused_articles'):
+                self.totals[field] += report[field]
+
+        logger.info(
+            f"Delta refresh of {feed}: {new_articles} new articles, {api_calls} API call(s), "
+            f"{bytes_received} bytes received, ~{bytes_saved} bytes saved"
+        )
+        return report
+
+    def stats(self):
+        with self._lock:
+            return {**self.totals, 'recent': list(self._recent)}
@@ -0,0 +1,557 @@
+"""Local stand-in for the Finnhub API, for load tests and offline benchmarks.
+
+``FinnhubStandIn`` is a threaded HTTP/1.1 server answering the endpoints
+FinPulse uses (``company-news``, ``news``, ``quote``, ``stock/profile2``,
+``search``, ``stock/earnings``, ``stock/candle`` and ``news-sentiment``) under
+``/api/v1``. News comes from the articles in ``cache/*.json``: every symbol and
+day gets the same ``articles_per_day`` articles on every request, so a date
+range always returns the same ids whether it is asked for whole or in parts.
+Quotes, profiles, earnings, candles and sentiment are generated from the symbol
+and are just as repeatable.
+
+Like Finnhub it checks for a token, returns ``X-Ratelimit-*`` headers and
+answers 429 once a token's calls of the current minute exceed ``rate_limit``.
+For load tests it can add latency, fail a share of requests with 5xx, throttle
+them with 429 or stall them (``error_rate``, ``throttle_rate``, ``slow_rate``).
+
+With ``fixtures_dir`` it first serves responses recorded there. In record mode
+it forwards every request to ``upstream`` (the real API, with the caller's
+token) and writes the response to ``fixtures_dir`` before returning it, so a
+session against Finnhub can later be replayed offline.
+
+Point the clients at it with ``FINNHUB_BASE_URL``:
+
+    python -m utils.finnhub_standin --port 8765 --latency 0.05 --rate-limit 60
+    FINNHUB_BASE_URL=http://127.0.0.1:8765/api/v1 python finpulse_app.py --symbol AAPL
+
+    python -m utils.finnhub_standin --port 8765 --record --fixtures fixtures/
+    python -m utils.finnhub_standin --port 8765 --fixtures fixtures/
+"""
+
+import os
+import re
+import ssl
+import sys
+import glob
+import gzip
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlparse, parse_qsl
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+from utils.finnhub_utils import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/v1/'
+DEFAULT_UPSTREAM = "https://finnhub.io/api/v1"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
+
+# Fields of a raw Finnhub article; cached ones carry formatting added by FinPulse
+ARTICLE_FIELDS = ('category', 'headline', 'image', 'source', 'summary', 'url')
+
+COMPANIES = {
+    'AAPL': ('Apple Inc', 'Technology', 'NASDAQ NMS - GLOBAL MARKET'),
+    'MSFT': ('Microsoft Corp', 'Technology', 'NASDAQ NMS - GLOBAL MARKET'),
+    'GOOGL': ('Alphabet Inc', 'Media', 'NASDAQ NMS - GLOBAL MARKET'),
+    'AMZN': ('Amazon.com Inc', 'Retail', 'NASDAQ NMS - GLOBAL MARKET'),
+    'META': ('Meta Platforms Inc', 'Media', 'NASDAQ NMS - GLOBAL MARKET'),
+    'NVDA': ('NVIDIA Corp', 'Semiconductors', 'NASDAQ NMS - GLOBAL MARKET'),
+    'TSLA': ('Tesla Inc', 'Automobiles', 'NASDAQ NMS - GLOBAL MARKET'),
+    'NFLX': ('Netflix Inc', 'Media', 'NASDAQ NMS - GLOBAL MARKET'),
+    'JPM': ('JPMorgan Chase & Co', 'Banking', 'NEW YORK STOCK EXCHANGE, INC.')
+}
+INDUSTRIES = ('Technology', 'Banking', 'Retail', 'Media', 'Pharmaceuticals', 'Energy', 'Semiconductors')
+
+RESOLUTION_SECONDS = {
+    '1': 60, '5': 300, '15': 900, '30': 1800, '60': 3600,
+    'D': 86400, 'W': 7 * 86400, 'M': 30 * 86400
+}
+MAX_CANDLES = 5000
+
+
+def _seeded(*parts):
+    return random.Random(':'.join(str(part) for part in parts))
+
+
+def _stable_id(*parts, bits=31):
+    digest = hashlib.sha1(':'.join(str(part) for part in parts).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % (1 << bits)
+
+
+class StandInData:
+    """The payloads the stand-in serves, built from cached articles."""
+
+    def __init__(self, company_news=None, market_news=None, articles_per_day=10, max_results=None):
+        self.company_news = company_news or {}
+        self.market_news = market_news or {}
+        self.corpus = [article for articles in self.company_news.values() for article in articles]
+        self.corpus += [article for articles in self.market_news.values() for article in articles]
+        if not self.corpus:
+            self.corpus = [{field: '' for field in ARTICLE_FIELDS}]
+        self.articles_per_day = articles_per_day
+        self.max_results = max_results
+
+    @classmethod
+    def from_cache(cls, cache_dir=CACHE_DIR, **kwargs):
+        """Articles of ``<SYMBOL>_news.json`` and ``market_news_<category>.json`` in ``cache_dir``."""
+        company_news, market_news = {}, {}
+        for path in sorted(glob.glob(os.path.join(cache_dir, '*.json'))):
+            name = os.path.basename(path)[:-len('.json')]
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(payload, dict) or not isinstance(payload.get('news'), list):
+                continue
+
+            articles = [
+                {field: article.get(field, '') for field in ARTICLE_FIELDS + ('id', 'datetime', 'related')}
+                for article in payload['news'] if isinstance(article, dict)
+            ]
+            if name.startswith('market_news_'):
+                market_news[name[len('market_news_'):]] = articles
+            elif name.endswith('_news'):
+                company_news[name[:-len('_news')].upper()] = articles
+        return cls(company_news, market_news, **kwargs)
+
+    def get_company_news(self, symbol, from_date, to_date):
+        """``articles_per_day`` articles per day of the range, newest first, the same on every call."""
+        symbol = symbol.upper()
+        pool = self.company_news.get(symbol) or self.corpus
+        now = datetime.now(timezone.utc)
+        first = date.fromisoformat(from_date)
+        last = min(date.fromisoformat(to_date), now.date())
+
+        news = []
+        day = last
+        while day >= first:
+            rng = _seeded(symbol, day)
+            start = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+            # Nothing is published later than now
+            span = min(86400, int(now.timestamp()) - start + 1)
+            offsets = sorted((rng.randrange(86400) % span for _ in range(self.articles_per_day)), reverse=True)
+            for index, offset in enumerate(offsets):
+                article = pool[rng.randrange(len(pool))]
+                news.append({
+                    **{field: article.get(field, '') for field in ARTICLE_FIELDS},
+                    'category': 'company',
+                    'id': _stable_id(symbol, day, index),
+                    'datetime': start + offset,
+                    'related': symbol
+                })
+            day -= timedelta(days=1)
+        return news[:self.max_results] if self.max_results else news
+
+    def get_market_news(self, category, min_id=None):
+        articles = self.market_news.get(category, [])
+        news = []
+        for article in articles:
+            article_id = article.get('id') or _stable_id(category, article.get('url', ''))
+            if min_id and article_id <= min_id:
+                continue
+            news.append({**article, 'id': article_id, 'category': article.get('category') or category})
+        return news
+
+    @staticmethod
+    def _company(symbol):
+        name, industry, exchange = COMPANIES.get(symbol, (None, None, 'NASDAQ NMS - GLOBAL MARKET'))
+        rng = _seeded('profile', symbol)
+        return name or f"{symbol.title()} Holdings Inc", industry or rng.choice(INDUSTRIES), exchange
+
+    @staticmethod
+    def _base_price(symbol):
+        return round(_seeded('price', symbol).uniform(20, 600), 2)
+
+    def get_quote(self, symbol):
+        symbol = symbol.upper()
+        base = self._base_price(symbol)
+        today = datetime.now(timezone.utc).date()
+        rng = _seeded('quote', symbol, today)
+        previous = round(base * (1 + rng.uniform(-0.05, 0.05)), 2)
+        # Moves a little every minute, as a live quote would
+        minute = int(time.time() // 60)
+        current = round(previous * (1 + _seeded('tick', symbol, minute).uniform(-0.02, 0.02)), 2)
+        opened = round(previous * (1 + rng.uniform(-0.01, 0.01)), 2)
+        return {
+            'c': current,
+            'd': round(current - previous, 2),
+            'dp': round((current - previous) / previous * 100, 4),
+            'h': round(max(current, opened) * (1 + rng.uniform(0, 0.01)), 2),
+            'l': round(min(current, opened) * (1 - rng.uniform(0, 0.01)), 2),
+            'o': opened,
+            'pc': previous,
+            't': minute * 60
+        }
+
+    def get_profile(self, symbol):
+        symbol = symbol.upper()
+        name, industry, exchange = self._company(symbol)
+        rng = _seeded('profile', symbol)
+        shares = round(rng.uniform(100, 16000), 2)
+        return {
+            'country': 'US',
+            'currency': 'USD',
+            'exchange': exchange,
+            'finnhubIndustry': industry,
+            'ipo': f"{rng.randrange(1980, 2020)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            'logo': f"https://static.finnhub.io/logo/{symbol.lower()}.png",
+            'marketCapitalization': round(shares * self._base_price(symbol), 2),
+            'name': name,
+            'phone': '1-555-0100',
+            'shareOutstanding': shares,
+            'ticker': symbol,
+            'weburl': f"https://www.{symbol.lower()}.example.com/"
+        }
+
+    def search(self, query):
+        query = query.strip().upper()
+        symbols = sorted(set(COMPANIES) | set(self.company_news))
+        matches = [
+            symbol for symbol in symbols
+            if query and (query in symbol or query in self._company(symbol)[0].upper())
+        ]
+        return {
+            'count': len(matches),
+            'result': [
+                {'description': self._company(symbol)[0].upper(), 'displaySymbol': symbol,
+                 'symbol': symbol, 'type': 'Common Stock'}
+                for symbol in matches
+            ]
+        }
+
+    def get_earnings(self, symbol):
+        symbol = symbol.upper()
+        today = datetime.now(timezone.utc).date()
+        earnings = []
+        year, quarter = today.year, (today.month - 1) // 3
+        for _ in range(4):
+            if quarter == 0:
+                year, quarter = year - 1, 4
+            rng = _seeded('earnings', symbol, year, quarter)
+            estimate = round(rng.uniform(0.2, 5), 4)
+            actual = round(estimate * (1 + rng.uniform(-0.15, 0.2)), 2)
+            period_end = date(year, quarter * 3, 30 if quarter in (2, 3) else 31)
+            earnings.append({
+                'actual': actual,
+                'estimate': estimate,
+                'period': period_end.isoformat(),
+                'quarter': quarter,
+                'surprise': round(actual - estimate, 4),
+                'surprisePercent': round((actual - estimate) / estimate * 100, 4),
+                'symbol': symbol,
+                'year': year
+            })
+            quarter -= 1
+        return earnings
+
+    def get_candles(self, symbol, resolution, from_time, to_time):
+        step = RESOLUTION_SECONDS.get(str(resolution))
+        if step is None or to_time < from_time:
+            return {'s': 'no_data'}
+        first = from_time - from_time % step
+        stamps = list(range(first, to_time + 1, step))[-MAX_CANDLES:]
+        if not stamps:
+            return {'s': 'no_data'}
+
+        symbol = symbol.upper()
+        candles = {'c': [], 'h': [], 'l': [], 'o': [], 't': [], 'v': []}
+        for stamp in stamps:
+            # Every bar derives from its own time, so overlapping ranges agree
+            rng = _seeded('candle', symbol, resolution, stamp)
+            drift = _seeded('drift', symbol, stamp // (step * 50)).uniform(-0.2, 0.2)
+            opened = round(self._base_price(symbol) * (1 + drift + rng.uniform(-0.01, 0.01)), 2)
+            closed = round(opened * (1 + rng.uniform(-0.02, 0.02)), 2)
+            candles['o'].append(opened)
+            candles['c'].append(closed)
+            candles['h'].append(round(max(opened, closed) * (1 + rng.uniform(0, 0.01)), 2))
+            candles['l'].append(round(min(opened, closed) * (1 - rng.uniform(0, 0.01)), 2))
+            candles['t'].append(stamp)
+            candles['v'].append(rng.randrange(10000, 5000000))
+        return {**candles, 's': 'ok'}
+
+    def get_news_sentiment(self, symbol):
+        symbol = symbol.upper()
+        rng = _seeded('sentiment', symbol, datetime.now(timezone.utc).date())
+        bullish = round(rng.uniform(0.3, 0.9), 4)
+        articles = self.articles_per_day * 7
+        return {
+            'buzz': {'articlesInLastWeek': articles, 'buzz': round(rng.uniform(0.5, 1.5), 4),
+                     'weeklyAverage': round(articles / rng.uniform(0.7, 1.3), 2)},
+            'companyNewsScore': round(rng.uniform(0.3, 0.9), 4),
+            'sectorAverageBullishPercent': round(rng.uniform(0.4, 0.7), 4),
+            'sectorAverageNewsScore': round(rng.uniform(0.4, 0.6), 4),
+            'sentiment': {'bearishPercent': round(1 - bullish, 4), 'bullishPercent': bullish},
+            'symbol': symbol
+        }
+
+
+def fixture_path(fixtures_dir, endpoint, params):
+    """Where the response to ``endpoint`` with ``params`` (minus the token) is recorded."""
+    params = sorted((name, value) for name, value in params.items() if name != 'token')
+    digest = hashlib.sha1(json.dumps([endpoint, params]).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(fixtures_dir, endpoint.replace('/', '_'), f"{digest}.json")
+
+
+class FinnhubStandIn(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, data=None, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, rate_limit=None,
+                 error_rate=0.0, throttle_rate=0.0, slow_rate=0.0, slow_seconds=2.0, fixtures_dir=None,
+                 record=False, upstream=DEFAULT_UPSTREAM, certfile=None, keyfile=None, compress=True, seed=None):
+        super().__init__((host, port), StandInHandler)
+        self.data = data or StandInData.from_cache()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self.fixtures_dir = fixtures_dir
+        self.record = record
+        self.upstream = upstream.rstrip('/')
+        self.compress = compress
+        self.random = random.Random(seed)
+        self.scheme = 'http'
+        self._lock = threading.Lock()
+        self._windows = {}
+        self.stats_counts = {'connections': 0, 'requests': 0, 'errors': 0, 'throttled': 0, 'slow': 0,
+                             'fixtures_served': 0, 'recorded': 0}
+        self.endpoint_counts = {}
+
+        if record and not fixtures_dir:
+            raise ValueError("Record mode needs a fixtures directory")
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True, do_handshake_on_connect=False)
+            self.scheme = 'https'
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"{self.scheme}://{host}:{port}/api/v1"
+
+    def process_request(self, request, client_address):
+        self.count('connections')
+        super().process_request(request, client_address)
+
+    def finish_request(self, request, client_address):
+        # TLS handshakes run on the handler thread, not the accepting one
+        if isinstance(request, ssl.SSLSocket):
+            request.do_handshake()
+        super().finish_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on stalled responses once their read timeout passes
+        logger.debug(f"Connection from {client_address} ended with an error", exc_info=True)
+
+    def count(self, name, endpoint=None):
+        with self._lock:
+            self.stats_counts[name] += 1
+            if endpoint is not None:
+                self.endpoint_counts[endpoint] = self.endpoint_counts.get(endpoint, 0) + 1
+
+    def draw(self, rate):
+        with self._lock:
+            return rate > 0 and self.random.random() < rate
+
+    def take_call(self, token):
+        """Count a call of ``token`` in the current minute; returns ``(allowed, remaining, reset)``."""
+        window = int(time.time() // 60)
+        reset = (window + 1) * 60
+        if not self.rate_limit:
+            return True, None, reset
+        with self._lock:
+            start, calls = self._windows.get(token, (window, 0))
+            if start != window:
+                calls = 0
+            calls += 1
+            self._windows[token] = (window, calls)
+        return calls <= self.rate_limit, max(0, self.rate_limit - calls), reset
+
+    def stats(self):
+        with self._lock:
+            return {**self.stats_counts, 'endpoints': dict(self.endpoint_counts)}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = re.sub('/+', '/', url.path)
+        params = dict(parse_qsl(url.query))
+        token = params.get('token') or self.headers.get('X-Finnhub-Token')
+        server = self.server
+
+        if not path.startswith(API_PREFIX):
+            return self._send_json(404, {'error': 'Not found'})
+        endpoint = path[len(API_PREFIX):].strip('/')
+        server.count('requests', endpoint)
+        if not token:
+            return self._send_json(401, {'error': 'Please use an API key.'})
+
+        delay = server.latency + (server.random.uniform(0, server.jitter) if server.jitter else 0.0)
+        if server.draw(server.slow_rate):
+            server.count('slow')
+            delay += server.slow_seconds
+        if delay > 0:
+            time.sleep(delay)
+
+        allowed, remaining, reset = server.take_call(token)
+        headers = {}
+        if remaining is not None:
+            headers = {'X-Ratelimit-Limit': str(server.rate_limit), 'X-Ratelimit-Remaining': str(remaining),
+                       'X-Ratelimit-Reset': str(reset)}
+        if not allowed:
+            server.count('throttled')
+            headers.update({'X-Ratelimit-Remaining': '0', 'X-Ratelimit-Reset': str(reset)})
+            return self._send_json(429, {'error': 'API limit reached. Please try again later.'}, headers)
+        if server.draw(server.throttle_rate):
+            # A short burst limit rather than the minute's budget running out
+            server.count('throttled')
+            return self._send_json(429, {'error': 'API limit reached. Please try again later.'},
+                                   {**headers, 'Retry-After': '1'})
+        if server.draw(server.error_rate):
+            server.count('errors')
+            status = server.random.choice((500, 502, 503))
+            return self._send_json(status, {'error': 'Injected server error'}, headers)
+
+        if server.fixtures_dir:
+            path = fixture_path(server.fixtures_dir, endpoint, params)
+            if server.record:
+                return self._record(endpoint, params, token, path, headers)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    fixture = json.load(f)
+                server.count('fixtures_served')
+                return self._send_json(fixture['status'], fixture['body'], headers)
+
+        try:
+            status, body = self._generate(endpoint, params)
+        except (KeyError, ValueError) as e:
+            status, body = 422, {'error': f"Invalid parameters: {e}"}
+        return self._send_json(status, body, headers)
+
+    def _generate(self, endpoint, params):
+        data = self.server.data
+        if endpoint == 'company-news':
+            return 200, data.get_company_news(params['symbol'], params['from'], params['to'])
+        if endpoint == 'news':
+            min_id = int(params['minId']) if params.get('minId') else None
+            return 200, data.get_market_news(params.get('category', 'general'), min_id)
+        if endpoint == 'quote':
+            return 200, data.get_quote(params['symbol'])
+        if endpoint == 'stock/profile2':
+            return 200, data.get_profile(params['symbol'])
+        if endpoint == 'search':
+            return 200, data.search(params['q'])
+        if endpoint == 'stock/earnings':
+            return 200, data.get_earnings(params['symbol'])
+        if endpoint == 'stock/candle':
+            return 200, data.get_candles(
+                params['symbol'], params['resolution'], int(params['from']), int(params['to'])
+            )
+        if endpoint == 'news-sentiment':
+            return 200, data.get_news_sentiment(params['symbol'])
+        return 404, {'error': f"Unknown endpoint {endpoint}"}
+
+    def _record(self, endpoint, params, token, path, headers):
+        try:
+            response = requests.get(
+                f"{self.server.upstream}/{endpoint}", params=params,
+                headers={'X-Finnhub-Token': token}, timeout=(3.05, 30)
+            )
+            body = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return self._send_json(502, {'error': f"Upstream request failed: {e}"}, headers)
+
+        if response.status_code == 200:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fixture = {'endpoint': endpoint, 'params': {k: v for k, v in params.items() if k != 'token'},
+                       'status': response.status_code, 'body': body}
+            write_json_atomic(fixture, path, indent=None)
+            self.server.count('recorded')
+        # Pass the real limit on, so callers pace themselves against it
+        headers = {name: value for name, value in response.headers.items() if name.lower().startswith('x-ratelimit')}
+        return self._send_json(response.status_code, body, headers)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        encoding = None
+        if self.server.compress and len(body) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=5)
+            encoding = 'gzip'
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Finnhub API")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Directory of the cached news to serve")
+    parser.add_argument("--articles-per-day", type=int, default=10, help="Company news articles per symbol and day")
+    parser.add_argument("--max-results", type=int, help="Most articles one company-news response returns")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many more seconds, at random")
+    parser.add_argument("--rate-limit", type=int, help="Calls per minute and token before answering 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failed with a 5xx")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Share of requests stalled")
+    parser.add_argument("--slow-seconds", type=float, default=2.0, help="How long a stalled request takes")
+    parser.add_argument("--fixtures", help="Serve responses recorded in this directory when present")
+    parser.add_argument("--record", action='store_true', help="Forward requests upstream and record them")
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM, help="API to record from")
+    parser.add_argument("--certfile", help="Serve HTTPS with this certificate")
+    parser.add_argument("--keyfile", help="Private key of the certificate")
+    parser.add_argument("--seed", type=int, help="Seed of the injected faults")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    data = StandInData.from_cache(args.cache_dir, articles_per_day=args.articles_per_day, max_results=args.max_results)
+    server = FinnhubStandIn(
+        data, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate, slow_rate=args.slow_rate,
+        slow_seconds=args.slow_seconds, fixtures_dir=args.fixtures, record=args.record, upstream=args.upstream,
+        certfile=args.certfile, keyfile=args.keyfile, seed=args.seed
+    )
+    mode = 'recording to ' + args.fixtures if args.record else 'replaying ' + args.fixtures if args.fixtures else 'generated'
+    print(f"Finnhub stand-in at {server.base_url} ({mode}, {len(data.company_news)} symbols and "
+          f"{len(data.market_news)} news categories cached)")
+    print(f"Use it with FINNHUB_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
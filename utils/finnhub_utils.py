@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+import tempfile
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -51,6 +52,11 @@ def format_news_data(news_items):
     return formatted_news
 
 def filter_news_by_keywords(news_items, keywords):
+    """Keep the articles whose headline or summary contains any of ``keywords``.
+    
+    This scans a list already in memory. To filter stored news, query
+    ``ArticleRepository.search(keywords=...)``, which uses the full-text index.
+    """
     if not news_items or not keywords:
         return news_items
     
@@ -84,8 +90,25 @@ def group_news_by_symbol(news_items):
     
     return grouped_news
 
-def save_news_to_json(news_items, filename):
-    if not news_items:
+def write_json_atomic(payload, filename, indent=2):
+    """Write ``payload`` to a temporary file next to ``filename``, then rename it into place.
+    
+    Readers, including other processes, see either the old file or the new one,
+    never a partly written file. ``indent=None`` writes the most compact JSON.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=indent, separators=(',', ':') if indent is None else None)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def save_news_to_json(news_items, filename, allow_empty=False, timestamp=None):
+    if not news_items and not allow_empty:
         logger.warning("No news items to save")
         return False
     
@@ -98,12 +121,11 @@ def save_news_to_json(news_items, filename):
                 serializable_item['formatted_date'] = serializable_item['formatted_date'].isoformat()
             serializable_news.append(serializable_item)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'count': len(serializable_news),
-                'timestamp': datetime.now().isoformat(),
-                'news': serializable_news
-            }, f, indent=2)
+        write_json_atomic({
+            'count': len(serializable_news),
+            'timestamp': (timestamp or datetime.now()).isoformat(),
+            'news': serializable_news
+        }, filename)
         
         logger.info(f"Saved {len(news_items)} news items to {filename}")
         return True
@@ -126,4 +148,25 @@ def load_news_from_json(filename):
         return data.get('news', [])
     except Exception as e:
         logger.error(f"Error loading news from {filename}: {e}")
-        return [] 
\ No newline at end of file
+        return []
+
+def save_data_to_json(data, filename):
+    """Save a non-news API payload (quote, profile) with the same timestamp header as news files."""
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        write_json_atomic({
+            'timestamp': datetime.now().isoformat(),
+            'data': data
+        }, filename)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving data to {filename}: {e}")
+        return False
+
+def load_data_from_json(filename):
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f).get('data')
+    except Exception as e:
+        logger.error(f"Error loading data from {filename}: {e}")
+        return None
@@ -0,0 +1,333 @@
+"""Pooled HTTP transport shared by the Finnhub clients.
+
+Every session handed out by an ``HttpTransport`` is mounted on one
+``HTTPAdapter``, so ``FinnhubClient``, ``FinnhubService`` (through the session of
+its ``finnhub.Client``) and any ad-hoc request reuse the same keep-alive
+connections instead of opening a TCP and TLS connection per call. Sessions ask
+for compressed responses, which urllib3 decodes.
+
+Each request gets the connect and read timeout of its endpoint
+(``ENDPOINT_TIMEOUTS``), and is measured: time spent opening a connection (zero
+when a pooled one was reused), time to the first response byte after that,
+total time, and bytes on the wire and after decompression. ``stats()`` reports
+them per endpoint with p50/p99 latency; the counters are updated under a lock
+since sessions are used from many threads at once.
+
+Retries with backoff, the per-endpoint circuit breakers and the stale fallback
+(see ``utils.resilience``) also live here, so both clients get them.
+"""
+
+import os
+import time
+import logging
+import weakref
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from utils.resilience import (
+    HALF_OPEN, STALE_HEADER, CircuitOpenError, Resilience, RetryPolicy, payload_key, retry_reason, wait_hint
+)
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) seconds; news ranges can take a while to assemble server-side
+DEFAULT_TIMEOUT = (3.05, 15)
+ENDPOINT_TIMEOUTS = {
+    'quote': (3.05, 5),
+    'stock/profile2': (3.05, 10),
+    'search': (3.05, 10),
+    'stock/earnings': (3.05, 10),
+    'news': (3.05, 20),
+    'company-news': (3.05, 30),
+    'stock/candle': (3.05, 20),
+    'news-sentiment': (3.05, 15)
+}
+API_PREFIX = '/api/v1/'
+
+_timing = threading.local()
+_transports = weakref.WeakSet()
+
+
+class _TimedConnectMixin:
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _timing.connect_seconds = getattr(_timing, 'connect_seconds', 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose connections report how long they took to open."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+class TransportSession(requests.Session):
+    """A session on the shared pool that applies endpoint timeouts and records metrics.
+
+    Failed calls are retried and circuit-broken as set by the transport's
+    ``Resilience``; ``before_retry`` (e.g. a rate limiter's ``acquire``) runs
+    before every retry. When an endpoint cannot be reached, the last successful
+    response to the same request is returned with ``response.stale`` set.
+    """
+
+    def __init__(self, transport):
+        super().__init__()
+        self.transport = transport
+        self.before_retry = None
+        self.mount('http://', transport.adapter)
+        self.mount('https://', transport.adapter)
+        self.headers.update(make_headers(accept_encoding=True))
+
+    def send(self, request, **kwargs):
+        endpoint = endpoint_name(request.url)
+        resilience = self.transport.resilience
+        policy = resilience.policy
+        breaker = resilience.breaker(endpoint)
+        key = payload_key(request.method, request.url)
+        _timing.stale = False
+
+        permit = breaker.allow()
+        if not permit:
+            resilience.count(endpoint, 'short_circuited')
+            error = CircuitOpenError(f"Circuit for {endpoint} is open", request=request)
+            return self._fallback(request, endpoint, key, None, error)
+
+        try:
+            deadline = time.monotonic() + policy.deadline
+            attempt = 0
+            while True:
+                response, error = None, None
+                try:
+                    response = self._send_timed(request, endpoint, **kwargs)
+                    reason = retry_reason(response.status_code)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error = e
+                    reason = retry_reason(error=e)
+
+                if reason is None:
+                    breaker.record_success()
+                    if response.ok and request.method == 'GET' and not kwargs.get('stream'):
+                        resilience.payloads.put(key, response.content, response.headers.get('Content-Type'))
+                    return response
+
+                # A 429 means our budget is spent, not that Finnhub is failing
+                if reason != 'rate_limited':
+                    breaker.record_failure()
+                delay = policy.delay(attempt, wait_hint(response.headers if response is not None else None))
+                if attempt >= policy.max_retries or breaker.is_open or time.monotonic() + delay > deadline:
+                    resilience.count(endpoint, 'exhausted')
+                    return self._fallback(request, endpoint, key, response, error)
+
+                resilience.count(endpoint, f"retry:{reason}")
+                logger.warning(f"{endpoint}: {reason}, retry {attempt + 1} of {policy.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+                if self.before_retry is not None:
+                    self.before_retry()
+                attempt += 1
+        finally:
+            if permit == HALF_OPEN:
+                breaker.release()
+
+    def _send_timed(self, request, endpoint, **kwargs):
+        kwargs['timeout'] = self.transport.timeout_for(endpoint)
+        _timing.connect_seconds = 0.0
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.RequestException:
+            elapsed = time.perf_counter() - start
+            self.transport.record(endpoint, _timing.connect_seconds, None, elapsed, 0, 0, error=True)
+            raise
+
+        total = time.perf_counter() - start
+        connect = _timing.connect_seconds
+        ttfb = max(0.0, response.elapsed.total_seconds() - connect)
+        body_bytes = len(response.content) if not kwargs.get('stream') else 0
+        try:
+            wire_bytes = response.raw.tell()
+        except (AttributeError, OSError):
+            wire_bytes = body_bytes
+        response.metrics = {
+            'endpoint': endpoint,
+            'connect_seconds': connect,
+            'ttfb_seconds': ttfb,
+            'total_seconds': total,
+            'wire_bytes': wire_bytes,
+            'body_bytes': body_bytes
+        }
+        self.transport.record(
+            endpoint, connect, ttfb, total, wire_bytes, body_bytes, error=response.status_code >= 500
+        )
+        return response
+
+    def _fallback(self, request, endpoint, key, response, error):
+        """The last good response to ``request`` marked stale, else the failed response or error."""
+        cached = self.transport.resilience.payloads.get(key) if request.method == 'GET' else None
+        if cached is None:
+            if response is not None:
+                return response
+            raise error
+
+        body, content_type, stored_at = cached
+        self.transport.resilience.count(endpoint, 'stale_served')
+        logger.warning(f"{endpoint} unavailable, serving the response from {time.time() - stored_at:.0f}s ago")
+        stale = requests.Response()
+        stale.status_code = 200
+        stale.reason = 'OK'
+        stale._content = body
+        stale.headers['Content-Type'] = content_type or 'application/json'
+        stale.headers[STALE_HEADER] = str(int(time.time() - stored_at))
+        stale.url = request.url
+        stale.request = request
+        stale.stale = True
+        _timing.stale = True
+        return stale
+
+
+def last_response_stale():
+    """Whether the last request of this thread was answered from the fallback store.
+
+    For callers such as ``finnhub.Client`` that only hand back the decoded payload.
+    """
+    return getattr(_timing, 'stale', False)
+
+
+def endpoint_name(url):
+    """``company-news`` for ``https://finnhub.io/api/v1/company-news?...``."""
+    path = urlparse(url).path
+    if API_PREFIX in path:
+        path = path.split(API_PREFIX, 1)[1]
+    return path.strip('/') or '/'
+
+
+class HttpTransport:
+
+    def __init__(self, pool_connections=4, pool_maxsize=32, timeouts=None, samples=2048, resilience=None):
+        self.pool_maxsize = pool_maxsize
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+        self.samples = samples
+        self.resilience = resilience or Resilience()
+        self.adapter = PooledAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = self.new_session()
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        _transports.add(self)
+
+    def _after_fork(self):
+        # Pooled sockets inherited from the parent must not be shared with it
+        self._lock = threading.Lock()
+        self.adapter.poolmanager.clear()
+
+    def new_session(self):
+        """Another session (own headers and params) on the shared connection pool."""
+        return TransportSession(self)
+
+    def timeout_for(self, endpoint):
+        return self.timeouts.get(endpoint, DEFAULT_TIMEOUT)
+
+    def record(self, endpoint, connect, ttfb, total, wire_bytes, body_bytes, error=False):
+        with self._lock:
+            counts = self._endpoints.get(endpoint)
+            if counts is None:
+                counts = self._endpoints[endpoint] = {
+                    'requests': 0, 'errors': 0, 'new_connections': 0, 'connect_seconds': 0.0,
+                    'ttfb_seconds': 0.0, 'wire_bytes': 0, 'body_bytes': 0, 'latency': deque(maxlen=self.samples)
+                }
+            counts['requests'] += 1
+            counts['errors'] += bool(error)
+            counts['new_connections'] += connect > 0
+            counts['connect_seconds'] += connect
+            counts['ttfb_seconds'] += ttfb or 0.0
+            counts['wire_bytes'] += wire_bytes
+            counts['body_bytes'] += body_bytes
+            counts['latency'].append(total)
+
+    def stats(self):
+        """Requests, connections opened, bytes and latency per endpoint (times in ms)."""
+        with self._lock:
+            endpoints = {
+                name: dict(counts, latency=list(counts['latency'])) for name, counts in self._endpoints.items()
+            }
+
+        report = {}
+        for name, counts in endpoints.items():
+            latency = np.array(counts.pop('latency')) * 1000
+            requests_made = counts['requests']
+            report[name] = {
+                'requests': requests_made,
+                'errors': counts['errors'],
+                'new_connections': counts['new_connections'],
+                'reused_connections': requests_made - counts['new_connections'],
+                'avg_connect_ms': round(counts['connect_seconds'] * 1000 / max(1, counts['new_connections']), 2),
+                'avg_ttfb_ms': round(counts['ttfb_seconds'] * 1000 / requests_made, 2),
+                'p50_ms': round(float(np.percentile(latency, 50)), 2),
+                'p99_ms': round(float(np.percentile(latency, 99)), 2),
+                'wire_bytes': counts['wire_bytes'],
+                'body_bytes': counts['body_bytes']
+            }
+        return {'pool_maxsize': self.pool_maxsize, 'endpoints': report, 'resilience': self.resilience.stats()}
+
+    def close(self):
+        self.session.close()
+        self.adapter.close()
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    for transport in list(_transports):
+        transport._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def default_transport():
+    """The transport shared by every Finnhub client of this process."""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            resilience = Resilience(
+                RetryPolicy(max_retries=int(os.environ.get('FINNHUB_MAX_RETRIES', 2))),
+                failure_threshold=int(os.environ.get('FINNHUB_BREAKER_THRESHOLD', 5)),
+                reset_timeout=float(os.environ.get('FINNHUB_BREAKER_RESET', 30))
+            )
+            _default_transport = HttpTransport(
+                pool_maxsize=int(os.environ.get('FINNHUB_POOL_SIZE', 32)), resilience=resilience
+            )
+        return _default_transport
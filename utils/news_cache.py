@@ -0,0 +1,171 @@
+"""TTL-aware cache for Finnhub payloads stored as JSON files.
+
+Freshness is judged from the ``timestamp`` that ``save_news_to_json`` and
+``save_data_to_json`` write near the top of every cache file, so a check reads
+only the first few hundred bytes. Each kind of payload has its own TTL, and a
+kind can be refined per qualifier (e.g. ``market_news:crypto``).
+
+Stale entries are served immediately while a single background refresh per
+file brings them up to date (stale-while-revalidate). With a ``SingleFlight``,
+concurrent fetches of one file, in any thread or worker process, are coalesced
+into one API call.
+"""
+
+import os
+import re
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.api_scheduler import BACKGROUND, api_priority
+
+logger = logging.getLogger(__name__)
+
+# Seconds an entry of each kind stays fresh
+DEFAULT_TTLS = {
+    'company_news': 15 * 60,
+    'market_news': 5 * 60,
+    'quote': 60,
+    'profile': 24 * 60 * 60
+}
+
+HEADER_BYTES = 256
+TIMESTAMP_PATTERN = re.compile(rb'"timestamp"\s*:\s*"([^"]+)"')
+
+FRESH = 'fresh'
+STALE = 'stale'
+MISSING = 'missing'
+
+
+def read_cache_timestamp(path):
+    """Return when a cache file was written, reading only its header.
+
+    Falls back to the file's modification time when no timestamp is found.
+    Returns ``None`` if the file does not exist.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_BYTES)
+    except OSError:
+        return None
+
+    match = TIMESTAMP_PATTERN.search(header)
+    if match:
+        try:
+            return datetime.fromisoformat(match.group(1).decode('ascii'))
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+class NewsCache:
+
+    def __init__(self, ttls=None, refresh_workers=2, single_flight=None, cache_manager=None):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.refresh_workers = refresh_workers
+        self.single_flight = single_flight
+        self.cache_manager = cache_manager
+        self._executor = None
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.stats_counts = {FRESH: 0, STALE: 0, MISSING: 0, 'refreshes': 0, 'refresh_failures': 0}
+
+    def ttl(self, kind, qualifier=None):
+        if qualifier is not None and f"{kind}:{qualifier}" in self.ttls:
+            return self.ttls[f"{kind}:{qualifier}"]
+        return self.ttls[kind]
+
+    def freshness(self, path, kind, qualifier=None):
+        """Return ``fresh``, ``stale`` or ``missing`` for the cache file at ``path``."""
+        written = read_cache_timestamp(path)
+        if written is None:
+            return MISSING
+        age = (datetime.now() - written).total_seconds()
+        return FRESH if age <= self.ttl(kind, qualifier) else STALE
+
+    def get(self, path, kind, load, fetch, qualifier=None):
+        """Return the cached payload at ``path``, fetching or refreshing as needed.
+
+        ``load(path)`` reads the cache file; ``fetch()`` calls the API, writes the
+        cache file and returns the new payload. A missing entry is fetched
+        synchronously; a stale one is returned as is while ``fetch`` runs in the
+        background, at most once per file at a time.
+        """
+        state = self.freshness(path, kind, qualifier)
+        self.record(state, path)
+
+        def stored():
+            # Another thread or process may have fetched the file meanwhile
+            if self.freshness(path, kind, qualifier) == FRESH:
+                return load(path) or None
+            return None
+
+        if state == MISSING:
+            return self.fetch_once(path, fetch, stored)
+
+        payload = load(path)
+        if not payload:
+            return self.fetch_once(path, fetch, stored)
+
+        if state == STALE:
+            self.refresh_in_background(path, fetch, stored)
+        return payload
+
+    def fetch_once(self, key, fetch, recheck=None):
+        """Run ``fetch``, coalesced with concurrent fetches of ``key`` when single-flight is on."""
+        if self.single_flight is None:
+            result = fetch()
+        else:
+            result = self.single_flight.do(key, fetch, recheck)
+        if self.cache_manager is not None:
+            self.cache_manager.maybe_maintain()
+        return result
+
+    def record(self, state, path=None):
+        with self._lock:
+            self.stats_counts[state] = self.stats_counts.get(state, 0) + 1
+        if path is not None and self.cache_manager is not None:
+            self.cache_manager.record(path, state)
+
+    def refresh_in_background(self, key, fetch, recheck=None):
+        """Run ``fetch`` on a refresh thread unless a refresh of ``key`` is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers,
+                    thread_name_prefix='cache-refresh'
+                )
+
+        logger.info(f"Serving stale {key} while it refreshes")
+        self._executor.submit(self._run_refresh, key, fetch, recheck)
+
+    def _run_refresh(self, key, fetch, recheck=None):
+        try:
+            # Nobody waits on a refresh, so it takes API calls only when users leave some
+            with api_priority(BACKGROUND):
+                outcome = 'refreshes' if self.fetch_once(key, fetch, recheck) else 'refresh_failures'
+        except Exception as e:
+            logger.error(f"Background refresh of {key} failed: {e}")
+            outcome = 'refresh_failures'
+
+        with self._lock:
+            self.stats_counts[outcome] += 1
+            self._refreshing.discard(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self.stats_counts,
+                'refreshing': len(self._refreshing),
+                'ttls': dict(self.ttls)
+            }
+
+    def shutdown(self, wait=True):
+        """Stop the refresh threads, waiting for running refreshes by default."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
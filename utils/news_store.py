@@ -0,0 +1,169 @@
+"""Day-partitioned store for company news.
+
+Company news is cached as one file per symbol and UTC day
+(``news/{SYMBOL}/{YYYY-MM-DD}.json``, in the ``save_news_to_json`` format, or
+``.fpcol`` with the columnar format), so any date range can be assembled from
+the days already on disk, and only the missing days need to be fetched. An
+empty file records a day that has no news.
+
+A partition written after its day ended is complete and never expires. The
+partitions of today and of days written before they ended are refreshed by TTL.
+"""
+
+import os
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from utils import columnar_news
+from utils.delta_fetch import article_key
+from utils.finnhub_utils import save_news_to_json, load_news_from_json
+from utils.news_cache import FRESH, STALE, MISSING, read_cache_timestamp
+
+logger = logging.getLogger(__name__)
+
+COMPLETE = 'complete'
+
+
+class NewsFormat:
+    """How news files are written and read: ``json`` or ``columnar``."""
+
+    def __init__(self, name, extension, save, load, read_columns=None):
+        self.name = name
+        self.extension = extension
+        self.save = save
+        self.load = load
+        self._read_columns = read_columns
+
+    def read_columns(self, path, names):
+        """The numeric columns ``names`` of the file at ``path`` as arrays.
+
+        The columnar format reads them straight from the memory-mapped file; JSON
+        files are parsed and the columns built from the articles.
+        """
+        if self._read_columns is not None:
+            return self._read_columns(path, names)
+        columns, _ = columnar_news.build_columns(self.load(path))
+        return {name: columns[name] for name in names}
+
+
+NEWS_FORMATS = {
+    'json': NewsFormat('json', '.json', save_news_to_json, load_news_from_json),
+    'columnar': NewsFormat(
+        'columnar',
+        columnar_news.EXTENSION,
+        columnar_news.save_news_to_columnar,
+        columnar_news.load_news_from_columnar,
+        columnar_news.read_columns
+    )
+}
+
+
+def get_news_format(name):
+    try:
+        return NEWS_FORMATS[name]
+    except KeyError:
+        raise ValueError(f"Unknown news storage format {name!r}; expected one of {', '.join(NEWS_FORMATS)}")
+
+
+def parse_day(value):
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def day_range(from_day, to_day):
+    """Every day from ``from_day`` to ``to_day``, both included."""
+    from_day, to_day = parse_day(from_day), parse_day(to_day)
+    return [from_day + timedelta(days=offset) for offset in range((to_day - from_day).days + 1)]
+
+
+def adjacent_runs(days):
+    """Group sorted days into ``(first, last)`` runs of consecutive days."""
+    runs = []
+    for day in days:
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def article_day(item):
+    """The UTC day an article was published, or ``None`` without a timestamp."""
+    try:
+        timestamp = int(item.get('datetime') or 0)
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).date() if timestamp else None
+    except (ValueError, TypeError, OSError):
+        return None
+
+
+def day_end(day):
+    """When ``day`` ends in UTC, as the local naive time cache timestamps use."""
+    end = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(days=1)
+    return end.astimezone().replace(tzinfo=None)
+
+
+class DayPartitionStore:
+
+    def __init__(self, root, news_format='json'):
+        self.root = root
+        self.news_format = get_news_format(news_format)
+
+    def partition_path(self, symbol, day):
+        return os.path.join(self.root, symbol.upper(), f"{day.isoformat()}{self.news_format.extension}")
+
+    def state(self, symbol, day, ttl):
+        """Return ``complete``, ``fresh``, ``stale`` or ``missing`` for one day."""
+        written = read_cache_timestamp(self.partition_path(symbol, day))
+        if written is None:
+            return MISSING
+        if written >= day_end(day):
+            return COMPLETE
+        return FRESH if (datetime.now() - written).total_seconds() <= ttl else STALE
+
+    def read_day(self, symbol, day):
+        path = self.partition_path(symbol, day)
+        if not os.path.exists(path):
+            return None
+        return self.news_format.load(path)
+
+    def write_day(self, symbol, day, news_items):
+        news_items = sorted(news_items, key=lambda item: item.get('datetime') or 0, reverse=True)
+        return self.news_format.save(news_items, self.partition_path(symbol, day), allow_empty=True)
+
+    def update_day(self, symbol, day, updated_items):
+        """Replace articles of one day by their updated copies, keeping the partition's age."""
+        path = self.partition_path(symbol, day)
+        written = read_cache_timestamp(path)
+        if written is None:
+            return False
+
+        updates = {article_key(item): item for item in updated_items}
+        news_items = [updates.get(article_key(item), item) for item in self.read_day(symbol, day) or []]
+        return self.news_format.save(news_items, path, allow_empty=True, timestamp=written)
+
+    def read_range(self, symbol, days):
+        """All cached articles of ``days``, newest first."""
+        news_items = []
+        for day in sorted(days, reverse=True):
+            news_items.extend(self.read_day(symbol, day) or [])
+        return news_items
+
+    def read_range_columns(self, symbol, days, names):
+        """The numeric columns ``names`` of every cached article of ``days``, concatenated."""
+        parts = {name: [] for name in names}
+        for day in sorted(days, reverse=True):
+            path = self.partition_path(symbol, day)
+            if not os.path.exists(path):
+                continue
+            columns = self.news_format.read_columns(path, names)
+            if columns is None:
+                continue
+            for name in names:
+                parts[name].append(columns[name])
+        return {
+            name: np.concatenate(arrays) if arrays else np.empty(0, dtype=columnar_news.COLUMN_DTYPES[name])
+            for name, arrays in parts.items()
+        }
@@ -0,0 +1,225 @@
+"""Chunked, concurrent fetching of long ``company-news`` date ranges.
+
+One ``company-news`` response holds at most ``max_results`` articles, newest
+first, so a single call for a long range silently drops its oldest articles.
+``NewsRangeFetcher`` splits a range into chunks of days sized so each is
+expected to fill most of a response, going by the articles per day seen for
+the symbol so far, and fetches them concurrently. Every call still goes through
+the client, so the chunks draw from the shared API budget like any other call.
+
+A symbol seen for the first time is probed with one chunk of the newest days
+(``max_chunk_days``, so short ranges still take one call), and the rest of the
+range is planned from what it returned. A response that
+comes back full only covers the days after its oldest article; the remaining
+days are split again with the updated density and fetched as well. Articles
+are deduplicated by id across chunks and handed out chunk by chunk, as each one
+completes, as ``(first, last, articles)`` for the days it covered.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import contextvars
+from datetime import timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils.delta_fetch import article_key
+from utils.news_store import article_day, parse_day
+from utils.resilience import is_stale
+
+logger = logging.getLogger(__name__)
+
+# Most articles one company-news response returns; a response this long is taken to be cut off
+DEFAULT_MAX_RESULTS = int(os.environ.get('FINNHUB_NEWS_MAX_RESULTS', 250))
+
+# Share of a response a chunk is planned to fill, leaving room for busier days than expected
+FILL = 0.8
+# Weight of the latest observation in a symbol's articles-per-day estimate
+DENSITY_WEIGHT = 0.5
+
+
+class NewsRangeFetcher:
+
+    def __init__(self, max_results=DEFAULT_MAX_RESULTS, workers=4, max_chunk_days=30):
+        self.max_results = max_results
+        self.workers = workers
+        self.max_chunk_days = max_chunk_days
+        self._density = {}
+        self._lock = threading.Lock()
+        self.stats_counts = {'ranges': 0, 'chunks': 0, 'truncated': 0, 'duplicates': 0}
+
+    def density(self, symbol):
+        """Estimated articles per day of ``symbol``, or ``None`` before its first response."""
+        with self._lock:
+            return self._density.get(symbol.upper())
+
+    def observe(self, symbol, days, articles):
+        """Fold ``articles`` published over ``days`` days into the density estimate of ``symbol``."""
+        if days <= 0:
+            return
+        observed = articles / days
+        with self._lock:
+            previous = self._density.get(symbol.upper())
+            self._density[symbol.upper()] = (
+                observed if previous is None else DENSITY_WEIGHT * observed + (1 - DENSITY_WEIGHT) * previous
+            )
+
+    def chunk_days(self, symbol):
+        density = self.density(symbol)
+        if not density:
+            # Unknown or no news: a full response is split further anyway
+            return self.max_chunk_days
+        return max(1, min(self.max_chunk_days, int(FILL * self.max_results / density)))
+
+    def split(self, symbol, first, last):
+        """``(first, last)`` chunks of the days from ``first`` to ``last``, newest first."""
+        size = self.chunk_days(symbol)
+        chunks = []
+        while last >= first:
+            chunk_first = max(first, last - timedelta(days=size - 1))
+            chunks.append((chunk_first, last))
+            last = chunk_first - timedelta(days=1)
+        return chunks
+
+    def _count(self, event, amount=1):
+        with self._lock:
+            self.stats_counts[event] += amount
+
+    def _settle(self, symbol, first, last, response, seen):
+        """Trim a chunk's response to the days it fully covers.
+
+        Returns ``(chunk, remainder)``: the ``(first, last, articles)`` to hand
+        out and the ``(first, last)`` days still to fetch, or ``None``. Failed
+        and stale responses are handed out as they are.
+        """
+        if not isinstance(response, list) or is_stale(response):
+            return (first, last, response), None
+
+        articles = [item for item in response if isinstance(item, dict)]
+        remainder = None
+        if len(articles) >= self.max_results:
+            self._count('truncated')
+            oldest = max(first, min((article_day(item) or last for item in articles), default=last))
+            if oldest < last:
+                # The oldest day returned may be cut off, so it is fetched again with the older ones
+                remainder = (first, oldest)
+                first = oldest + timedelta(days=1)
+            elif first < last:
+                logger.warning(f"{symbol} has more than {self.max_results} articles on {last}, keeping the newest")
+                remainder = (first, last - timedelta(days=1))
+                first = last
+            else:
+                logger.warning(f"{symbol} has more than {self.max_results} articles on {last}, keeping the newest")
+        # Articles of other days belong to the chunk that covers them
+        articles = [item for item in articles if first <= (article_day(item) or last) <= last]
+        self.observe(symbol, (last - first).days + 1, len(articles))
+
+        fresh = []
+        for item in articles:
+            key = article_key(item)
+            if key not in seen:
+                seen.add(key)
+                fresh.append(item)
+        self._count('duplicates', len(articles) - len(fresh))
+        return (first, last, fresh), remainder
+
+    def _plan(self, symbol, first, last):
+        """The chunks to start now and the days left to plan once a density is known."""
+        chunks = self.split(symbol, first, last)
+        if self.density(symbol) is None and len(chunks) > 1:
+            return chunks[:1], (first, chunks[0][0] - timedelta(days=1))
+        return chunks, None
+
+    def iter_chunks(self, fetch, symbol, from_date, to_date):
+        """Fetch ``symbol``'s news from ``from_date`` to ``to_date`` with ``fetch(symbol, from, to)``.
+
+        Chunks run on up to ``workers`` threads in the caller's context (so its
+        API priority applies) and are yielded as they complete.
+        """
+        first, last = parse_day(from_date), parse_day(to_date)
+        self._count('ranges')
+        seen = set()
+        pending = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix='news-range')
+
+        def start(chunks):
+            for chunk_first, chunk_last in chunks:
+                self._count('chunks')
+                context = contextvars.copy_context()
+                future = executor.submit(
+                    context.run, fetch, symbol, chunk_first.isoformat(), chunk_last.isoformat()
+                )
+                pending[future] = (chunk_first, chunk_last)
+
+        try:
+            chunks, deferred = self._plan(symbol, first, last)
+            start(chunks)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_first, chunk_last = pending.pop(future)
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching news for {symbol} from {chunk_first} to {chunk_last}: {e}")
+                        response = {"error": str(e)}
+                    chunk, remainder = self._settle(symbol, chunk_first, chunk_last, response, seen)
+                    if remainder is not None:
+                        start(self.split(symbol, *remainder))
+                    if deferred is not None:
+                        start(self.split(symbol, *deferred))
+                        deferred = None
+                    yield chunk
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def iter_chunks_async(self, fetch, symbol, from_date, to_date):
+        """``iter_chunks`` for a coroutine ``fetch``; the client caps the requests in flight."""
+        first, last = parse_day(from_date), parse_day(to_date)
+        self._count('ranges')
+        seen = set()
+        pending = {}
+
+        def start(chunks):
+            for chunk_first, chunk_last in chunks:
+                self._count('chunks')
+                task = asyncio.ensure_future(fetch(symbol, chunk_first.isoformat(), chunk_last.isoformat()))
+                pending[task] = (chunk_first, chunk_last)
+
+        try:
+            chunks, deferred = self._plan(symbol, first, last)
+            start(chunks)
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    chunk_first, chunk_last = pending.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching news for {symbol} from {chunk_first} to {chunk_last}: {e}")
+                        response = {"error": str(e)}
+                    chunk, remainder = self._settle(symbol, chunk_first, chunk_last, response, seen)
+                    if remainder is not None:
+                        start(self.split(symbol, *remainder))
+                    if deferred is not None:
+                        start(self.split(symbol, *deferred))
+                        deferred = None
+                    yield chunk
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self.stats_counts,
+                'max_results': self.max_results,
+                'density': {symbol: round(value, 2) for symbol, value in sorted(self._density.items())}
+            }
+
+
+def merge_chunks(chunks):
+    """The articles of ``(first, last, articles)`` chunks, newest first; failed chunks are skipped."""
+    articles = [item for _, _, items in chunks if isinstance(items, list) for item in items]
+    return sorted(articles, key=lambda item: item.get('datetime') or 0, reverse=True)
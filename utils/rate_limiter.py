@@ -0,0 +1,230 @@
+"""Token-bucket rate limiting shared by every Finnhub caller.
+
+A ``TokenBucket`` refills ``rate`` tokens evenly over ``period`` seconds and
+holds at most ``burst`` of them; each API call takes one. The burst defaults to
+a sixth of the rate, so no window of ``period`` seconds sees much more than
+``rate`` calls even when it starts with a full bucket. With a ``path`` the bucket state (tokens,
+time of the last refill and the end of a server-imposed block) lives in a small
+file that is read and written under an exclusive ``flock``, so every thread and
+worker process using the same file draws from one budget. ``acquire`` reserves
+the next token and sleeps until it is due, which serves callers in order instead
+of letting them all wake at the same instant.
+
+Responses narrow the budget: ``update(remaining, reset)`` applies the
+``X-Ratelimit-Remaining`` and ``X-Ratelimit-Reset`` headers, and a remaining
+count of zero blocks the bucket until the reset time.
+
+``shared_bucket(api_key)`` returns the bucket of an API key, stored under
+``FINNHUB_RATE_LIMIT_DIR`` (the temp directory by default) and sized by
+``FINNHUB_RATE_LIMIT`` calls per minute (60 by default).
+
+    python -m utils.rate_limiter stats
+"""
+
+import os
+import sys
+import time
+import struct
+import asyncio
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 60
+DEFAULT_PERIOD = 60.0
+
+# tokens, last refill (Unix time), blocked until (Unix time)
+STATE = struct.Struct('<ddd')
+
+
+class TokenBucket:
+
+    def __init__(self, path=None, rate=DEFAULT_RATE, period=DEFAULT_PERIOD, burst=None):
+        self.path = path
+        self.rate = rate
+        self.period = period
+        self.burst = burst or max(1, rate // 6)
+        self._lock = threading.Lock()
+        self._fd = None
+        self._pid = None
+        self._state = None
+        self.stats_counts = {
+            'acquired': 0,
+            'waited': 0,
+            'wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+            'header_updates': 0,
+            'blocks': 0
+        }
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _open(self):
+        # A forked worker shares its parent's open file, and flock would not keep them apart
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    @contextmanager
+    def _locked_state(self):
+        """Yield the current state as a list, and store it back on exit."""
+        with self._lock:
+            if not self.path or fcntl is None:
+                if self._state is None:
+                    self._state = self._initial_state()
+                yield self._state
+                return
+
+            fd = self._open()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                data = os.pread(fd, STATE.size, 0)
+                state = list(STATE.unpack(data)) if len(data) == STATE.size else self._initial_state()
+                yield state
+                os.pwrite(fd, STATE.pack(*state), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _initial_state(self):
+        return [float(self.burst), time.time(), 0.0]
+
+    def _refill(self, state, now):
+        state[0] = min(float(self.burst), state[0] + max(0.0, now - state[1]) * self.rate / self.period)
+        state[1] = now
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it."""
+        now = time.time()
+        with self._locked_state() as state:
+            self._refill(state, now)
+            state[0] -= 1
+            wait = -state[0] * self.period / self.rate if state[0] < 0 else 0.0
+            return max(wait, state[2] - now)
+
+    def record_wait(self, wait):
+        """Count a granted call that waited ``wait`` seconds (``acquire`` does this itself)."""
+        with self._lock:
+            self.stats_counts['acquired'] += 1
+            if wait > 0:
+                self.stats_counts['waited'] += 1
+                self.stats_counts['wait_seconds'] += wait
+                self.stats_counts['max_wait_seconds'] = max(self.stats_counts['max_wait_seconds'], wait)
+
+    def acquire(self):
+        """Block until a call may be made; returns the seconds waited."""
+        wait = self.reserve()
+        self.record_wait(wait)
+        if wait > 0:
+            logger.info(f"Rate limit reached. Waiting {wait:.2f} seconds.")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """``acquire`` for coroutines: sleeps without blocking the event loop."""
+        wait = self.reserve()
+        self.record_wait(wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def update(self, remaining=None, reset=None):
+        """Apply the ``X-Ratelimit-Remaining`` and ``X-Ratelimit-Reset`` (Unix time) of a response."""
+        if remaining is None:
+            return
+        now = time.time()
+        with self._locked_state() as state:
+            self._refill(state, now)
+            state[0] = min(state[0], float(remaining))
+            blocked = remaining <= 0 and reset is not None and reset > now
+            if blocked:
+                state[2] = max(state[2], float(reset))
+        with self._lock:
+            self.stats_counts['header_updates'] += 1
+            if blocked:
+                self.stats_counts['blocks'] += 1
+
+    def update_from_headers(self, headers):
+        """``update`` from a response's headers, if they carry the rate limit."""
+        try:
+            remaining = headers.get('X-Ratelimit-Remaining')
+            reset = headers.get('X-Ratelimit-Reset')
+            self.update(
+                int(remaining) if remaining is not None else None,
+                int(reset) if reset is not None else None
+            )
+        except ValueError:
+            logger.warning(f"Ignoring malformed rate limit headers: {remaining!r}, {reset!r}")
+
+    def block(self, seconds):
+        """Take no tokens for ``seconds``, e.g. after an HTTP 429 without a reset time."""
+        self.update(0, time.time() + seconds)
+
+    def budget(self):
+        """Tokens available now (negative while callers are queued) and seconds the bucket is blocked."""
+        now = time.time()
+        with self._locked_state() as state:
+            self._refill(state, now)
+            return state[0], max(0.0, state[2] - now)
+
+    def stats(self):
+        tokens, blocked_for = self.budget()
+        with self._lock:
+            counts = dict(self.stats_counts)
+        counts['average_wait_seconds'] = counts['wait_seconds'] / counts['waited'] if counts['waited'] else 0.0
+        return {
+            **counts,
+            'rate': self.rate,
+            'period': self.period,
+            'burst': self.burst,
+            'tokens': round(tokens, 2),
+            'blocked_for_seconds': round(blocked_for, 2),
+            'shared': bool(self.path and fcntl is not None)
+        }
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_path(api_key, directory=None):
+    directory = directory or os.environ.get('FINNHUB_RATE_LIMIT_DIR') or tempfile.gettempdir()
+    digest = hashlib.sha1((api_key or '').encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f"finpulse-rate-limit-{digest}.bucket")
+
+
+def shared_bucket(api_key):
+    """The bucket every client of ``api_key`` in this process (and its siblings) shares."""
+    path = bucket_path(api_key)
+    with _buckets_lock:
+        bucket = _buckets.get(path)
+        if bucket is None:
+            rate = int(os.environ.get('FINNHUB_RATE_LIMIT', DEFAULT_RATE))
+            bucket = _buckets[path] = TokenBucket(path, rate=rate)
+        return bucket
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the shared Finnhub rate limit")
+    parser.add_argument("command", choices=("stats",))
+    parser.add_argument("--api-key", default=os.environ.get('FINNHUB_API_KEY'), help="Key whose budget to show")
+    args = parser.parse_args(argv)
+
+    tokens, blocked_for = shared_bucket(args.api_key).budget()
+    print(f"{bucket_path(args.api_key)}: {tokens:.1f} calls available, blocked for {blocked_for:.1f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
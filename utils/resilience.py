@@ -0,0 +1,260 @@
+"""Retries, circuit breaking and stale fallbacks for Finnhub requests.
+
+A failed request (HTTP 429 or 5xx, a timeout or a dropped connection) is retried
+at most ``RetryPolicy.max_retries`` times, each after a random delay drawn from
+an exponentially growing window (full jitter), so callers that failed together
+do not retry together. A server-provided wait (``Retry-After`` or an exhausted
+``X-Ratelimit-Reset``) is a lower bound on the delay, and no retry starts past
+the policy's deadline, which keeps a request thread from sleeping indefinitely.
+
+Every endpoint has a ``CircuitBreaker``. After ``failure_threshold`` consecutive
+failures (429s excluded, they mean our budget is spent, not that Finnhub is
+down) it opens and calls fail fast for ``reset_timeout`` seconds; then a single
+trial call decides whether it closes again. A trial that is rate limited or
+fails otherwise decides nothing, and the next call makes a new one. While a call cannot be made, the
+last successful payload of the same request is served instead and marked stale.
+"""
+
+import re
+import time
+import random
+import logging
+import threading
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+STALE_HEADER = 'X-FinPulse-Stale'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+class RetryPolicy:
+
+    def __init__(self, max_retries=2, base_delay=0.5, max_delay=8.0, deadline=15.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def delay(self, attempt, wait_hint=0.0):
+        """Seconds to wait before retry ``attempt`` (0 for the first retry)."""
+        window = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return max(wait_hint, random.uniform(0, window))
+
+
+def retry_reason(status_code=None, error=None):
+    """Why a response or exception should be retried, or ``None`` if it should not."""
+    if error is not None:
+        if isinstance(error, CircuitOpenError):
+            return None
+        if isinstance(error, (requests.exceptions.Timeout, TimeoutError)):
+            return 'timeout'
+        return 'connection'
+    if status_code == 429:
+        return 'rate_limited'
+    if status_code is not None and status_code >= 500:
+        return 'server_error'
+    return None
+
+
+def wait_hint(headers, now=None):
+    """Seconds the server asked us to wait, from ``Retry-After`` or an exhausted rate limit."""
+    if headers is None:
+        return 0.0
+    now = now or time.time()
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+    try:
+        if headers.get('X-Ratelimit-Remaining') == '0' and headers.get('X-Ratelimit-Reset'):
+            return max(0.0, int(headers['X-Ratelimit-Reset']) - now)
+    except ValueError:
+        pass
+    return 0.0
+
+
+class CircuitBreaker:
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may be made now; after the timeout, lets one trial call through.
+
+        Returns ``CLOSED`` or, for the trial call, ``HALF_OPEN`` (both true), or
+        ``False``. A trial call that ends in neither ``record_success`` nor
+        ``record_failure`` must be ended with ``release``.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return CLOSED
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return HALF_OPEN
+            return False
+
+    def release(self):
+        """End a trial call that decided nothing (a 429, an unexpected error); the next call is a new trial."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuit closed after a successful trial call")
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened += 1
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    @property
+    def is_open(self):
+        return self.state == OPEN
+
+    def stats(self):
+        with self._lock:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)) if self.state == OPEN else 0.0
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'opened': self.opened,
+                'retry_in_seconds': round(retry_in, 2)
+            }
+
+
+def payload_key(method, url):
+    """Identify a request by method, endpoint and parameters, without the API token."""
+    parts = urlparse(url)
+    params = sorted((name, value) for name, value in parse_qsl(parts.query) if name != 'token')
+    return f"{method} {re.sub('/+', '/', parts.path)}?{urlencode(params)}"
+
+
+class PayloadStore:
+    """The last successful response body of each request, within a byte budget (least recently used first out)."""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key, body, content_type=None):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[0])
+            self._entries[key] = (body, content_type, time.time())
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (evicted, _, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def get(self, key):
+        """``(body, content_type, stored_at)`` or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+
+class StaleList(list):
+    """A list payload served from the fallback store instead of a live response."""
+    stale = True
+
+
+def mark_stale(payload):
+    if isinstance(payload, dict):
+        return dict(payload, stale=True)
+    if isinstance(payload, list):
+        return StaleList(payload)
+    return payload
+
+
+def is_stale(payload):
+    if isinstance(payload, dict):
+        return payload.get('stale') is True
+    return getattr(payload, 'stale', False)
+
+
+class Resilience:
+    """Retry policy, circuit breakers, fallback payloads and their counters, per endpoint."""
+
+    def __init__(self, policy=None, failure_threshold=5, reset_timeout=30.0, max_payload_bytes=32 * 1024 * 1024):
+        self.policy = policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.payloads = PayloadStore(max_payload_bytes)
+        self._breakers = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint):
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def count(self, endpoint, event):
+        with self._lock:
+            counts = self._counts.setdefault(endpoint, {})
+            counts[event] = counts.get(event, 0) + 1
+
+    def stats(self):
+        """Breaker state and retry, fallback and fail-fast counts per endpoint."""
+        with self._lock:
+            breakers = dict(self._breakers)
+            counts = {endpoint: dict(events) for endpoint, events in self._counts.items()}
+
+        report = {}
+        for endpoint in sorted(set(breakers) | set(counts)):
+            events = counts.get(endpoint, {})
+            report[endpoint] = {
+                **(breakers[endpoint].stats() if endpoint in breakers else {'state': CLOSED}),
+                'retries': sum(value for name, value in events.items() if name.startswith('retry:')),
+                **events
+            }
+        return {
+            'max_retries': self.policy.max_retries,
+            'fallback_bytes': self.payloads.size,
+            'endpoints': report
+        }
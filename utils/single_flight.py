@@ -0,0 +1,150 @@
+"""Request coalescing (single-flight) for cache misses.
+
+``SingleFlight.do(key, fetch)`` runs ``fetch`` once per key at a time. Threads
+of one process that ask for a key while its fetch is in flight wait for it
+instead of calling the API again. Across processes (gunicorn workers) the fetch
+runs under an exclusive ``flock`` on a lock file chosen by hashing the key into
+a fixed number of stripes, so the lock directory never grows; a process that had
+to wait for another one's lock first calls ``recheck()`` to see whether the other
+process already stored what it needs (for a key that merely shares the stripe it
+has not, and fetches).
+
+``recheck`` returns the stored payload, or ``None`` if a fetch is still needed.
+Waiting threads also get their result from ``recheck`` when it is given, so
+every caller works on its own copy of what was stored rather than on the
+objects the fetching thread returned.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Lock files shared by all keys; more stripes make unrelated keys wait on each other less often
+LOCK_STRIPES = 256
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+
+    def __init__(self, lock_dir=None, lock_timeout=60.0, poll_interval=0.05, lock_stripes=LOCK_STRIPES):
+        self.lock_dir = lock_dir
+        self.lock_stripes = lock_stripes
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats_counts = {
+            'fetches': 0,
+            'coalesced': 0,
+            'coalesced_across_processes': 0,
+            'lock_timeouts': 0
+        }
+
+        if lock_dir and fcntl is not None:
+            os.makedirs(lock_dir, exist_ok=True)
+
+    def do(self, key, fetch, recheck=None):
+        """Return ``fetch()``, or what a concurrent fetch of ``key`` stored."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.stats_counts['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if recheck is not None:
+                result = recheck()
+                if result is not None:
+                    return result
+            return call.result
+
+        try:
+            with self._process_lock(key) as waited:
+                if waited and recheck is not None:
+                    result = recheck()
+                    if result is not None:
+                        self._count('coalesced_across_processes')
+                        call.result = result
+                        return result
+
+                self._count('fetches')
+                call.result = fetch()
+                return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _count(self, name):
+        with self._lock:
+            self.stats_counts[name] += 1
+
+    def lock_path(self, key):
+        stripe = int(hashlib.sha1(key.encode('utf-8')).hexdigest()[:8], 16) % self.lock_stripes
+        return os.path.join(self.lock_dir, f"stripe-{stripe:03d}.lock")
+
+    @contextmanager
+    def _process_lock(self, key):
+        """Hold the lock file of ``key``'s stripe; yields whether another holder had it first."""
+        if not self.lock_dir or fcntl is None:
+            yield False
+            return
+
+        with open(self.lock_path(key), 'a+') as lock_file:
+            waited = False
+            deadline = time.monotonic() + self.lock_timeout
+            locked = False
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    waited = True
+                    if time.monotonic() >= deadline:
+                        break
+                    time.sleep(self.poll_interval)
+
+            if not locked:
+                # Better a duplicate fetch than a request stuck behind a hung worker
+                logger.warning(f"Timed out waiting for another process to fetch {key}")
+                self._count('lock_timeouts')
+
+            try:
+                yield waited
+            finally:
+                if locked:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self.stats_counts,
+                'in_flight': len(self._calls),
+                'cross_process': bool(self.lock_dir and fcntl is not None)
+            }